@@ -1,12 +1,14 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 import asyncio
 import json
 import os
 import sys
+import time
+import uuid
 from pathlib import Path
 
 # Add project root to path so we can import modules
@@ -17,21 +19,28 @@ sys.path.append(str(ROOT_DIR))
 VIDEO_DIR = (ROOT_DIR / "assets" / "videos").resolve()
 DOWNLOAD_DIR = (ROOT_DIR / "assets" / "downloads").resolve()
 AUDIO_DIR = (ROOT_DIR / "assets" / "audio").resolve()
+THUMBNAIL_DIR = (ROOT_DIR / "assets" / "thumbnails").resolve()
 
 VIDEO_DIR.mkdir(parents=True, exist_ok=True)
 DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
 AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+THUMBNAIL_DIR.mkdir(parents=True, exist_ok=True)
 
 # Temporary uploads for transcription
 UPLOAD_DIR = (ROOT_DIR / "assets" / "uploads").resolve()
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 from main import YouTubeStudioCreator
-from processor.tts_engine import TTSEngine
+from processor.tts_engine import TTSEngine, scene_durations, speech_srt
 from processor.db import DatabaseManager
 from processor.creative_engine import CreativeEngine
 from processor.downloader import VideoDownloader
-from processor.transcribe_engine import TranscriptionEngine
+from processor.render_workspace import unique_name
+from processor.job_queue import JobQueue, QueueFullError
+from processor.progress_aggregator import ProgressAggregator
+from processor.render_profiles import get_render_profile
+from processor.worker_pool import WorkerPool
+from processor import worker_tasks
 
 app = FastAPI()
 
@@ -40,7 +49,6 @@ creator = YouTubeStudioCreator()
 db_manager = DatabaseManager()
 creative_engine = CreativeEngine()
 video_downloader = VideoDownloader(download_path=DOWNLOAD_DIR)
-transcription_engine = TranscriptionEngine(model_name="base")
 
 # Enable CORS
 app.add_middleware(
@@ -49,6 +57,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # V90: the streaming TTS endpoint reports where the finished file is saved
+    expose_headers=["X-Audio-Url"],
 )
 
 @app.get("/videos")
@@ -68,50 +78,98 @@ async def get_project(project_id: str):
 # format: { project_id: [websocket1, ...], ... }
 active_tasks = {}
 
+async def broadcast(project_id: str, payload: dict):
+    """Sends a payload to every socket watching the project (dropping dead ones)."""
+    dead_sockets = []
+    for ws in active_tasks.get(project_id, []):
+        try:
+            await ws.send_json(payload)
+        except:
+            dead_sockets.append(ws)
+    for ws in dead_sockets:
+        active_tasks[project_id].remove(ws)
+
+# V95: progress is coalesced in memory; sockets and Mongo get it at a bounded rate
+progress_aggregator = ProgressAggregator(db_manager.projects, broadcast)
+
+# Clients may only deprioritize their own runs (e.g. bulk jobs); nobody can jump the queue
+MIN_CLIENT_PRIORITY = -10
+
+def requested_priority(req: dict) -> int:
+    """Queue priority from the request, clamped to [MIN_CLIENT_PRIORITY, 0]; ValueError if not a number."""
+    try:
+        priority = int(req.get("priority") or 0)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid priority: {req.get('priority')!r}")
+    return max(MIN_CLIENT_PRIORITY, min(0, priority))
+
+def requested_render_profile(req: dict):
+    """The request's "render_profile" (name or custom dict, default "final"); ValueError if unknown."""
+    profile = req.get("render_profile") or "final"
+    get_render_profile(profile)
+    return profile
+
+async def notify_queue_position(project_id: str, position: int):
+    await broadcast(project_id, {
+        "status": "queued",
+        "message": f"⏳ Waiting for a free studio slot ({position} in line)",
+        "position": position,
+        "project_id": project_id
+    })
+
+async def notify_job_failed(project_id: str, error: str):
+    """V93: a job the queue gave up on must not leave its project "processing" forever."""
+    await progress_aggregator.close(project_id)
+    await db_manager.update_project_status(project_id, "error", 0, f"Error: {error}")
+    await broadcast(project_id, {"status": "error", "message": error, "project_id": project_id})
+
+def requested_languages(req: dict) -> list:
+    """V74: "languages" as a clean list of codes (a bare "es" string is one language, not two)."""
+    langs = req.get("languages")
+    if isinstance(langs, str):
+        langs = [langs]
+    if not isinstance(langs, list):
+        langs = []
+    langs = [lang.strip() for lang in langs if isinstance(lang, str) and lang.strip()]
+    return langs or [req.get("language", "am")]
+
 async def background_process(project_id: str, req: dict):
     """Background task to process video and update DB/WebSockets."""
     try:
         url = req.get("url")
         target_duration = req.get("duration", 5)
         target_lang = req.get("language", "am")
+        # V74: Optional multi-language fan-out ("languages": ["am", "ar", "es", "fr"])
+        target_langs = requested_languages(req)
         target_tone = req.get("tone", "neutral")
         mission = req.get("mission", "translate")
         genre = req.get("genre", "sermon")
+        render_profile = requested_render_profile(req)
 
-        async def status_callback(message, progress):
-            # Update Database
-            await db_manager.update_project_status(project_id, "processing", progress, message)
-            
-            # Broadcast to all connected WebSockets for this project
-            if project_id in active_tasks:
-                dead_sockets = []
-                for ws in active_tasks[project_id]:
-                    try:
-                        await ws.send_json({
-                            "status": "processing",
-                            "message": message,
-                            "progress": progress,
-                            "project_id": project_id
-                        })
-                    except:
-                        dead_sockets.append(ws)
-                for ws in dead_sockets:
-                    active_tasks[project_id].remove(ws)
+        progress_aggregator.open(project_id)
+
+        async def status_callback(message, progress, language=None, **extra):
+            # V95: latest state only; DB writes and socket pushes are batched by the aggregator
+            await progress_aggregator.update(project_id, message, progress, language=language, **extra)
 
         result_path = await creator.process_video(
             url,
             target_duration=target_duration,
-            target_lang=target_lang,
+            target_lang=target_langs[0],
             tone=target_tone,
             mission=mission,
-            status_callback=status_callback
+            genre=genre,
+            status_callback=status_callback,
+            target_langs=target_langs,
+            render_profile=render_profile
         )
 
         # Load results
         with open(result_path, "r", encoding="utf-8") as f:
             studio_data = json.load(f)
 
-        # Final DB Update with full data
+        # Final DB Update with full data (pending progress must not land after it)
+        await progress_aggregator.close(project_id)
         studio_data["status"] = "completed"
         studio_data["progress"] = 100
         
@@ -125,6 +183,10 @@ async def background_process(project_id: str, req: dict):
             filename = os.path.basename(studio_data["rendered_video_path"])
             studio_data["download_url"] = f"http://localhost:8000/static/videos/{filename}"
             studio_data["rendered_video_path"] = studio_data["download_url"]
+        # V74: one narration per language
+        for package in [studio_data, *studio_data.get("languages", {}).values()]:
+            if package.get("narration_path"):
+                package["narration_url"] = f"http://localhost:8000/static/audio/{os.path.basename(package['narration_path'])}"
 
         # Save result
         from bson import ObjectId
@@ -147,6 +209,7 @@ async def background_process(project_id: str, req: dict):
 
     except Exception as e:
         print(f"❌ Background Error for project {project_id}: {e}")
+        await progress_aggregator.close(project_id)
         await db_manager.update_project_status(project_id, "error", 0, f"Error: {str(e)}")
         if project_id in active_tasks:
             for ws in active_tasks[project_id]:
@@ -154,6 +217,26 @@ async def background_process(project_id: str, req: dict):
                     await ws.send_json({"status": "error", "message": str(e), "project_id": project_id})
                 except: pass
             active_tasks.pop(project_id, None)
+        # V93: the job queue records the failure on the job itself
+        raise
+
+# V93: pipelines run from a persistent queue (PIPELINE_SLOTS at a time) instead of all at once
+job_queue = JobQueue(db_manager.jobs, background_process, on_position=notify_queue_position, on_failed=notify_job_failed)
+
+@app.on_event("startup")
+async def start_job_queue():
+    progress_aggregator.start()
+    await job_queue.start()
+
+@app.on_event("shutdown")
+async def stop_job_queue():
+    await job_queue.stop()
+    await progress_aggregator.stop()
+    WorkerPool.shutdown_all()
+
+@app.get("/queue")
+async def queue_stats():
+    return {**await job_queue.stats(), "worker_pools": [pool.stats() for pool in WorkerPool._shared.values()]}
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -172,6 +255,9 @@ async def websocket_endpoint(websocket: WebSocket):
                     active_tasks[current_project_id] = []
                 active_tasks[current_project_id].append(websocket)
                 print(f"🔗 Reconnected to project: {current_project_id}")
+                position = await job_queue.position(current_project_id)
+                if position:
+                    await notify_queue_position(current_project_id, position)
                 continue
 
             # New Task Logic
@@ -179,15 +265,23 @@ async def websocket_endpoint(websocket: WebSocket):
             if not url:
                 await websocket.send_json({"error": "No URL provided"})
                 continue
+            try:
+                priority = requested_priority(req)
+                # V82: an unknown profile fails here, not after the download and transcription
+                requested_render_profile(req)
+            except ValueError as e:
+                await websocket.send_json({"status": "error", "message": str(e)})
+                continue
             
             # Create placeholder project in DB
             title = url.split('/')[-1] or "New Project"
             project_id = await db_manager.save_project({
                 "title": title,
-                "status": "processing",
+                "status": "queued",
                 "progress": 0,
                 "mission": req.get("mission"),
-                "target_lang": req.get("language"),
+                "target_lang": requested_languages(req)[0],
+                "target_langs": requested_languages(req),
                 "url": url
             })
             
@@ -196,9 +290,15 @@ async def websocket_endpoint(websocket: WebSocket):
                 active_tasks[project_id] = []
             active_tasks[project_id].append(websocket)
             
-            # Start background task
-            asyncio.create_task(background_process(project_id, req))
-            await websocket.send_json({"status": "started", "project_id": project_id})
+            # V93: queue the pipeline; it starts when a worker slot frees up
+            try:
+                position = await job_queue.enqueue(project_id, req, priority=priority)
+            except QueueFullError as e:
+                await db_manager.update_project_status(project_id, "error", 0, str(e))
+                active_tasks.pop(project_id, None)
+                await websocket.send_json({"status": "error", "message": str(e), "project_id": project_id})
+                continue
+            await websocket.send_json({"status": "started", "project_id": project_id, "position": position})
 
     except WebSocketDisconnect:
         print(f"WebSocket Disconnected for project: {current_project_id}")
@@ -216,16 +316,8 @@ async def websocket_endpoint(websocket: WebSocket):
         except:
             pass
 
-@app.post("/generate-tts")
-async def generate_tts(req: dict):
-    text = req.get("text")
-    lang = req.get("lang", "en")
-    narrator_id = req.get("narratorId")
-    persona = req.get("persona")
-    tone = req.get("tone", "neutral")
-    import time
-    filename = req.get("filename", f"tts_{int(time.time())}.mp3")
-
+def _narrator_voice(narrator_id: str = None, persona: str = None, gender: str = "female") -> tuple:
+    """(persona, gender) for a narrator id; an explicit persona wins."""
     # Map narratorId to persona if not provided
     narrator_personas = {
         "guy": "anchor", 
@@ -238,17 +330,72 @@ async def generate_tts(req: dict):
     if not persona and narrator_id in narrator_personas:
         persona = narrator_personas[narrator_id]
 
-    gender = req.get("gender", "female")
     narrators_map = {"guy": "male", "aria": "female", "ameha": "male", "mekdes": "female", "chris": "expert", "eric": "reporter", "jenny": "specialist", "sonia": "global"}
     if narrator_id in narrators_map: gender = narrators_map[narrator_id]
+    return persona, gender
+
+@app.post("/generate-tts")
+async def generate_tts(req: dict):
+    text = req.get("text")
+    lang = req.get("lang", "en")
+    tone = req.get("tone", "neutral")
+    # V89: unique default name; identical requests are served from the TTS cache
+    filename = req.get("filename") or unique_name("tts", ".mp3")
+    persona, gender = _narrator_voice(req.get("narratorId"), req.get("persona"), req.get("gender", "female"))
     
     tts = TTSEngine(output_dir=ROOT_DIR / "assets/audio")
     path = await tts.generate_speech(text, lang=lang, gender=gender, tone=tone, persona=persona, filename=filename)
     
     if path:
-        return {"url": f"http://localhost:8000/static/audio/{filename}"}
+        return {"url": f"http://localhost:8000/static/audio/{Path(path).name}"}
     return {"error": "TTS Generation Failed"}
 
+# V90: the script travels in a POST body (long scripts exceed URL limits); the <audio src>
+# GET only carries the session id. Sessions outlive the first GET so a player can retry.
+TTS_STREAM_SESSION_SECONDS = 600
+MAX_TTS_STREAM_SESSIONS = 256
+tts_stream_sessions = {}  # session_id -> (created, request), oldest first
+
+@app.post("/generate-tts/stream")
+async def create_tts_stream(req: dict):
+    """Registers a streaming TTS request; returns the stream URL for an <audio> element."""
+    text = req.get("text")
+    if not isinstance(text, str) or not text.strip():
+        raise HTTPException(status_code=400, detail="text is required")
+    now = time.monotonic()
+    for session_id, (created, _) in list(tts_stream_sessions.items()):
+        if now - created > TTS_STREAM_SESSION_SECONDS or len(tts_stream_sessions) >= MAX_TTS_STREAM_SESSIONS:
+            del tts_stream_sessions[session_id]
+
+    persona, gender = _narrator_voice(req.get("narratorId"), req.get("persona"), req.get("gender", "female"))
+    session_id = uuid.uuid4().hex
+    filename = unique_name("tts", ".mp3")
+    tts_stream_sessions[session_id] = (now, {
+        "text": text, "lang": req.get("lang", "en"), "gender": gender, "tone": req.get("tone", "neutral"),
+        "persona": persona, "filename": filename, "normalize": bool(req.get("normalize", False)),
+    })
+    return {
+        "stream_url": f"http://localhost:8000/generate-tts/stream/{session_id}",
+        "url": f"http://localhost:8000/static/audio/{filename}",
+    }
+
+@app.get("/generate-tts/stream/{session_id}")
+async def stream_tts(session_id: str):
+    """
+    V90: MP3 streamed sentence by sentence (usable directly as an <audio> src).
+    The finished, post-processed file is saved under the X-Audio-Url header's URL.
+    """
+    session = tts_stream_sessions.get(session_id)
+    if not session or time.monotonic() - session[0] > TTS_STREAM_SESSION_SECONDS:
+        raise HTTPException(status_code=404, detail="Unknown or expired TTS stream")
+    params = session[1]
+    tts = TTSEngine(output_dir=ROOT_DIR / "assets/audio")
+    return StreamingResponse(
+        tts.stream_speech(**params),
+        media_type="audio/mpeg",
+        headers={"X-Audio-Url": f"http://localhost:8000/static/audio/{params['filename']}", "Cache-Control": "no-store"}
+    )
+
 @app.post("/generate-creative-script")
 async def generate_creative_script(req: dict):
     idea = req.get("idea")
@@ -292,42 +439,41 @@ async def approve_creative_project(req: dict):
     script = req.get("script")
     lang = req.get("lang", "en")
     narrator_id = req.get("narratorId")
-    persona = req.get("persona") # New: allow direct persona passing
-    
-    # Fallback/Mapping if persona not direct
-    narrator_personas = {
-        "guy": "anchor", 
-        "aria": "studio_pro", 
-        "chris": "expert", 
-        "eric": "reporter", 
-        "jenny": "specialist", 
-        "sonia": "global_voice"
-    }
-    if not persona and narrator_id in narrator_personas:
-        persona = narrator_personas[narrator_id]
-
-    gender = "female"
-    narrators = {"guy": "male", "aria": "female", "ameha": "male", "mekdes": "female", "chris": "expert", "eric": "reporter", "jenny": "specialist", "sonia": "global"}
-    if narrator_id in narrators: gender = narrators[narrator_id]
+    # Direct persona wins; otherwise it (and the gender) follow the narrator
+    persona, gender = _narrator_voice(narrator_id, req.get("persona"))
 
     tts_engine = TTSEngine(output_dir=ROOT_DIR / "assets/audio")
+    # V84: one narration file per approval, so concurrent projects never overwrite each other
+    narration_name = unique_name("creative_narration", ".mp3")
+    # V91: this narration only feeds /generate-forge-video, whose mux normalizes it in its one
+    # AAC encode ("deferred"); the preview plays Edge-TTS's own level
     audio_path = await tts_engine.generate_speech(
         script, 
         lang=lang, 
         gender=gender, 
         persona=persona, 
-        filename="creative_narration.mp3"
+        filename=narration_name,
+        post_process="deferred"
     )
     
+    segments = (req.get("segments") or [])[:6]
+    # V92: scene lengths and subtitles from the narration's real word timing
+    timing = tts_engine.last_timing if audio_path else None
+    durations = scene_durations(timing, [seg.get("text", "") for seg in segments]) if timing and segments else None
+
     storyboard = []
-    for i, seg in enumerate(segments[:6]):
+    for i, seg in enumerate(segments):
         prompt = await creative_engine.studio.generate_visual_prompt(seg["text"])
-        storyboard.append({"timestamp": seg["timestamp"], "title": seg["title"], "prompt": prompt})
+        scene = {"timestamp": seg["timestamp"], "title": seg["title"], "text": seg["text"], "prompt": prompt}
+        if durations:
+            scene["duration"] = f"{durations[i]:.3f}s"
+        storyboard.append(scene)
     
     if audio_path:
         return {
-            "audio_url": f"http://localhost:8000/static/audio/creative_narration.mp3",
+            "audio_url": f"http://localhost:8000/static/audio/{narration_name}",
             "storyboard": storyboard,
+            "srt_content": speech_srt(timing) if timing else None,
             "audio_path": str(audio_path) # Send absolute path for rendering step
         }
     return {"error": "Asset generation failed"}
@@ -337,25 +483,38 @@ async def generate_forge_video(req: dict):
     audio_path = req.get("audio_path")
     segments = req.get("segments", [])
     bg_music_genre = req.get("bg_music", "explainer")
+    # V82: "draft" for quick previews, "final" (default) for the master
+    try:
+        render_profile = requested_render_profile(req)
+    except ValueError as e:
+        return {"error": str(e)}
+    # V76/V77: "moviepy" (default), "filtergraph" or "parallel"; ken_burns needs "parallel"
+    render_mode = req.get("render_mode") or "moviepy"
     
     if not audio_path or not segments:
         return {"error": "Missing audio_path or segments"}
     
-    from processor.video_composer import VideoComposer
+    from processor.video_composer import VideoComposer, FORGE_RENDER_MODES
+    if render_mode not in FORGE_RENDER_MODES:
+        return {"error": f"Unknown render_mode {render_mode!r}; use one of {', '.join(FORGE_RENDER_MODES)}"}
     composer = VideoComposer(ROOT_DIR / "assets/videos")
     
-    safe_name = f"forge_video_{hash(audio_path) % 10000}.mp4"
+    safe_name = unique_name(f"forge_video{'_draft' if render_profile == 'draft' else ''}", ".mp4")
     try:
         # Long running task
         rendered_path = await composer.render_forge_video(
             audio_path, 
             segments, 
             safe_name, 
-            bg_music_genre=bg_music_genre
+            bg_music_genre=bg_music_genre,
+            render_mode=render_mode,
+            ken_burns=bool(req.get("ken_burns", False)),
+            profile=render_profile
         )
         return {
             "video_url": f"http://localhost:8000/static/videos/{safe_name}",
-            "filename": safe_name
+            "filename": safe_name,
+            "render_stats": composer.last_render_stats
         }
     except Exception as e:
         print(f"Rendering error: {e}")
@@ -404,8 +563,8 @@ async def transcribe_file(file: UploadFile = File(...)):
             content = await file.read()
             buffer.write(content)
             
-        # Transcribe in a separate thread to avoid blocking the event loop
-        result = await asyncio.to_thread(transcription_engine.transcribe_sync, str(file_path))
+        # V94: Whisper runs in a worker process, off the API's GIL
+        result = await WorkerPool.whisper().run(worker_tasks.transcribe_srt, str(file_path))
         
         # Cleanup
         try: os.remove(file_path)
@@ -426,6 +585,7 @@ async def transcribe_file(file: UploadFile = File(...)):
 app.mount("/static/videos", StaticFiles(directory=str(VIDEO_DIR)), name="static_videos")
 app.mount("/static/downloads", StaticFiles(directory=str(DOWNLOAD_DIR)), name="static_downloads")
 app.mount("/static/audio", StaticFiles(directory=str(AUDIO_DIR)), name="static_audio")
+app.mount("/static/thumbnails", StaticFiles(directory=str(THUMBNAIL_DIR)), name="static_thumbnails")
 
 @app.get("/download-file")
 async def download_file(type: str, filename: str):
@@ -2,8 +2,10 @@ import os
 import asyncio
 import json
 from processor.downloader import VideoDownloader
-from processor.transcriber import Transcriber
 from processor.english_recreator import EnglishVideoRecreator
+from processor.transcript_index import TranscriptIndex
+from processor.worker_pool import WorkerPool
+from processor import worker_tasks
 from audio.generator import AudioEngine
 from visual.editor import VisualEngine
 from pathlib import Path
@@ -12,7 +14,8 @@ class YouTubeStudioCreator:
     def __init__(self):
         self.base_dir = Path(__file__).parent.absolute()
         self.downloader = VideoDownloader(download_path=self.base_dir / "assets/downloads")
-        self.transcriber = Transcriber(model_size="base")
+        # V94: Whisper is loaded inside the worker processes, not in the API process
+        self.whisper_model = "base"
         self.audio_engine = AudioEngine(output_path=self.base_dir / "assets/audio")
         self.visual_engine = VisualEngine(output_path=self.base_dir / "assets/videos")
         
@@ -20,19 +23,25 @@ class YouTubeStudioCreator:
         (self.base_dir / "assets/images").mkdir(parents=True, exist_ok=True)
         (self.base_dir / "outputs").mkdir(parents=True, exist_ok=True)
 
-    async def process_video(self, url: str, target_duration: int = 5, target_lang: str = "am", tone: str = "neutral", mission: str = "translate", genre: str = "sermon", status_callback=None):
+    async def process_video(self, url: str, target_duration: int = 5, target_lang: str = "am", tone: str = "neutral", mission: str = "translate", genre: str = "sermon", status_callback=None, target_langs: list = None, render_profile: str = "final"):
         from processor.studio_engine import StudioEngine
         from processor.video_composer import VideoComposer
+        from processor.tts_engine import TTSEngine
         studio = StudioEngine()
+        tts = TTSEngine(output_dir=self.base_dir / "assets/audio")
+        # V94: CPU-heavy stages (Whisper, transcript analysis, MoviePy) run in worker processes
+        workers = WorkerPool.shared()
         en_recreator = EnglishVideoRecreator(studio_engine=studio)
         
-        async def update_status(msg, progress):
+        async def update_status(msg, progress, **extra):
+            # extra (e.g. language="es") is only forwarded when set, so plain (msg, progress) callbacks keep working
             if status_callback:
                 if asyncio.iscoroutinefunction(status_callback):
-                    await status_callback(msg, progress)
+                    await status_callback(msg, progress, **extra)
                 else:
-                    status_callback(msg, progress)
-            print(f"[{progress}%] {msg}")
+                    status_callback(msg, progress, **extra)
+            tag = f"[{extra['language']}] " if extra.get("language") else ""
+            print(f"{tag}[{progress}%] {msg}")
 
         await update_status("🎬 Starting studio analysis...", 0)
         
@@ -46,8 +55,6 @@ class YouTubeStudioCreator:
         # 2. Transcribe
         await update_status("✍️ Transcribing full audio...", 40)
         # We need the segments for the editing guide
-        whisper_model = self.transcriber.model
-        
         # V30: Transcription Heartbeat (Prevents UI appearing 'stuck' on CPU)
         stop_heartbeat = asyncio.Event()
         
@@ -64,7 +71,7 @@ class YouTubeStudioCreator:
         
         heartbeat_task = asyncio.create_task(heartbeat())
         try:
-            result = await asyncio.to_thread(whisper_model.transcribe, audio_path)
+            result = await WorkerPool.whisper().run(worker_tasks.transcribe, audio_path, self.whisper_model)
         finally:
             stop_heartbeat.set()
             await heartbeat_task
@@ -72,14 +79,25 @@ class YouTubeStudioCreator:
         source_text = result["text"]
         segments = result["segments"]
         await update_status("✅ Transcription complete", 60)
+
+        # V72: Tokenize the transcript once; every analyzer below reads from this index
+        index = TranscriptIndex(segments)
         
-        # 3. Script Analysis
         # 3. Studio Engine Analysis
         await update_status("🧠 Analyzing content strategy...", 70)
         # studio is already initialized at line 26
         
         # The UI sends target_duration in minutes.
         target_duration_mins = max(1, target_duration)
+
+        # V74: Multi-language fan-out. Everything up to here (download, Whisper, index)
+        # and the segment selection below is language independent and runs ONCE.
+        if isinstance(target_langs, str):
+            target_langs = [target_langs]
+        langs = list(dict.fromkeys(target_langs or [target_lang]))
+        primary_lang = langs[0]
+        title_stem = Path(audio_path).stem
+        safe_stem = "".join([c if c.isalnum() else "_" for c in title_stem])[:50]
         
         # V17: Massive Parallelism Sprint
         print("⚡ Starting Parallel Studio Analysis...")
@@ -87,77 +105,139 @@ class YouTubeStudioCreator:
         if mission == "recreate" or mission == "shorts":
             print(f"🎬 Mission: {mission.upper()} - Using Synthesis/Rendering path (Genre: {genre})...")
             # V40: Pass full segments for precision timestamp tracking
-            studio_script_data = en_recreator.condense_from_segments(segments, target_duration_mins=target_duration_mins, genre=genre)
-            
-            async def get_script():
-                text = studio_script_data["text"]
-                if target_lang != "en":
-                    return await studio.translate_text(text, target_lang=target_lang, tone=tone)
-                return text
-
-            studio_script_task = get_script()
-            metadata_task = studio.generate_metadata_recommendations(Path(audio_path).stem, segments, target_lang, tone, genre=genre)
-            editing_guide_task = en_recreator.extract_editing_roadmap(target_duration_mins)
+            # V94: the knapsack planner runs in a worker; the roadmap reads its selected segments
+            studio_script_data, en_recreator.selected_segments = await workers.run(worker_tasks.condense_segments, segments, target_duration_mins, genre, index)
+            # Roadmap narration stays in English, so it is shared by every language
+            shared_editing_guide = await en_recreator.extract_editing_roadmap(target_duration_mins)
+            editing_islands = None
         else:
             print(f"🌍 Mission: {mission.upper()} - Using Translation/Localization path...")
-            studio_script_task = studio.translate_text(source_text, target_lang=target_lang, tone=tone)
-            metadata_task = studio.generate_metadata_recommendations(Path(audio_path).stem, segments, target_lang, tone, genre=genre)
-            editing_guide_task = studio.extract_editing_guide(segments, target_duration_mins, target_lang, tone, genre=genre)
-
-        # Define all tasks (Directly await async ones, wrap sync ones in to_thread)
-        tasks = {
-            "studio_script": studio_script_task,
-            "hooks": studio.generate_hooks(segments[:50], target_lang=target_lang),
-            "thumbnail_data": studio.generate_thumbnail_prompt(Path(audio_path).stem, segments),
-            "metadata": metadata_task,
-            "chapters": studio.generate_chapters(segments, target_lang=target_lang),
-            "shorts_clip": asyncio.to_thread(studio.shorts_clip_selector, segments),
-            "growth_launchpad": studio.generate_community_posts(Path(audio_path).stem, segments),
-            "social_thread": studio.generate_social_thread(source_text, target_lang=target_lang),
-            "srt_content": studio.generate_srt(segments[:20], target_lang=target_lang),
-            "editing_guide": editing_guide_task
+            studio_script_data = None
+            shared_editing_guide = None
+            editing_islands = await workers.run(worker_tasks.select_editing_islands, segments, target_duration_mins, genre, index)
+
+        # Shared analysis (no translation involved)
+        shared_tasks = {
+            "thumbnail_data": studio.generate_thumbnail_prompt(title_stem, segments),
+            # V85: top highlight windows (best first); each can be rendered as a Short
+            "shorts_clips": workers.run(worker_tasks.shorts_clip_windows, segments, index, 3),
+            "growth_launchpad": studio.generate_community_posts(title_stem, segments),
+            "chapter_boundaries": workers.run(worker_tasks.detect_topic_shifts, index),
         }
-        
-        # Run all concurrently
-        results = await asyncio.gather(*tasks.values())
-        results_map = dict(zip(tasks.keys(), results))
+        shared_results = dict(zip(shared_tasks.keys(), await asyncio.gather(*shared_tasks.values())))
+
+        async def analyze_language(lang: str, lang_idx: int):
+            """Translation-dependent outputs for one target language."""
+            await update_status(f"🌍 [{lang.upper()}] Localizing studio package...", 0, language=lang)
+
+            async def get_script():
+                if studio_script_data is not None:
+                    text = studio_script_data["text"]
+                    if lang != "en":
+                        return await studio.translate_text(text, target_lang=lang, tone=tone)
+                    return text
+                return await studio.translate_text(source_text, target_lang=lang, tone=tone)
+
+            if shared_editing_guide is not None:
+                editing_guide_task = asyncio.sleep(0, result=shared_editing_guide)
+            else:
+                editing_guide_task = studio.package_editing_guide(editing_islands, target_lang=lang, tone=tone, genre=genre)
+
+            script_task = asyncio.ensure_future(get_script())
+
+            async def narrate():
+                """One narration of this language's script (its voice comes from the language)."""
+                script = await script_task
+                if not script:
+                    return None
+                await update_status(f"🎙️ [{lang.upper()}] Recording narration...", 50, language=lang)
+                try:
+                    return await tts.generate_speech(script, lang=lang, tone=tone, filename=f"narration_{safe_stem}_{lang}.mp3")
+                except Exception as e:
+                    print(f"⚠️ [{lang}] Narration failed: {e}")
+                    return None
+
+            # Define all tasks (Directly await async ones, wrap sync ones in to_thread)
+            tasks = {
+                "studio_script": script_task,
+                "narration": narrate(),
+                "hooks": studio.generate_hooks(segments[:50], target_lang=lang, index=index),
+                "metadata": studio.generate_metadata_recommendations(title_stem, segments, lang, tone, genre=genre, index=index),
+                "chapters": studio.generate_chapters(segments, target_lang=lang, index=index, boundaries=shared_results["chapter_boundaries"]),
+                "social_thread": studio.generate_social_thread(source_text, target_lang=lang, index=index),
+                "srt_content": studio.generate_srt(segments[:20], target_lang=lang),
+                "editing_guide": editing_guide_task
+            }
+            
+            # Run all concurrently
+            results = await asyncio.gather(*tasks.values())
+            lang_results = dict(zip(tasks.keys(), results))
+            await update_status(f"✅ [{lang.upper()}] Localization complete", 100, language=lang)
+            await update_status(f"🌍 Localized {lang_idx + 1}/{len(langs)} languages", 70 + int(((lang_idx + 1) / len(langs)) * 15))
+            return lang_results
+
+        per_lang = await asyncio.gather(*(analyze_language(lang, i) for i, lang in enumerate(langs)))
+        results_by_lang = dict(zip(langs, per_lang))
         print("✅ Massive Parallel Analysis complete.")
 
+        def language_package(lang):
+            lang_results = results_by_lang[lang]
+            return {
+                "studio_script": lang_results["studio_script"],
+                "target_lang": lang,
+                "editing_guide": lang_results["editing_guide"],
+                "viral_hooks": lang_results["hooks"],
+                "metadata": lang_results["metadata"],
+                "chapters": lang_results["chapters"],
+                "social_thread": lang_results["social_thread"],
+                "srt_content": lang_results["srt_content"],
+                "narration_path": lang_results["narration"],
+            }
+
+        # Top-level fields mirror the primary language (backwards compatible with single-language projects)
         result_data = {
             "english_script": source_text,
-            "studio_script": results_map["studio_script"],
-            "target_lang": target_lang,
-            "editing_guide": results_map["editing_guide"],
-            "viral_hooks": results_map["hooks"],
-            "thumbnail_prompt": results_map["thumbnail_data"],
-            "thumbnail_image_url": studio.generate_ai_image_url(results_map["thumbnail_data"]),
-            "metadata": results_map["metadata"],
-            "chapters": results_map["chapters"],
-            "shorts_clip": results_map["shorts_clip"],
-            "growth_launchpad": results_map["growth_launchpad"],
-            "social_thread": results_map["social_thread"],
-            "srt_content": results_map["srt_content"],
+            **language_package(primary_lang),
+            "target_langs": langs,
+            "languages": {lang: language_package(lang) for lang in langs},
+            "thumbnail_prompt": shared_results["thumbnail_data"],
+            "thumbnail_image_url": studio.generate_ai_image_url(shared_results["thumbnail_data"]),
+            "shorts_clip": (shared_results["shorts_clips"] or [None])[0],
+            "shorts_clips": shared_results["shorts_clips"],
+            "growth_launchpad": shared_results["growth_launchpad"],
             "video_filename": Path(video_path).name,
             "target_duration": target_duration
         }
-
         # V22: Automated Video Editing Step
         print("🎬 Starting Automated Video Composition...")
-        safe_stem = "".join([c if c.isalnum() else "_" for c in Path(audio_path).stem])[:50]
         composer = VideoComposer(self.base_dir / "assets/videos")
         try:
             rendered_video_path = await composer.compose_condensed_video(
                 video_path, 
-                results_map["editing_guide"], 
+                result_data["editing_guide"], 
                 f"rendered_{safe_stem}.mp4",
-                status_callback=status_callback
+                status_callback=status_callback,
+                profile=render_profile
             )
             result_data["rendered_video_path"] = rendered_video_path
+            result_data["render_stats"] = composer.last_render_stats
             print(f"✅ Rendered Video Saved: {rendered_video_path}")
         except Exception as e:
             print(f"⚠️ Video Rendering Failed: {e}")
             result_data["rendered_video_path"] = None
 
+        # V87: real source frames at the highlights as thumbnail candidates (beside the AI prompt)
+        try:
+            result_data["thumbnail_candidates"] = await composer.extract_thumbnails(
+                video_path,
+                result_data["editing_guide"],
+                safe_stem,
+                shorts_windows=result_data["shorts_clips"]
+            )
+        except Exception as e:
+            print(f"⚠️ Thumbnail extraction failed: {e}")
+            result_data["thumbnail_candidates"] = []
+
         # Save result as JSON (Slugify filename to avoid Windows errors)
         output_file = self.base_dir / f"outputs/studio_{safe_stem}.json"
         
@@ -7,6 +7,8 @@ class DatabaseManager:
         self.client = motor.motor_asyncio.AsyncIOMotorClient(uri)
         self.db = self.client[db_name]
         self.projects = self.db.projects
+        # V93: persistent pipeline queue (see processor/job_queue.py)
+        self.jobs = self.db.jobs
 
     async def save_project(self, project_data: Dict[str, Any]) -> str:
         """Saves a new project result to MongoDB."""
@@ -20,7 +22,7 @@ class DatabaseManager:
 
     async def get_all_projects(self) -> List[Dict[str, Any]]:
         """Retrieves all project summaries from MongoDB (newest first)."""
-        cursor = self.projects.find({}, {"title": 1, "created_at": 1, "_id": 1, "status": 1, "mission": 1, "progress": 1, "target_lang": 1}).sort("created_at", -1)
+        cursor = self.projects.find({}, {"title": 1, "created_at": 1, "_id": 1, "status": 1, "mission": 1, "progress": 1, "target_lang": 1, "target_langs": 1}).sort("created_at", -1)
         projects = []
         async for doc in cursor:
             doc["_id"] = str(doc["_id"])
@@ -2,6 +2,20 @@ import asyncio
 import re
 from pathlib import Path
 
+import numpy as np
+
+from processor.transcript_index import FILLER_RE, STOP_WORDS, TranscriptIndex
+
+ACTION_STARTERS = frozenset({"imagine", "discover", "learn", "stop", "how", "why", "here", "what"})
+INTERVIEW_WORDS = frozenset({"who", "what", "how", "why", "tell", "explain", "question"})
+PODCAST_HOOKS = frozenset({"interesting", "crazy", "secret", "imagine", "actually", "wow"})
+
+# Planner tuning
+MERGE_GAP_SECONDS = 45        # Highlights closer than this may be bridged into one block
+DP_QUANTUM_SECONDS = 0.5      # Duration resolution of the knapsack table
+CLUSTER_MERGE_BONUS = 0.15    # Relative score bonus for extending a continuous block
+CLIP_START_COST = 0.5         # Cost of opening a new clip (a jump cut), in median segment scores
+
 class EnglishVideoRecreator:
     def __init__(self, studio_engine=None):
         """
@@ -17,56 +31,69 @@ class EnglishVideoRecreator:
         s = int(seconds % 60)
         return f"{m:02d}:{s:02d}"
 
-    def condense_from_segments(self, segments: list, target_duration_mins: int = 5, genre: str = "sermon") -> dict:
+    def condense_from_segments(self, segments: list, target_duration_mins: int = 5, genre: str = "sermon", planner: str = "optimal", index: TranscriptIndex = None) -> dict:
         """
         🧬 V41: Segment-Aware Condensation
         Analyzes Whisper segments directly to preserve timing.
         Returns both condensed text AND the mapping of segments used.
+        V71: planner="optimal" fills the budget with a knapsack DP, "greedy" keeps the legacy picker.
+        V72: Reuses the shared TranscriptIndex tokens when provided.
         """
         if not segments: return {"text": "", "clips": []}
         
-        # 1. Cleaner: Define filler removal
-        fillers = [
-            r"\b(you know)\b", r"\b(i mean)\b", r"\b(basically)\b", 
-            r"\b(actually)\b", r"\b(literally)\b", r"\b(to be honest)\b", 
-            r"\b(obviously)\b", r"\b(kind of)\b", r"\b(sort of)\b"
-        ]
+        scored_segments = self._score_segments(segments, genre=genre, index=index)
+        target_seconds = target_duration_mins * 60
+        
+        if planner == "greedy":
+            clustered_clips = self._plan_greedy(scored_segments, target_seconds)
+        else:
+            clustered_clips = self._plan_optimal(scored_segments, target_seconds)
+
+        self.selected_segments = clustered_clips
+        total_final_dur = sum(c['duration'] for c in clustered_clips)
         
-        stop_words = {"the", "is", "at", "which", "on", "and", "to", "of", "a", "in", "that", "it", "with", "from", "for"}
+        # Audit Log
+        print(f"📊 Recreator Audit: Request {target_duration_mins}m | Planned {round(total_final_dur/60, 2)}m")
+        
+        full_text = ". ".join([c['clean_text'] for c in clustered_clips])
         
-        # 2. Score Segments individually
+        return {
+            "text": full_text + ".",
+            "clips_count": len(clustered_clips),
+            "total_duration": total_final_dur
+        }
+
+    def _score_segments(self, segments: list, genre: str = "sermon", index: TranscriptIndex = None) -> list:
+        """Scores Whisper segments individually (chronological order is preserved)."""
+        if index is None:
+            index = TranscriptIndex(segments)
         scored_segments = []
-        for seg in segments:
-            text = seg['text'].strip()
+        for i, seg in enumerate(segments):
+            text = index.texts[i]
             if not text: continue
             
-            # Clean text for scoring
-            clean_text = text
-            for pattern in fillers:
-                clean_text = re.sub(pattern + r"[,]?\s*", "", clean_text, flags=re.IGNORECASE)
+            # Clean text for scoring (fillers were stripped once by the index)
+            clean_text = index.clean_texts[i]
             
-            words = [w.strip(",.").lower() for w in clean_text.split()]
+            words = index.clean_tokens[i]
             if len(words) < 3: continue
             
             # Density Score
-            content_words = [w for w in words if w not in stop_words]
+            content_words = [w for w in words if w not in STOP_WORDS]
             density = len(content_words) / (len(words) ** 0.8)
             
             # Action Starter Bonus
-            action_starters = ["imagine", "discover", "learn", "stop", "how", "why", "here", "why", "what"]
-            multiplier = 1.3 if words[0] in action_starters else 1.0
+            multiplier = 1.3 if words[0] in ACTION_STARTERS else 1.0
             
             duration = seg['end'] - seg['start']
             
             # Genre-Specific Scoring
             genre_bonus = 1.0
             if genre == "interview":
-                q_words = ["who", "what", "how", "why", "tell", "explain", "question"]
-                if any(w in words[0:3] for w in q_words) or "?" in text:
+                if any(w in INTERVIEW_WORDS for w in words[0:3]) or "?" in text:
                     genre_bonus = 1.5
             elif genre == "podcast":
-                hooks = ["interesting", "crazy", "secret", "imagine", "actually", "wow"]
-                if any(h in words for h in hooks):
+                if any(h in PODCAST_HOOKS for h in words):
                     genre_bonus = 1.4
             
             scored_segments.append({
@@ -77,11 +104,10 @@ class EnglishVideoRecreator:
                 "start_time": seg['start'],
                 "end_time": seg['end']
             })
+        return scored_segments
 
-        # 3. Selection Strategy (Dynamic Duration Fix)
-        # We need to ensure we pick enough segments to actually fill the target duration
-        target_seconds = target_duration_mins * 60
-        
+    def _plan_greedy(self, scored_segments: list, target_seconds: float) -> list:
+        """Legacy V46 planner: score-greedy picking followed by capped 45s clustering."""
         # Sort by score but maintain some chronological proximity
         ranked = sorted(scored_segments, key=lambda x: x['score'], reverse=True)
         
@@ -91,15 +117,14 @@ class EnglishVideoRecreator:
         # Selection phase: Pick the "Gold" segments until duration is met
         for item in ranked:
             if current_duration + item['duration'] <= target_seconds:
-                selection.append(item)
+                selection.append(dict(item))
                 current_duration += item['duration']
             if current_duration >= target_seconds: 
                 break
         
-        # 4. Sequential Order & Context-Bridge (Insight Islands)
+        # Sequential Order & Context-Bridge (Insight Islands)
         final_clips = sorted(selection, key=lambda x: x['start_time'])
         
-        # V46: Strict Capped Clustering
         # If two highlights are within 45s of each other, we merge them into one continuous block
         clustered_clips = []
         if final_clips:
@@ -114,7 +139,7 @@ class EnglishVideoRecreator:
                 potential_dur = next_clip['end_time'] - current_block['start_time']
                 
                 # Only merge if it's a tight gap and doesn't push us over the hard limit
-                if gap < 45 and (current_total_dur + potential_dur) <= target_seconds:
+                if gap < MERGE_GAP_SECONDS and (current_total_dur + potential_dur) <= target_seconds:
                     current_block['end_time'] = next_clip['end_time']
                     current_block['clean_text'] += " " + next_clip['clean_text']
                     current_block['duration'] = current_block['end_time'] - current_block['start_time']
@@ -131,20 +156,139 @@ class EnglishVideoRecreator:
                 
             if current_block['duration'] > 0:
                 clustered_clips.append(current_block)
+        return clustered_clips
 
-        self.selected_segments = clustered_clips
-        total_final_dur = sum(c['duration'] for c in clustered_clips)
-        
-        # Audit Log
-        print(f"📊 Recreator Audit: Request {target_duration_mins}m | Planned {round(total_final_dur/60, 2)}m")
-        
-        full_text = ". ".join([c['clean_text'] for c in clustered_clips])
-        
-        return {
-            "text": full_text + ".",
-            "clips_count": len(clustered_clips),
-            "total_duration": total_final_dur
-        }
+    def _plan_optimal(self, scored_segments: list, target_seconds: float) -> list:
+        """
+        🧮 V71: Duration-Budgeted Optimal Planner
+        0/1 knapsack over durations discretized to DP_QUANTUM_SECONDS, walked in
+        chronological order with a two-state DP (previous segment taken / skipped).
+        Taking a segment right after a taken neighbour may "bridge" the gap between
+        them (gap time is paid from the budget) and earns the cluster-merge bonus,
+        so continuous insight islands are planned directly instead of merged after.
+        Every new (unbridged) clip pays CLIP_START_COST, so the value is not bought with a
+        jump cut every few seconds. Objective and bonus are pinned by tests/condense_planner_check.py.
+        """
+        n = len(scored_segments)
+        capacity = int(round(target_seconds / DP_QUANTUM_SECONDS))
+        if n == 0 or capacity <= 0:
+            return []
+
+        weights = np.empty(n, dtype=np.int64)
+        gaps = np.full(n, -1, dtype=np.int64)  # -1 => cannot bridge from previous segment
+        values = np.empty(n, dtype=np.float64)
+        for i, item in enumerate(scored_segments):
+            weights[i] = max(1, round(max(0.0, item['duration']) / DP_QUANTUM_SECONDS))
+            values[i] = item['score']
+            if i > 0:
+                gap = item['start_time'] - scored_segments[i - 1]['end_time']
+                if gap < MERGE_GAP_SECONDS:
+                    gaps[i] = round(max(0.0, gap) / DP_QUANTUM_SECONDS)
+
+        start_cost = CLIP_START_COST * float(np.median(values))
+
+        # The optimizer favours segments that round down, so re-solve with a tighter
+        # grid budget until the real duration fits (usually one extra pass at most).
+        clustered_clips = []
+        for _ in range(3):
+            chosen = self._knapsack_pass(weights, gaps, values, capacity, start_cost)
+            clustered_clips = self._blocks_from_choice(scored_segments, chosen)
+            overflow = sum(c['duration'] for c in clustered_clips) - target_seconds
+            if overflow <= 0 or capacity <= 1:
+                break
+            capacity -= max(1, int(np.ceil(overflow / DP_QUANTUM_SECONDS)))
+
+        # Hard stop: trim the last block if a residual overshoot remains
+        overflow = sum(c['duration'] for c in clustered_clips) - target_seconds
+        while overflow > 0 and clustered_clips:
+            last = clustered_clips[-1]
+            if last['duration'] > overflow:
+                last['duration'] -= overflow
+                last['end_time'] = last['start_time'] + last['duration']
+                break
+            overflow -= last['duration']
+            clustered_clips.pop()
+        return clustered_clips
+
+    def _knapsack_pass(self, weights, gaps, values, capacity: int, start_cost: float = 0.0) -> list:
+        """Runs one DP pass and backtracks the optimum as [(index, bridged_from_previous)]."""
+        n = len(weights)
+        neg = -np.inf
+        skip = np.full(capacity + 1, neg)   # best value, last segment skipped, exact budget c
+        take = np.full(capacity + 1, neg)   # best value, last segment taken, exact budget c
+        skip[0] = 0.0
+
+        # Backtracking bits are packed 8 per byte to keep 10k x budget tables small.
+        skip_from_take = np.empty((n, (capacity + 8) // 8), dtype=np.uint8)
+        take_bridged = np.empty_like(skip_from_take)
+        take_from_take = np.empty_like(skip_from_take)
+
+        for i in range(n):
+            w = int(weights[i])
+            v = values[i]
+            either = np.maximum(skip, take)
+            from_take = take > skip
+
+            new_take = np.full(capacity + 1, neg)
+            new_from_take = np.zeros(capacity + 1, dtype=bool)
+            if w <= capacity:
+                new_take[w:] = either[:capacity + 1 - w] + v - start_cost
+                new_from_take[w:] = from_take[:capacity + 1 - w]
+
+            bridged = np.zeros(capacity + 1, dtype=bool)
+            g = int(gaps[i])
+            if g >= 0 and w + g <= capacity:
+                cost = w + g
+                candidate = np.full(capacity + 1, neg)
+                candidate[cost:] = take[:capacity + 1 - cost] + v * (1.0 + CLUSTER_MERGE_BONUS)
+                bridged = candidate > new_take
+                new_take = np.where(bridged, candidate, new_take)
+
+            skip_from_take[i] = np.packbits(from_take)
+            take_bridged[i] = np.packbits(bridged)
+            take_from_take[i] = np.packbits(new_from_take)
+            skip, take = either, new_take
+
+        def bit(table, i, c):
+            return (table[i, c >> 3] >> (7 - (c & 7))) & 1
+
+        # Best finishing state over every budget level
+        best_skip, best_take = int(np.argmax(skip)), int(np.argmax(take))
+        if take[best_take] > skip[best_skip]:
+            state, c = "take", best_take
+        else:
+            state, c = "skip", best_skip
+
+        chosen = []
+        for i in range(n - 1, -1, -1):
+            if state == "skip":
+                state = "take" if bit(skip_from_take, i, c) else "skip"
+                continue
+            if bit(take_bridged, i, c):
+                chosen.append((i, True))
+                c -= int(weights[i] + gaps[i])
+                state = "take"
+            else:
+                chosen.append((i, False))
+                state = "take" if bit(take_from_take, i, c) else "skip"
+                c -= int(weights[i])
+        chosen.reverse()
+        return chosen
+
+    def _blocks_from_choice(self, scored_segments: list, chosen: list) -> list:
+        """Turns the bridged runs of a DP choice into continuous clip blocks."""
+        clustered_clips = []
+        for i, bridged in chosen:
+            item = scored_segments[i]
+            if bridged and clustered_clips:
+                block = clustered_clips[-1]
+                block['end_time'] = item['end_time']
+                block['clean_text'] += " " + item['clean_text']
+                block['score'] += item['score']
+                block['duration'] = block['end_time'] - block['start_time']
+            else:
+                clustered_clips.append(dict(item))
+        return clustered_clips
 
     async def generate_metadata(self, title: str, condensed_text: str):
         """Generates high-CTR English titles and descriptions."""
@@ -188,6 +332,8 @@ class EnglishVideoRecreator:
                 "index": i,
                 "timestamp_start": start_str,
                 "timestamp_end": end_str,
+                "start_sec": round(item['start_time'], 3),
+                "end_sec": round(item['end_time'], 3),
                 "duration": round(item['duration'], 2),
                 "original_text": item['clean_text'],
                 "narration_suggestion": item['clean_text'],
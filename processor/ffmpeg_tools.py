@@ -0,0 +1,231 @@
+import asyncio
+import json
+import math
+import os
+import subprocess
+from pathlib import Path
+
+# Binaries can be overridden for portable installs (e.g. a bundled static ffmpeg)
+FFMPEG = os.environ.get("FFMPEG_BIN", "ffmpeg")
+FFPROBE = os.environ.get("FFPROBE_BIN", "ffprobe")
+
+# Light "studio" compression applied to narration after loudness normalization
+VOICE_COMPRESSOR = "acompressor=threshold=-18dB:ratio=3:attack=5:release=50"
+
+class FFmpegError(Exception):
+    """Raised when an ffmpeg/ffprobe subprocess exits with a non-zero status."""
+
+def thread_budget(workers: int = 1, cores: int = None) -> int:
+    """
+    Encoder threads per ffmpeg process so `workers` concurrent encodes share the cores evenly.
+    cores: the caller's own budget (a render scheduler slot) instead of the whole machine.
+    """
+    return max(1, (cores or os.cpu_count() or 1) // max(1, workers))
+
+async def run_ffmpeg(args: list, cwd: str = None) -> str:
+    """Runs ffmpeg with the given arguments (without the binary name) and returns stderr."""
+    cmd = [FFMPEG, "-hide_banner", "-nostdin", "-y", *[str(a) for a in args]]
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd
+    )
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        # A cancelled render must not leave an orphaned encoder writing into a deleted workdir
+        process.kill()
+        await process.wait()
+        raise
+    log = stderr.decode(errors="replace")
+    if process.returncode != 0:
+        raise FFmpegError(f"ffmpeg exited with {process.returncode}: {log[-800:]}")
+    return log
+
+async def run_ffmpeg_progress(args: list, total_seconds: float = None, on_progress=None) -> str:
+    """
+    Runs ffmpeg with `-progress pipe:1` and reports parsed snapshots to on_progress(fraction, stats).
+    stats carries frame, fps, out_time (seconds) and speed exactly as ffmpeg reports them.
+    """
+    cmd = [FFMPEG, "-hide_banner", "-nostdin", "-y", "-progress", "pipe:1", "-nostats", *[str(a) for a in args]]
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    # Drain stderr concurrently so a chatty encoder can never block the pipe
+    stderr_task = asyncio.create_task(process.stderr.read())
+
+    try:
+        stats = {}
+        async for raw_line in process.stdout:
+            key, _, value = raw_line.decode(errors="replace").strip().partition("=")
+            if key in ("frame", "fps", "speed", "out_time_us", "out_time_ms"):
+                stats[key] = value.strip()
+            elif key == "progress" and on_progress:
+                try:
+                    out_time = float(stats.get("out_time_us") or stats.get("out_time_ms") or 0) / 1_000_000
+                except ValueError:
+                    out_time = 0.0
+                # out_time starts negative (N/A or pre-roll) until the first frame is muxed
+                out_time = max(0.0, out_time)
+                snapshot = {
+                    "frame": int(stats.get("frame") or 0),
+                    "fps": float(stats.get("fps") or 0),
+                    "out_time": out_time,
+                    "speed": stats.get("speed", ""),
+                    "done": value.strip() == "end",
+                }
+                fraction = min(1.0, max(0.0, out_time / total_seconds)) if total_seconds else 0.0
+                result = on_progress(fraction, snapshot)
+                if asyncio.iscoroutine(result):
+                    await result
+
+        await process.wait()
+    finally:
+        if process.returncode is None:
+            # Cancelled, or on_progress raised: don't leave the encoder running unobserved
+            process.kill()
+            await process.wait()
+            stderr_task.cancel()
+    log = (await stderr_task).decode(errors="replace")
+    if process.returncode != 0:
+        raise FFmpegError(f"ffmpeg exited with {process.returncode}: {log[-800:]}")
+    return log
+
+async def measure_loudness(path: str, target_i: float = -16.0, target_tp: float = -1.5, target_lra: float = 11.0) -> dict:
+    """
+    First loudnorm pass: the input's integrated loudness/true peak/LRA/threshold as ffmpeg
+    reports them (strings, e.g. {"input_i": "-23.41", ...}). Decodes the audio only.
+    """
+    log = await run_ffmpeg([
+        "-i", path, "-map", "0:a:0", "-vn",
+        "-af", f"loudnorm=I={target_i}:TP={target_tp}:LRA={target_lra}:print_format=json",
+        "-f", "null", "-"
+    ])
+    # The JSON block is the last {...} ffmpeg prints
+    start, end = log.rfind("{"), log.rfind("}")
+    if start < 0 or end < start:
+        raise FFmpegError(f"loudnorm printed no measurement for {path}")
+    return json.loads(log[start:end + 1])
+
+def loudnorm_filter(measured: dict, target_i: float = -16.0, target_tp: float = -1.5, target_lra: float = 11.0) -> str:
+    """Second loudnorm pass: linear gain from a measure_loudness() result (no dynamic pumping)."""
+    return (
+        f"loudnorm=I={target_i}:TP={target_tp}:LRA={target_lra}"
+        f":measured_I={measured['input_i']}:measured_TP={measured['input_tp']}"
+        f":measured_LRA={measured['input_lra']}:measured_thresh={measured['input_thresh']}"
+        f":offset={measured['target_offset']}:linear=true"
+    )
+
+def loudness_sidecar(path) -> Path:
+    """Where the measured loudness of an audio file is stored: <name>.loudness.json beside it."""
+    path = Path(path)
+    return path.with_name(f"{path.name}.loudness.json")
+
+def deferred_voice_filter(path) -> str:
+    """
+    Narration normalization left to the final mux (TTS post_process="deferred"): the stored
+    stats of `path` as linear loudnorm + compression at 48 kHz, or None when the audio has
+    no deferred stats (already processed, or measure-only).
+    """
+    try:
+        with open(loudness_sidecar(path), "r", encoding="utf-8") as f:
+            measured = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Silence (or a clip shorter than one gating block) measures -inf: nothing to normalize
+    if not measured.get("deferred") or not math.isfinite(float(measured.get("input_i", "-inf"))):
+        return None
+    return f"{loudnorm_filter(measured)},{VOICE_COMPRESSOR},aresample=48000"
+
+async def _run_ffprobe(args: list) -> str:
+    process = await asyncio.create_subprocess_exec(
+        FFPROBE, "-v", "error", *[str(a) for a in args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise FFmpegError(f"ffprobe exited with {process.returncode}: {stderr.decode(errors='replace')[-400:]}")
+    return stdout.decode(errors="replace")
+
+async def probe_media(path: str) -> dict:
+    """Returns {'format': {...}, 'video': {...} | None, 'audio': {...} | None} from ffprobe."""
+    raw = await _run_ffprobe(["-show_streams", "-show_format", "-of", "json", path])
+    data = json.loads(raw or "{}")
+    streams = data.get("streams", [])
+    return {
+        "format": data.get("format", {}),
+        "video": next((s for s in streams if s.get("codec_type") == "video"), None),
+        "audio": next((s for s in streams if s.get("codec_type") == "audio"), None),
+    }
+
+async def probe_gop_index(path: str) -> dict:
+    """
+    {"keyframes", "frames", "open_keyframes"} of the first video stream (ascending seconds).
+    Reads packet flags only, so nothing is decoded even for multi-hour sources.
+    open_keyframes: keyframes starting an open GOP, i.e. followed in decode order by a frame
+    shown before them (leading pictures that reference the previous GOP).
+    """
+    raw = await _run_ffprobe([
+        "-select_streams", "v:0", "-show_entries", "packet=pts_time,flags",
+        "-of", "csv=p=0", path
+    ])
+    keyframes, frames, open_keyframes = [], [], []
+    keyframe = None
+    for line in raw.splitlines():
+        parts = line.strip().split(",")
+        if len(parts) < 2 or parts[0] in ("", "N/A"):
+            continue
+        pts = float(parts[0])
+        frames.append(pts)
+        if "K" in parts[1]:
+            keyframes.append(pts)
+            keyframe = pts
+        elif keyframe is not None and pts < keyframe:
+            open_keyframes.append(keyframe)
+            keyframe = None
+    keyframes.sort()
+    frames.sort()
+    return {"keyframes": keyframes, "frames": frames, "open_keyframes": sorted(set(open_keyframes))}
+
+async def probe_frame_index(path: str) -> tuple:
+    """(keyframe_times, frame_times) of the first video stream, both ascending seconds."""
+    index = await probe_gop_index(path)
+    return index["keyframes"], index["frames"]
+
+async def probe_keyframes(path: str) -> list:
+    """Keyframe timestamps (seconds, ascending) of the first video stream."""
+    keyframes, _ = await probe_frame_index(path)
+    return keyframes
+
+def parse_rate(rate: str, default: float = 30.0) -> float:
+    """Parses ffprobe rationals like '30000/1001'."""
+    try:
+        num, _, den = str(rate).partition("/")
+        value = float(num) / float(den or 1)
+        return value if value > 0 else default
+    except (ValueError, ZeroDivisionError):
+        return default
+
+async def concat_files(pieces: list, output_path: str, workdir: Path, extra_args: list = None, durations: list = None) -> str:
+    """
+    Joins pieces losslessly with the concat demuxer (all pieces must share codec parameters).
+    durations: exact seconds per piece, so the next piece starts there whatever the piece's
+    container reports (B-frame delay or audio padding would otherwise leave gaps).
+    """
+    list_file = Path(workdir) / f"concat_{Path(output_path).stem}.txt"
+    with open(list_file, "w", encoding="utf-8") as f:
+        for i, piece in enumerate(pieces):
+            escaped = str(Path(piece).resolve()).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+            if durations:
+                f.write(f"duration {durations[i]:.6f}\n")
+    await run_ffmpeg([
+        "-f", "concat", "-safe", "0", "-i", list_file,
+        "-c", "copy", *(extra_args or []),
+        "-movflags", "+faststart", output_path
+    ])
+    return str(output_path)
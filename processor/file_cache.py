@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+def stable_digest(*parts) -> str:
+    """sha256 over a canonical JSON encoding: identical inputs give identical keys in every process."""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def stable_seed(*parts, modulo: int = 10000) -> int:
+    """Deterministic replacement for `hash(x) % modulo` (str hashing is salted per process)."""
+    return int(stable_digest(*parts)[:12], 16) % modulo
+
+def file_digest(path: str, chunk_size: int = 4 * 1024 * 1024) -> str:
+    """sha256 of a file's bytes, read in chunks so multi-GB sources never sit in memory."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+class FileCache:
+    def __init__(self, cache_dir: Path, max_bytes: int = None):
+        """
+        🗃️ V78: Content-Addressed File Cache
+        Stores artifacts under their digest key. Writes go to a temp name and are
+        published with os.replace, so a crash or a concurrent reader never sees a partial file.
+        V80: optional disk budget (max_bytes) with least-recently-used eviction, plus
+        hit/miss/eviction counters.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._total_bytes = None  # measured lazily on the first write
+
+    def path_for(self, key: str, suffix: str = "") -> Path:
+        # Two-level fan-out keeps directories small once the cache holds thousands of files
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str = "") -> Path:
+        """Cached path for key, or None. A hit refreshes the file's mtime (its recency)."""
+        path = self.path_for(key, suffix)
+        if not path.exists():
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def put(self, key: str, src_path, suffix: str = "", move: bool = False) -> Path:
+        """Atomically publishes src_path under key (moved when possible if move=True)."""
+        dest = self.path_for(key, suffix)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            if move:
+                try:
+                    os.replace(src_path, tmp)
+                except OSError:
+                    # Different filesystem: fall back to a copy
+                    shutil.copyfile(src_path, tmp)
+            else:
+                shutil.copyfile(src_path, tmp)
+            os.replace(tmp, dest)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        self._account(dest)
+        return dest
+
+    def put_bytes(self, key: str, data: bytes, suffix: str = "") -> Path:
+        dest = self.path_for(key, suffix)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, dest)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        self._account(dest)
+        return dest
+
+    def _entries(self) -> list:
+        """[(mtime, size, path)] of every published artifact (temp files excluded)."""
+        entries = []
+        for path in self.cache_dir.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _account(self, path: Path):
+        if not self.max_bytes:
+            return
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._entries())
+        else:
+            self._total_bytes += path.stat().st_size
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Deletes least-recently-used files until the cache is back under its budget."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+                self.evictions += 1
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
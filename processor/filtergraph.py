@@ -0,0 +1,236 @@
+from pathlib import Path
+from processor.ffmpeg_tools import run_ffmpeg, run_ffmpeg_progress, thread_budget, deferred_voice_filter
+from processor.render_profiles import get_render_profile, video_rate_args
+
+# Loops background music indefinitely in the graph; amix=duration=first ends it with the narration
+BG_LOOP_FILTER = "aloop=loop=-1:size=2147483647"
+# V86: the music bed ducks under the narration (keyed by the voice, fast attack, slow release)
+DUCK_FILTER = "sidechaincompress=threshold=0.02:ratio=8:attack=15:release=400"
+MIX_FORMAT = "aformat=sample_rates=48000:channel_layouts=stereo"
+
+def narration_mix_chains(narration: str, music: str = None, bg_volume: float = 0.12, out: str = "[outa]", voice_filter: str = None) -> list:
+    """
+    Filter chains mixing narration (and optionally looped, ducked background music) into `out`.
+    Both are brought to 48 kHz stereo first so the sidechain and amix see one format.
+    voice_filter: applied to the narration first (deferred TTS normalization, see V91).
+    """
+    voice = f"{narration}{voice_filter}," if voice_filter else narration
+    if not music:
+        return [f"{voice}anull{out}"]
+    return [
+        f"{voice}{MIX_FORMAT},asplit=2[narr][duckkey]",
+        f"{music}{BG_LOOP_FILTER},{MIX_FORMAT},volume={bg_volume}[bed]",
+        f"[bed][duckkey]{DUCK_FILTER}[ducked]",
+        f"[narr][ducked]amix=inputs=2:duration=first:normalize=0{out}",
+    ]
+
+async def mux_narration(video_path, narration_path, target_path, duration: float, bg_music_path=None, bg_volume: float = 0.12, audio_bitrate: str = "192k"):
+    """
+    Silent video + narration (+ ducked music) -> final MP4; the video stream is copied.
+    A narration with deferred loudness stats is normalized here, in its only encode.
+    """
+    inputs = ["-i", video_path, "-i", narration_path] + (["-i", bg_music_path] if bg_music_path else [])
+    graph = ";".join(narration_mix_chains("[1:a]", "[2:a]" if bg_music_path else None, bg_volume, voice_filter=deferred_voice_filter(narration_path)))
+    await run_ffmpeg([
+        *inputs, "-filter_complex", graph, "-map", "0:v:0", "-map", "[outa]",
+        "-c:v", "copy", "-c:a", "aac", "-b:a", audio_bitrate,
+        "-t", f"{duration:.3f}", "-movflags", "+faststart", target_path
+    ])
+    return target_path
+
+# Center crops for short-form outputs (even dimensions, never upscaled past the 1080-wide target)
+SHORT_CROPS = {
+    "vertical": "crop=w='trunc(min(iw,ih*9/16)/2)*2':h='trunc(min(ih,iw*16/9)/2)*2',scale=w='min(1080,iw)':h=-2:flags=lanczos",
+    "square": "crop=w='trunc(min(iw,ih)/2)*2':h='trunc(min(iw,ih)/2)*2',scale=w='min(1080,iw)':h=-2:flags=lanczos",
+}
+
+class FilterGraphRenderer:
+    def __init__(self, width: int = 1280, height: int = 720, fps: int = 24, threads: int = 0):
+        """
+        🎛️ V76: Native FFmpeg Render Engine
+        Compiles an editing guide or forge storyboard into ONE ffmpeg `filter_complex`
+        (trim/concat/overlay/xfade/amix) and runs it as a single subprocess, so frames
+        never pass through Python.
+        threads: encoder thread cap (0 = ffmpeg decides, i.e. every core).
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.threads = threads
+
+    def _encode_args(self, preset: str = "veryfast", profile: dict = None, threads: int = None) -> list:
+        profile = get_render_profile(profile)
+        threads = self.threads if threads is None else threads
+        return [
+            "-c:v", "libx264", "-preset", profile["preset"] or preset, *video_rate_args(profile), "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-b:a", profile["audio_bitrate"], "-movflags", "+faststart",
+            *(["-threads", str(threads)] if threads else []),
+        ]
+
+    def letterbox_filter(self) -> str:
+        """Fits a still onto the dark canvas (used by the graph and per-scene parallel encodes)."""
+        w, h = self.width, self.height
+        return (
+            f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+            f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2:color=0x191919,setsar=1,fps={self.fps},format=yuv420p"
+        )
+
+    def build_condensed_graph(self, source_path: str, ranges: list, has_audio: bool = True, profile: dict = None) -> tuple:
+        """
+        Cut ranges -> (input_args, filter_complex, map_args).
+        Every range is its own fast-seeked input, so only the kept spans are decoded.
+        """
+        profile = get_render_profile(profile)
+        resample = (f",scale=-2:{profile['height']}" if profile["height"] else "") + (f",fps={profile['fps']}" if profile["fps"] else "")
+        inputs, chains, concat_pads = [], [], []
+        for i, (start, end) in enumerate(ranges):
+            inputs += ["-ss", f"{start:.3f}", "-t", f"{end - start:.3f}", "-i", str(source_path)]
+            chains.append(f"[{i}:v]settb=AVTB,setpts=PTS-STARTPTS,setsar=1{resample}[v{i}]")
+            concat_pads.append(f"[v{i}]")
+            if has_audio:
+                chains.append(f"[{i}:a]aresample=async=1,asetpts=PTS-STARTPTS[a{i}]")
+                concat_pads.append(f"[a{i}]")
+        audio_flag = 1 if has_audio else 0
+        outputs = "[outv][outa]" if has_audio else "[outv]"
+        chains.append(f"{''.join(concat_pads)}concat=n={len(ranges)}:v=1:a={audio_flag}{outputs}")
+        maps = ["-map", "[outv]"] + (["-map", "[outa]"] if has_audio else [])
+        return inputs, ";".join(chains), maps
+
+    def build_multi_output_graph(self, source_path: str, ranges: list, heights: tuple = (1080, 720, 480), windows: list = (), short_formats: tuple = ("vertical",), has_audio: bool = True, profile: dict = None) -> tuple:
+        """
+        🎬 V85: Decode-once multi-output graph -> (input_args, filter_complex, [(label, map_args)]).
+        Every master cut range is decoded once, concatenated, then `split` into one scaler per
+        height. Every highlight window is decoded once and `split` into one center crop per
+        short format (vertical 9:16, square 1:1). Windows get their own inputs even where they
+        overlap a master cut: sharing a decode would buffer raw frames until the master's
+        concat reached them.
+        """
+        profile = get_render_profile(profile)
+        rate = f",fps={profile['fps']}" if profile["fps"] else ""
+        inputs, chains, outputs = [], [], []
+        spans = []
+
+        def seek_input(start, end):
+            """Fast-seeked input covering [start, end); returns its input index."""
+            inputs.extend(["-ss", f"{start:.3f}", "-t", f"{end - start:.3f}", "-i", str(source_path)])
+            spans.append((start, end))
+            return len(spans) - 1
+
+        def fan_out(video, audio, count, prefix):
+            """split/asplit a stream pair into `count` labelled copies."""
+            chains.append(f"{video}split={count}{''.join(f'[{prefix}v{k}]' for k in range(count))}")
+            if has_audio:
+                chains.append(f"{audio}asplit={count}{''.join(f'[{prefix}a{k}]' for k in range(count))}")
+
+        def add_output(label, video, audio):
+            maps = ["-map", video] + (["-map", audio] if has_audio else [])
+            outputs.append((label, maps))
+
+        if ranges and heights:
+            concat_pads = []
+            for start, end in ranges:
+                i = seek_input(start, end)
+                chains.append(f"[{i}:v]settb=AVTB,setpts=PTS-STARTPTS,setsar=1{rate}[c{i}v]")
+                concat_pads.append(f"[c{i}v]")
+                if has_audio:
+                    chains.append(f"[{i}:a]aresample=async=1,asetpts=PTS-STARTPTS[c{i}a]")
+                    concat_pads.append(f"[c{i}a]")
+            master_pads = "[mv][ma]" if has_audio else "[mv]"
+            chains.append(f"{''.join(concat_pads)}concat=n={len(ranges)}:v=1:a={1 if has_audio else 0}{master_pads}")
+            fan_out("[mv]", "[ma]", len(heights), "m")
+            for k, height in enumerate(heights):
+                chains.append(f"[mv{k}]scale=-2:{height}:flags=lanczos,setsar=1[master{k}]")
+                add_output(f"{height}p", f"[master{k}]", f"[ma{k}]")
+
+        for w, (start, end) in enumerate(windows):
+            i = seek_input(start, end)
+            chains.append(f"[{i}:v]settb=AVTB,setpts=PTS-STARTPTS,setsar=1{rate}[w{w}]")
+            if has_audio:
+                chains.append(f"[{i}:a]aresample=async=1,asetpts=PTS-STARTPTS[w{w}a]")
+            fan_out(f"[w{w}]", f"[w{w}a]", len(short_formats), f"s{w}")
+            for k, fmt in enumerate(short_formats):
+                chains.append(f"[s{w}v{k}]{SHORT_CROPS[fmt]},setsar=1[short{w}_{k}]")
+                add_output(f"short{w + 1}_{fmt}", f"[short{w}_{k}]", f"[s{w}a{k}]")
+
+        return inputs, ";".join(chains), outputs
+
+    def build_forge_graph(self, scenes: list, narration_path: str, narration_duration: float, bg_music_path: str = None, crossfade: float = 0.5, bg_volume: float = 0.12) -> tuple:
+        """
+        Forge storyboard -> (input_args, filter_complex, map_args).
+        scenes: [{"image": path | None, "duration": seconds}]. Scenes are letterboxed onto the
+        dark canvas, chained with xfade, padded/trimmed to the narration and mixed with music.
+        """
+        w, h, fps = self.width, self.height, self.fps
+        inputs, chains = [], []
+        xf = (crossfade or 0.0) if len(scenes) > 1 else 0.0
+
+        for i, scene in enumerate(scenes):
+            # Every scene except the last is extended by the crossfade it hands over to the next one
+            dur = scene["duration"] + (xf if i < len(scenes) - 1 else 0.0)
+            if scene.get("image"):
+                inputs += ["-loop", "1", "-framerate", str(fps), "-t", f"{dur:.3f}", "-i", str(scene["image"])]
+                chains.append(f"[{i}:v]{self.letterbox_filter()}[s{i}]")
+            else:
+                inputs += ["-f", "lavfi", "-t", f"{dur:.3f}", "-i", f"color=c=0x1e1e1e:s={w}x{h}:r={fps}"]
+                chains.append(f"[{i}:v]setsar=1,format=yuv420p[s{i}]")
+
+        # xfade chain: offset k is where scene k starts on the final timeline
+        last = "[s0]"
+        if xf > 0:
+            offset = 0.0
+            for i in range(1, len(scenes)):
+                offset += scenes[i - 1]["duration"]
+                out = f"[x{i}]"
+                chains.append(f"{last}[s{i}]xfade=transition=fade:duration={xf:.3f}:offset={offset:.3f}{out}")
+                last = out
+        elif len(scenes) > 1:
+            # Hard cuts (e.g. the draft profile): a plain concat is cheaper than zero-length fades
+            chains.append(f"{''.join(f'[s{i}]' for i in range(len(scenes)))}concat=n={len(scenes)}:v=1:a=0[cut]")
+            last = "[cut]"
+
+        # Hold the last frame past the narration; the output `-t` trims the surplus exactly
+        video_total = sum(s["duration"] for s in scenes)
+        pad = max(0.0, narration_duration - video_total) + 1.0
+        chains.append(f"{last}tpad=stop_mode=clone:stop_duration={pad:.3f}[outv]")
+
+        narr_idx = len(scenes)
+        inputs += ["-i", str(narration_path)]
+        if bg_music_path:
+            # aloop (not -stream_loop) so the demuxer hits EOF and ffmpeg exits once the mix is done
+            inputs += ["-i", str(bg_music_path)]
+        chains += narration_mix_chains(f"[{narr_idx}:a]", f"[{narr_idx + 1}:a]" if bg_music_path else None, bg_volume, voice_filter=deferred_voice_filter(narration_path))
+
+        maps = ["-map", "[outv]", "-map", "[outa]", "-t", f"{narration_duration:.3f}"]
+        return inputs, ";".join(chains), maps
+
+    async def render_condensed(self, source_path: str, ranges: list, target_path: Path, has_audio: bool = True, on_progress=None, preset: str = "veryfast", profile: dict = None) -> str:
+        inputs, graph, maps = self.build_condensed_graph(source_path, ranges, has_audio=has_audio, profile=profile)
+        total = sum(end - start for start, end in ranges)
+        await run_ffmpeg_progress(
+            [*inputs, "-filter_complex", graph, *maps, *self._encode_args(preset, profile), str(target_path)],
+            total_seconds=total, on_progress=on_progress
+        )
+        return str(target_path)
+
+    async def render_multi_output(self, source_path: str, ranges: list, target_paths: dict, heights: tuple = (1080, 720, 480), windows: list = (), short_formats: tuple = ("vertical",), has_audio: bool = True, on_progress=None, preset: str = "veryfast", profile: dict = None) -> dict:
+        """
+        Renders every output of build_multi_output_graph in ONE ffmpeg pass.
+        target_paths: label -> output path (labels as returned by the graph builder).
+        """
+        inputs, graph, outputs = self.build_multi_output_graph(source_path, ranges, heights, windows, short_formats, has_audio, profile)
+        # The encoders share this renderer's thread budget
+        threads = thread_budget(len(outputs), self.threads) if self.threads else 0
+        output_args = []
+        for label, maps in outputs:
+            output_args += [*maps, *self._encode_args(preset, profile, threads), str(target_paths[label])]
+        total = max([sum(e - s for s, e in ranges)] + [e - s for s, e in windows])
+        await run_ffmpeg_progress([*inputs, "-filter_complex", graph, *output_args], total_seconds=total, on_progress=on_progress)
+        return {label: str(target_paths[label]) for label, _ in outputs}
+
+    async def render_forge(self, scenes: list, narration_path: str, narration_duration: float, target_path: Path, bg_music_path: str = None, crossfade: float = 0.5, on_progress=None, preset: str = "ultrafast", profile: dict = None) -> str:
+        inputs, graph, maps = self.build_forge_graph(scenes, narration_path, narration_duration, bg_music_path=bg_music_path, crossfade=crossfade)
+        await run_ffmpeg_progress(
+            [*inputs, "-filter_complex", graph, *maps, "-r", str(self.fps), *self._encode_args(preset, profile), str(target_path)],
+            total_seconds=narration_duration, on_progress=on_progress
+        )
+        return str(target_path)
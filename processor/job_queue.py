@@ -0,0 +1,195 @@
+import asyncio
+import datetime
+import os
+import uuid
+
+class QueueFullError(Exception):
+    """Raised when the pipeline queue is at its backpressure limit."""
+
+class JobQueue:
+    def __init__(self, collection, runner, slots: int = None, max_queued: int = None, on_position=None, on_failed=None, lease_seconds: float = 120.0, max_attempts: int = 3):
+        """
+        🚥 V93: Persistent Pipeline Queue
+        Pipeline jobs live in a Mongo collection, so queued (and interrupted) work survives a
+        restart. `slots` workers (PIPELINE_SLOTS, default 1) claim the highest-priority,
+        oldest job atomically and run `runner(project_id, request)`; everything else waits.
+        Backpressure: enqueue() raises QueueFullError beyond max_queued (PIPELINE_MAX_QUEUED).
+        on_position(project_id, position): sync or async, called whenever queue order changes.
+        Running jobs renew a lease; a job whose lease expired (its process died) is requeued,
+        up to max_attempts; then it is given up and on_failed(project_id, error) is called.
+        """
+        self.jobs = collection
+        self.runner = runner
+        self.slots = max(1, slots or int(os.environ.get("PIPELINE_SLOTS", 1)))
+        self.max_queued = max_queued or int(os.environ.get("PIPELINE_MAX_QUEUED", 20))
+        self.on_position = on_position
+        self.on_failed = on_failed
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.owner = uuid.uuid4().hex[:12]
+        self._wake = asyncio.Event()
+        self._workers = []
+
+    async def start(self):
+        await self.jobs.create_index([("status", 1), ("priority", -1), ("created_at", 1)])
+        await self.jobs.create_index("project_id")
+        await self._recover()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.slots)]
+        print(f"🚥 Pipeline queue: {self.slots} slot(s), at most {self.max_queued} queued")
+        await self._publish_positions()
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def enqueue(self, project_id: str, request: dict, priority: int = 0) -> int:
+        """Queues a pipeline run; returns its queue position (1 = next to start)."""
+        if await self.jobs.count_documents({"status": "queued"}) >= self.max_queued:
+            raise QueueFullError(f"The processing queue is full ({self.max_queued} waiting); try again shortly")
+        now = datetime.datetime.utcnow()
+        await self.jobs.insert_one({
+            "project_id": project_id,
+            "request": request,
+            "priority": int(priority),
+            "status": "queued",
+            "attempts": 0,
+            "created_at": now,
+        })
+        self._wake.set()
+        await self._publish_positions()
+        return await self.position(project_id)
+
+    async def position(self, project_id: str):
+        """1-based position of the project's queued job (None when it is not waiting)."""
+        job = await self.jobs.find_one({"project_id": project_id, "status": "queued"})
+        if not job:
+            return None
+        ahead = await self.jobs.count_documents({
+            "status": "queued",
+            "$or": [
+                {"priority": {"$gt": job["priority"]}},
+                {"priority": job["priority"], "created_at": {"$lt": job["created_at"]}},
+            ],
+        })
+        return ahead + 1
+
+    async def stats(self) -> dict:
+        return {
+            "slots": self.slots,
+            "queued": await self.jobs.count_documents({"status": "queued"}),
+            "running": await self.jobs.count_documents({"status": "running"}),
+        }
+
+    async def _recover(self):
+        """Requeues jobs whose worker stopped renewing its lease (crash or restart)."""
+        stale = {"status": "running", "lease_until": {"$lt": datetime.datetime.utcnow()}}
+        error = "worker lost too many times"
+        given_up = 0
+        async for job in self.jobs.find({**stale, "attempts": {"$gte": self.max_attempts}}, {"project_id": 1}):
+            # Conditional per job: another process recovering at the same time gives it up only once
+            job = await self.jobs.find_one_and_update(
+                {"_id": job["_id"], **stale},
+                {"$set": {"status": "error", "error": error, "finished_at": datetime.datetime.utcnow()}}
+            )
+            if job:
+                given_up += 1
+                await self._notify_failed(job["project_id"], error)
+        requeued = await self.jobs.update_many(stale, {"$set": {"status": "queued"}, "$unset": {"owner": ""}})
+        if requeued.modified_count or given_up:
+            print(f"♻️ Recovered {requeued.modified_count} interrupted pipeline job(s) ({given_up} given up)")
+            self._wake.set()
+
+    async def _notify_failed(self, project_id: str, error: str):
+        """Lets the owner of a given-up job mark its project as failed."""
+        if not self.on_failed:
+            return
+        try:
+            result = self.on_failed(project_id, error)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            print(f"⚠️ Failed-job update for {project_id} failed: {e}")
+
+    async def _claim(self):
+        from pymongo import ReturnDocument
+        now = datetime.datetime.utcnow()
+        return await self.jobs.find_one_and_update(
+            {"status": "queued"},
+            {
+                "$set": {
+                    "status": "running",
+                    "owner": self.owner,
+                    "started_at": now,
+                    "heartbeat": now,
+                    "lease_until": now + datetime.timedelta(seconds=self.lease_seconds),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("priority", -1), ("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _renew(self, job_id):
+        """Keeps the lease of a running job alive until it finishes."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            now = datetime.datetime.utcnow()
+            await self.jobs.update_one(
+                {"_id": job_id, "owner": self.owner},
+                {"$set": {"heartbeat": now, "lease_until": now + datetime.timedelta(seconds=self.lease_seconds)}}
+            )
+
+    async def _worker(self, slot: int):
+        while True:
+            try:
+                job = await self._claim()
+                if job is None:
+                    self._wake.clear()
+                    try:
+                        # Poll as well: another process may have queued or released work
+                        await asyncio.wait_for(self._wake.wait(), timeout=self.lease_seconds / 3)
+                    except asyncio.TimeoutError:
+                        await self._recover()
+                    continue
+
+                await self._publish_positions()
+                print(f"🚀 Slot {slot} running project {job['project_id']} (attempt {job['attempts']})")
+                renew = asyncio.create_task(self._renew(job["_id"]))
+                status, error = "done", None
+                try:
+                    await self.runner(job["project_id"], job["request"])
+                except asyncio.CancelledError:
+                    # Shutdown: leave the job "running"; its lease expires and it is requeued
+                    raise
+                except Exception as e:
+                    status, error = "error", str(e)
+                    print(f"❌ Pipeline job {job['project_id']} failed: {e}")
+                finally:
+                    renew.cancel()
+                await self.jobs.update_one(
+                    {"_id": job["_id"]},
+                    {"$set": {"status": status, "error": error, "finished_at": datetime.datetime.utcnow()}, "$unset": {"lease_until": ""}}
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Database hiccup: back off instead of spinning
+                print(f"⚠️ Pipeline queue error: {e}")
+                await asyncio.sleep(5)
+
+    async def _publish_positions(self):
+        """Tells every waiting project its current place in line."""
+        if not self.on_position:
+            return
+        cursor = self.jobs.find({"status": "queued"}, {"project_id": 1}).sort([("priority", -1), ("created_at", 1)])
+        position = 0
+        async for job in cursor:
+            position += 1
+            try:
+                result = self.on_position(job["project_id"], position)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                print(f"⚠️ Queue position update failed: {e}")
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import re
+import uuid
+from pathlib import Path
+from processor.ffmpeg_tools import run_ffmpeg, measure_loudness, loudnorm_filter
+from processor.file_cache import FileCache, stable_digest, stable_seed, file_digest
+
+MUSIC_EXTENSIONS = {".mp3", ".wav", ".flac", ".m4a", ".aac", ".ogg", ".opus"}
+# Beds are stored at narration loudness; the mix sets their level relative to the voice
+MUSIC_TARGET_LUFS = -16.0
+MUSIC_SAMPLE_RATE = 48000
+
+def genre_tokens(text: str) -> set:
+    """'Corporate Upbeat / Modern Clean' -> {'corporate', 'upbeat', 'modern', 'clean'}"""
+    return {t for t in re.split(r"[^a-z0-9]+", (text or "").lower()) if t}
+
+class MusicLibrary:
+    # Shared by every library instance: two renders asking for the same new track prepare it once
+    _prepare_locks = {}
+
+    def __init__(self, library_dir: Path, cache: FileCache, legacy_dir: Path = None):
+        """
+        🎵 V86: Background Music Library
+        Tracks live in assets/music/<genre>/ (files directly in assets/music are "general").
+        Every track is loudness-normalized (two-pass loudnorm) and resampled to 48 kHz stereo
+        FLAC ONCE; the prepared copy is cached by content digest. Genres are matched against
+        the requested bg_music_genre by shared words, so "explainer" or
+        "Corporate Upbeat / Modern Clean" both find a corporate/explainer folder.
+        legacy_dir: only its bg_<genre>_*.ext files are used (never TTS output living beside them).
+        """
+        self.library_dir = Path(library_dir)
+        self.library_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = cache
+        self.legacy_dir = Path(legacy_dir) if legacy_dir else None
+        self._index_path = self.cache.cache_dir / "music_index.json"
+        self._digests = None
+
+    def _load_digests(self) -> dict:
+        if self._digests is None:
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    self._digests = json.load(f)
+            except (OSError, ValueError):
+                self._digests = {}
+        return self._digests
+
+    def _save_digests(self):
+        tmp = self._index_path.with_name(f".{self._index_path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._digests, f)
+        os.replace(tmp, self._index_path)
+
+    def _scan(self) -> list:
+        """[(genre, path)] for every track in the library (and bg_* files in the legacy dir)."""
+        tracks = []
+        for path in sorted(self.library_dir.rglob("*")):
+            if path.suffix.lower() in MUSIC_EXTENSIONS and path.is_file():
+                rel = path.relative_to(self.library_dir)
+                tracks.append((rel.parts[0].lower() if len(rel.parts) > 1 else "general", path))
+        if self.legacy_dir and self.legacy_dir.exists():
+            for path in sorted(self.legacy_dir.glob("bg_*")):
+                if path.suffix.lower() in MUSIC_EXTENSIONS:
+                    # bg_<genre>_<name>.mp3 (a plain bg_<name>.mp3 is "general")
+                    parts = path.stem.split("_")
+                    tracks.append((parts[1].lower() if len(parts) > 2 else "general", path))
+        return tracks
+
+    async def index(self) -> dict:
+        """{genre: [{"path", "digest"}]}; content digests are memoized per (path, size, mtime)."""
+        digests = self._load_digests()
+        loop = asyncio.get_event_loop()
+        genres, changed = {}, False
+        for genre, path in self._scan():
+            stat = path.stat()
+            fingerprint = f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+            if fingerprint not in digests:
+                digests[fingerprint] = await loop.run_in_executor(None, file_digest, str(path))
+                changed = True
+            genres.setdefault(genre, []).append({"path": str(path), "digest": digests[fingerprint]})
+        if changed:
+            self._save_digests()
+        return genres
+
+    def match_genre(self, genres: dict, requested: str = None) -> str:
+        """Best genre for the request (most shared words), else "general", else any."""
+        if not genres:
+            return None
+        wanted = genre_tokens(requested)
+        if wanted:
+            scored = sorted(((len(wanted & genre_tokens(g)), g) for g in genres), key=lambda x: (-x[0], x[1]))
+            if scored[0][0] > 0:
+                return scored[0][1]
+        return "general" if "general" in genres else sorted(genres)[0]
+
+    async def track_for(self, requested_genre: str = None, seed: str = "") -> Path:
+        """Prepared (normalized, resampled) track for the genre, or None if the library is empty."""
+        genres = await self.index()
+        genre = self.match_genre(genres, requested_genre)
+        if genre is None:
+            print("🎵 Music library is empty; rendering without background music")
+            return None
+        tracks = genres[genre]
+        # Deterministic pick, so re-rendering the same video keeps its music (and its caches)
+        track = tracks[stable_seed(genre, seed, modulo=len(tracks))]
+        print(f"🎵 Background music: {Path(track['path']).name} (genre '{genre}' for '{requested_genre}')")
+        return await self.prepare(track["path"], track["digest"])
+
+    async def prepare(self, path: str, digest: str) -> Path:
+        key = stable_digest("music", digest, MUSIC_TARGET_LUFS, MUSIC_SAMPLE_RATE)
+        cached = self.cache.get(key, ".flac")
+        if cached:
+            return cached
+        lock = self._prepare_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self.cache.get(key, ".flac")
+            if cached:
+                return cached
+            tmp = self.cache.cache_dir / f".prepare_{uuid.uuid4().hex}.flac"
+            try:
+                measured = await measure_loudness(path, MUSIC_TARGET_LUFS)
+                await run_ffmpeg([
+                    "-i", path, "-map", "0:a:0", "-vn",
+                    "-af", f"{loudnorm_filter(measured, MUSIC_TARGET_LUFS)},aresample={MUSIC_SAMPLE_RATE}",
+                    "-ar", MUSIC_SAMPLE_RATE, "-ac", 2, "-c:a", "flac", tmp
+                ])
+                prepared = self.cache.put(key, tmp, ".flac", move=True)
+            finally:
+                if tmp.exists():
+                    tmp.unlink()
+            print(f"🎵 Prepared {Path(path).name} ({measured.get('input_i')} -> {MUSIC_TARGET_LUFS} LUFS)")
+            return prepared
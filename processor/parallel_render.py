@@ -0,0 +1,177 @@
+import asyncio
+import os
+from contextlib import nullcontext
+from pathlib import Path
+from processor.ffmpeg_tools import run_ffmpeg, concat_files, thread_budget, parse_rate
+from processor.filtergraph import FilterGraphRenderer, mux_narration
+from processor.still_scene import StillSceneEncoder
+from processor.render_profiles import get_render_profile, video_rate_args
+
+class ParallelRenderer:
+    def __init__(self, workers: int = None, width: int = 1280, height: int = 720, fps: int = 24, threads: int = None):
+        """
+        🧵 V77: Parallel Segment Renderer
+        Encodes every guide range / forge scene to its own intermediate file with uniform
+        codec parameters, `workers` ffmpeg processes at a time (defaults to the core count),
+        then joins the pieces losslessly with the concat demuxer.
+        V84: threads is the render's total CPU budget (its scheduler slot); the workers
+        split it between them.
+        """
+        self.threads = threads or os.cpu_count() or 1
+        self.workers = max(1, workers or int(os.environ.get("RENDER_WORKERS", 0)) or self.threads)
+        self.graph = FilterGraphRenderer(width=width, height=height, fps=fps)
+        self.stills = StillSceneEncoder(width=width, height=height, fps=fps)
+
+    async def _run_pool(self, jobs: list, on_progress=None) -> list:
+        """
+        Runs [(job, piece_path)] with bounded concurrency; returns the pieces in job order.
+        A job is either ffmpeg arguments or an async callable that produces the piece.
+        on_progress(done, total, piece) runs after every finished piece.
+        """
+        semaphore = asyncio.Semaphore(self.workers)
+        completed = 0
+
+        async def _encode(job, piece):
+            nonlocal completed
+            async with semaphore:
+                if callable(job):
+                    await job()
+                else:
+                    await run_ffmpeg(job)
+            completed += 1
+            if on_progress:
+                result = on_progress(completed, len(jobs), piece)
+                if asyncio.iscoroutine(result):
+                    await result
+            return piece
+
+        tasks = [asyncio.create_task(_encode(args, piece)) for args, piece in jobs]
+        try:
+            return await asyncio.gather(*tasks)
+        except Exception:
+            # One failed piece fails the render: stop the encoders that are still running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def render_condensed(self, source_path: str, ranges: list, target_path: Path, workdir: Path, media_info: dict, on_progress=None, preset: str = "veryfast", cache=None, source_digest: str = None, profile: dict = None, stats=None) -> str:
+        """
+        Cut ranges -> one uniformly encoded MP4 piece per range -> concat -c copy.
+        With a RenderCache, clips already encoded for the same (source, in/out, profile) are reused.
+        """
+        profile = get_render_profile(profile)
+        video_info, audio_info = media_info["video"], media_info["audio"]
+        fps = profile["fps"] or parse_rate(video_info.get("avg_frame_rate") or video_info.get("r_frame_rate"))
+        threads = thread_budget(min(self.workers, len(ranges)), self.threads)
+
+        # Identical codec parameters on every piece are what make the stream-copy join valid
+        encode_args = [
+            "-c:v", "libx264", "-preset", profile["preset"] or preset, *video_rate_args(profile), "-pix_fmt", "yuv420p",
+            "-r", f"{fps:.6f}",
+        ]
+        if profile["height"]:
+            encode_args += ["-vf", f"scale=-2:{profile['height']}"]
+        if audio_info:
+            encode_args += [
+                "-c:a", "aac", "-b:a", profile["audio_bitrate"],
+                "-ar", str(audio_info.get("sample_rate", 48000)), "-ac", str(audio_info.get("channels", 2)),
+            ]
+
+        pieces, jobs, pending = [None] * len(ranges), [], []
+        for i, (start, end) in enumerate(ranges):
+            key = cache.clip_key(source_digest, start, end, profile=encode_args) if cache else None
+            cached = cache.get(key, ".mp4") if cache else None
+            if cached:
+                pieces[i] = cached
+                continue
+            piece = Path(workdir) / f"clip_{i:04d}.mp4"
+            jobs.append(([
+                "-ss", f"{start:.6f}", "-i", source_path, "-t", f"{end - start:.6f}",
+                "-map", "0:v:0", "-map", "0:a:0?", *encode_args, "-threads", threads,
+                "-avoid_negative_ts", "make_zero", piece
+            ], piece))
+            pending.append((i, key, piece))
+
+        if cache:
+            print(f"♻️ Clip cache: {len(ranges) - len(jobs)}/{len(ranges)} clips reused")
+
+        frames_of = {piece: int(round((ranges[i][1] - ranges[i][0]) * fps)) for i, _, piece in pending}
+        if stats:
+            stats.update(total_frames=int(round(sum(e - s for s, e in ranges) * fps)))
+            stats.update(frame=stats.total_frames - sum(frames_of.values()))  # reused clips count as done
+        async def on_piece(done, total, piece):
+            if stats:
+                stats.advance(frames_of.get(piece, 0))
+            if on_progress:
+                await on_progress(done, total, piece)
+
+        with stats.phase("encode") if stats else nullcontext():
+            await self._run_pool(jobs, on_piece)
+        for i, key, piece in pending:
+            pieces[i] = cache.put(key, piece, ".mp4", move=True) if cache else piece
+
+        with stats.phase("mux") if stats else nullcontext():
+            return await concat_files(pieces, str(target_path), workdir)
+
+    async def render_forge(self, scenes: list, narration_path: str, narration_duration: float, target_path: Path, workdir: Path, bg_music_path: str = None, crossfade: float = 0.5, bg_volume: float = 0.12, on_progress=None, preset: str = "ultrafast", ken_burns: bool = False, profile: dict = None, stats=None) -> str:
+        """
+        Forge storyboard -> one silent MP4 per scene -> concat -c copy -> narration/music mux.
+        Scene transitions are fade-ins (the MoviePy path's crossfadein), so scenes stay independent.
+        V81: every scene is precomposited once and encoded on the still-image path (or streamed
+        with Ken Burns motion); all scenes share one encoder configuration so the concat is valid.
+        """
+        profile = get_render_profile(profile)
+        preset = profile["preset"] or preset
+        rate_args = video_rate_args(profile)
+        fps = self.graph.fps
+        threads = thread_budget(min(self.workers, len(scenes)), self.threads)
+
+        # Hold the last scene for any narration the storyboard does not cover; the mux trims the rest
+        durations = [s["duration"] for s in scenes]
+        durations[-1] += max(0.0, narration_duration - sum(durations)) + 1.0 / fps
+
+        loop = asyncio.get_event_loop()
+        if stats:
+            stats.update(total_frames=int(round(narration_duration * fps)))
+        frames_of = {}
+        jobs = []
+        for i, (scene, dur) in enumerate(zip(scenes, durations)):
+            piece = Path(workdir) / f"scene_{i:04d}.mp4"
+            frame = Path(workdir) / f"scene_{i:04d}.png"
+            if scene.get("image"):
+                await loop.run_in_executor(None, self.stills.precomposite, scene["image"], frame)
+            else:
+                await loop.run_in_executor(None, self._solid_frame, frame)
+            fade_in = crossfade if i > 0 else 0.0
+            if ken_burns:
+                # Alternate the drift direction so consecutive scenes don't move identically
+                pan = (0.35, 0.4) if i % 2 == 0 else (0.65, 0.6)
+                job = lambda frame=frame, dur=dur, piece=piece, fade_in=fade_in, pan=pan: self.stills.encode_ken_burns(
+                    frame, dur, piece, preset=preset, threads=threads, fade_in=fade_in, pan=pan, rate_args=rate_args
+                )
+            else:
+                job = [*self.stills.encode_args(frame, dur, preset=preset, threads=threads, fade_in=fade_in, rate_args=rate_args), piece]
+            jobs.append((job, piece))
+            frames_of[piece] = int(round(min(dur, max(0.0, narration_duration - sum(durations[:i]))) * fps))
+
+        async def on_piece(done, total, piece):
+            if stats:
+                stats.advance(frames_of.get(piece, 0))
+            if on_progress:
+                await on_progress(done, total, piece)
+
+        with stats.phase("encode") if stats else nullcontext():
+            pieces = await self._run_pool(jobs, on_piece)
+
+        with stats.phase("mux") if stats else nullcontext():
+            video_track = Path(workdir) / "video_track.mp4"
+            await concat_files(pieces, str(video_track), workdir)
+
+            await mux_narration(video_track, narration_path, target_path, narration_duration, bg_music_path, bg_volume, profile["audio_bitrate"])
+        return str(target_path)
+
+    def _solid_frame(self, out_path: Path):
+        """Placeholder frame for scenes whose image failed (the MoviePy path's dark ColorClip)."""
+        from PIL import Image
+        Image.new("RGB", (self.graph.width, self.graph.height), (30, 30, 30)).save(out_path)
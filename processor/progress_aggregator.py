@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+class ProgressAggregator:
+    def __init__(self, collection, send, flush_interval: float = 2.0, push_interval: float = 0.25, max_closed: int = 1024):
+        """
+        📮 V95: Coalesced Progress Persistence
+        status_callback updates land here instead of going straight to Mongo and the sockets.
+        Only the latest state per project (and per language) is kept: sockets get it at most
+        every push_interval (the last update is always delivered), Mongo gets one batched
+        bulk_write for every dirty project each flush_interval, or at once on a status change.
+        send(project_id, payload): async socket broadcast.
+        Final states (completed / error) are written by the caller after close(project_id),
+        which drops anything still pending so a late progress write can never overwrite them.
+        Only the last max_closed closed ids are remembered (a straggler is long gone by then).
+        """
+        self.projects = collection
+        self.send = send
+        self.flush_interval = flush_interval
+        self.push_interval = push_interval
+        self._pending = {}      # project_id -> {field: value} not yet in Mongo
+        self._payloads = {}     # project_id -> {language or None: payload} not yet pushed
+        self._status = {}       # project_id -> last status written to Mongo
+        self._last_push = {}
+        self._push_tasks = {}
+        self._counts = {}       # project_id -> [updates, writes]
+        self._closed = {}       # project_id -> None, oldest first (an insertion-ordered set)
+        self.max_closed = max_closed
+        self._flush_lock = asyncio.Lock()
+        self._flusher = None
+
+    def start(self):
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._flusher:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+
+    def open(self, project_id: str):
+        """Starts accepting updates for a (re)started pipeline run."""
+        self._closed.pop(project_id, None)
+        self._counts[project_id] = [0, 0]
+
+    async def update(self, project_id: str, message: str, progress: int, language: str = None, status: str = "processing", **extra):
+        if project_id in self._closed:
+            return
+        counts = self._counts.setdefault(project_id, [0, 0])
+        counts[0] += 1
+        # Per-language progress lives under language_progress.<lang>
+        fields = self._pending.setdefault(project_id, {})
+        if language:
+            fields[f"language_progress.{language}.progress"] = progress
+            if message:
+                fields[f"language_progress.{language}.message"] = message
+        else:
+            fields["status"] = status
+            fields["progress"] = progress
+            if message:
+                fields["message"] = message
+
+        payload = {"status": status, "message": message, "progress": progress, "project_id": project_id}
+        if language:
+            # Its own event: the overall progress bar only follows "processing" messages
+            payload["status"] = "language_progress"
+            payload["language"] = language
+        # V83: live frame progress of the render (frame, total_frames, fps, eta, phase)
+        if extra.get("render"):
+            payload["render"] = extra["render"]
+        self._payloads.setdefault(project_id, {})[language] = payload
+
+        if not language and self._status.get(project_id) != status:
+            await self.flush()
+        self._schedule_push(project_id)
+
+    def _schedule_push(self, project_id: str):
+        if project_id in self._push_tasks:
+            return  # a push is already due; it will carry this update
+        wait = self._last_push.get(project_id, 0.0) + self.push_interval - time.monotonic()
+        self._push_tasks[project_id] = asyncio.create_task(self._push(project_id, max(0.0, wait)))
+
+    async def _push(self, project_id: str, delay: float):
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+        finally:
+            self._push_tasks.pop(project_id, None)
+        self._last_push[project_id] = time.monotonic()
+        # Global progress first, then each language
+        payloads = self._payloads.pop(project_id, {})
+        for language in sorted(payloads, key=lambda lang: lang is not None):
+            try:
+                await self.send(project_id, payloads[language])
+            except Exception as e:
+                print(f"⚠️ Progress push failed for {project_id}: {e}")
+
+    async def flush(self):
+        """Writes every project's pending fields in one bulk_write."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            from bson import ObjectId
+            from pymongo import UpdateOne
+            batch, self._pending = self._pending, {}
+            try:
+                await self.projects.bulk_write(
+                    [UpdateOne({"_id": ObjectId(pid)}, {"$set": fields}) for pid, fields in batch.items()],
+                    ordered=False
+                )
+            except Exception as e:
+                print(f"⚠️ Progress flush failed ({len(batch)} projects), retrying next interval: {e}")
+                for pid, fields in batch.items():
+                    if pid not in self._closed:
+                        # Newer values that arrived meanwhile win
+                        self._pending[pid] = {**fields, **self._pending.get(pid, {})}
+                return
+            for pid, fields in batch.items():
+                if "status" in fields:
+                    self._status[pid] = fields["status"]
+                self._counts.setdefault(pid, [0, 0])[1] += 1
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"⚠️ Progress flush error: {e}")
+
+    async def close(self, project_id: str):
+        """
+        Drops the project's pending progress before the caller writes its final state.
+        Waits for an in-flight flush, so that flush cannot land after the final write.
+        """
+        self._closed.pop(project_id, None)
+        self._closed[project_id] = None
+        while len(self._closed) > self.max_closed:
+            del self._closed[next(iter(self._closed))]
+        task = self._push_tasks.pop(project_id, None)
+        if task:
+            task.cancel()
+        async with self._flush_lock:
+            self._pending.pop(project_id, None)
+        self._payloads.pop(project_id, None)
+        self._status.pop(project_id, None)
+        self._last_push.pop(project_id, None)
+        updates, writes = self._counts.pop(project_id, [0, 0])
+        print(f"📮 Progress for {project_id}: {updates} updates -> {writes} progress writes")
@@ -0,0 +1,58 @@
+import asyncio
+import json
+import os
+import uuid
+from pathlib import Path
+from processor.file_cache import FileCache, stable_digest, file_digest
+
+class RenderCache(FileCache):
+    def __init__(self, cache_dir: Path, max_bytes: int = None):
+        """
+        ♻️ V78: Incremental Render Cache
+        Clip intermediates are keyed by (source hash, in/out points, filters, encode profile),
+        whole renders by (source hash, cut list, render mode, profile). Editing one cut re-encodes
+        only that clip; re-rendering an unchanged guide is a cache lookup.
+        max_bytes: disk budget (least-recently-used renders and clips are evicted first).
+        """
+        super().__init__(cache_dir, max_bytes=max_bytes)
+        self._index_path = self.cache_dir / "source_index.json"
+        self._digests = None
+
+    def _load_index(self) -> dict:
+        if self._digests is None:
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    self._digests = json.load(f)
+            except (OSError, ValueError):
+                self._digests = {}
+        return self._digests
+
+    def _save_index(self):
+        tmp = self._index_path.with_name(f".{self._index_path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._digests, f)
+        os.replace(tmp, self._index_path)
+
+    async def source_digest(self, path: str) -> str:
+        """
+        Content hash of a source video. Hashing a long video takes seconds, so the digest
+        is memoized per (path, size, mtime) and only recomputed when the file changes.
+        """
+        stat = os.stat(path)
+        fingerprint = f"{Path(path).resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+        index = self._load_index()
+        if fingerprint not in index:
+            loop = asyncio.get_event_loop()
+            index[fingerprint] = await loop.run_in_executor(None, file_digest, path)
+            self._save_index()
+        return index[fingerprint]
+
+    def clip_key(self, source_digest: str, start: float, end: float, filters: str = "", profile: list = None) -> str:
+        # Millisecond precision: float noise in a re-parsed guide must not miss the cache
+        return stable_digest("clip", source_digest, f"{start:.3f}", f"{end:.3f}", filters, profile or [])
+
+    def render_key(self, source_digest: str, ranges: list, render_mode: str, profile: dict = None) -> str:
+        # Keyed by the resolved (start, end) cuts, whatever guide fields they came from;
+        # labels and prompts don't change the pixels
+        cuts = [(f"{start:.3f}", f"{end:.3f}") for start, end in ranges]
+        return stable_digest("render", source_digest, cuts, render_mode, profile or {})
@@ -0,0 +1,48 @@
+# 🎚️ V82: Named render profiles shared by every render backend.
+# None means "the backend's own default": source resolution/fps for condensed cuts,
+# the 1280x720 @ 24 fps canvas for forge videos.
+RENDER_PROFILES = {
+    "final": {
+        "height": None,
+        "fps": None,
+        "preset": None,
+        "crf": 20,
+        "video_bitrate": None,
+        "audio_bitrate": "192k",
+        "crossfade": 0.5,
+        "bg_music": True,
+    },
+    # Fast previews while iterating on a guide/storyboard
+    "draft": {
+        "height": 360,
+        "fps": 15,
+        "preset": "ultrafast",
+        "crf": None,
+        "video_bitrate": "600k",
+        "audio_bitrate": "64k",
+        "crossfade": 0.0,
+        "bg_music": False,
+    },
+}
+
+def get_render_profile(profile="final") -> dict:
+    """Resolves a profile name (or a custom dict over "final") to a copy the caller may modify."""
+    if isinstance(profile, dict):
+        return {**RENDER_PROFILES["final"], **profile}
+    try:
+        return dict(RENDER_PROFILES[profile or "final"])
+    except (KeyError, TypeError):
+        raise ValueError(f"Unknown render profile '{profile}' (expected one of: {', '.join(RENDER_PROFILES)})")
+
+def video_rate_args(profile: dict) -> list:
+    """libx264 rate control: a bitrate target when the profile sets one, CRF otherwise."""
+    if profile.get("video_bitrate"):
+        return ["-b:v", profile["video_bitrate"]]
+    return ["-crf", str(profile.get("crf") or 20)]
+
+def canvas_size(profile: dict, default: tuple = (1280, 720)) -> tuple:
+    """16:9 forge canvas for the profile's height (even dimensions for yuv420p)."""
+    height = profile.get("height")
+    if not height:
+        return default
+    return (int(round(height * 16 / 9 / 2)) * 2, int(height) // 2 * 2)
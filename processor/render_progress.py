@@ -0,0 +1,119 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from proglog import ProgressBarLogger
+
+class RenderStats:
+    def __init__(self, backend: str, profile: str = "final"):
+        """
+        📈 V83: Render Instrumentation
+        Frame-level progress (frames done/total, encode fps, ETA) plus wall-clock timings
+        per phase (load, composite, encode, mux) for one render. `as_dict()` is what gets
+        stored on the project document as `render_stats`.
+        """
+        self.profile = profile
+        self._started = time.perf_counter()
+        self.phases = {}
+        self.reset(backend)
+
+    def reset(self, backend: str, keep: tuple = ()):
+        """Starts over for another backend (e.g. after a failed smart render falls back)."""
+        self.backend = backend
+        self.phases = {name: self.phases[name] for name in keep if name in self.phases}
+        self.frame = 0
+        self.total_frames = None
+        self.fps = 0.0
+        self.current_phase = None
+        self._phase_started = time.perf_counter()
+        self._advanced = 0
+
+    @contextmanager
+    def phase(self, name: str):
+        self.current_phase = name
+        t0 = self._phase_started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.phases[name] = round(self.phases.get(name, 0.0) + time.perf_counter() - t0, 3)
+
+    def update(self, frame: int = None, total_frames: int = None, fps: float = None):
+        if frame is not None:
+            self.frame = frame
+        if total_frames is not None:
+            self.total_frames = total_frames
+        if fps is not None:
+            self.fps = fps
+
+    def advance(self, frames: int):
+        """Adds finished frames; fps counts only frames produced since the current phase began."""
+        self._advanced += frames
+        self.frame += frames
+        self.fps = self._advanced / max(time.perf_counter() - self._phase_started, 1e-6)
+
+    def eta(self):
+        """Seconds left in the encode at the current rate, or None while unknown."""
+        if not self.total_frames or self.fps <= 0:
+            return None
+        return round(max(0, self.total_frames - self.frame) / self.fps, 1)
+
+    def snapshot(self) -> dict:
+        """Live progress payload (sent with status updates and over the WebSocket)."""
+        return {
+            "phase": self.current_phase,
+            "frame": self.frame,
+            "total_frames": self.total_frames,
+            "fps": round(self.fps, 1),
+            "eta": self.eta(),
+        }
+
+    def as_dict(self) -> dict:
+        encode_seconds = self.phases.get("encode") or 0
+        return {
+            "backend": self.backend,
+            "profile": self.profile,
+            "frames": self.frame,
+            "total_frames": self.total_frames,
+            "encode_fps": round(self.frame / encode_seconds, 1) if encode_seconds and self.frame else None,
+            "phases": dict(self.phases),
+            "wall_seconds": round(time.perf_counter() - self._started, 3),
+        }
+
+class MoviePyProgressLogger(ProgressBarLogger):
+    def __init__(self, stats: RenderStats, emit, loop=None, min_interval: float = 0.5):
+        """
+        proglog logger for `write_videofile(logger=...)`, throttled to min_interval.
+        With a loop (MoviePy in an executor thread) emit is an async callable scheduled on it;
+        without one (V94: MoviePy in a worker process) emit is called directly.
+        emit: receives the stats snapshot.
+        """
+        super().__init__()
+        self.stats = stats
+        self.emit = emit
+        self.loop = loop
+        self.min_interval = min_interval
+        self._t0 = None
+        self._last_emit = 0.0
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        # "chunk" is MoviePy's audio pass; frame counts come from the video bar
+        if bar != "frame_index":
+            return
+        if attr == "total":
+            self.stats.update(total_frames=value)
+            return
+        if attr != "index":
+            return
+        now = time.perf_counter()
+        if self._t0 is None:
+            self._t0 = now
+        elapsed = now - self._t0
+        # MoviePy's bar can run one past its total (the closing frame); never report > 100%
+        frame = min(value + 1, self.stats.total_frames or value + 1)
+        self.stats.update(frame=frame, fps=frame / elapsed if elapsed > 0 else 0.0)
+        done = self.stats.total_frames and frame >= self.stats.total_frames
+        if now - self._last_emit >= self.min_interval or done:
+            self._last_emit = now
+            if self.loop:
+                asyncio.run_coroutine_threadsafe(self.emit(self.stats.snapshot()), self.loop)
+            else:
+                self.emit(self.stats.snapshot())
@@ -0,0 +1,40 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from processor.ffmpeg_tools import thread_budget
+
+class RenderScheduler:
+    def __init__(self, max_concurrent: int = None):
+        """
+        🚦 V84: Render Scheduler
+        Runs up to `max_concurrent` renders at once (RENDER_CONCURRENCY, default half the
+        cores) and queues the rest. Each slot gets a fixed cores / max_concurrent thread
+        budget, so N simultaneous encoders don't oversubscribe the CPU (an encoder's threads
+        can't shrink once it runs, so a render alone can't borrow the idle slots' share).
+        """
+        cores = os.cpu_count() or 1
+        self.max_concurrent = max(1, max_concurrent or int(os.environ.get("RENDER_CONCURRENCY", 0)) or cores // 2)
+        self.threads = thread_budget(self.max_concurrent)
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+    @asynccontextmanager
+    async def slot(self, label: str = "render"):
+        """Waits for a free render slot; yields its thread budget."""
+        self.waiting += 1
+        if self.active >= self.max_concurrent:
+            print(f"⏳ {label} queued ({self.active}/{self.max_concurrent} renders running, {self.waiting} waiting)")
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            yield self.threads
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {"max_concurrent": self.max_concurrent, "active": self.active, "waiting": self.waiting, "threads_per_render": self.threads}
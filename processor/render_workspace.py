@@ -0,0 +1,72 @@
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+def unique_name(stem: str, suffix: str) -> str:
+    """`stem_<random>.suffix`: output names that concurrent jobs can never share."""
+    return f"{stem}_{uuid.uuid4().hex[:10]}{suffix}"
+
+class RenderWorkspace:
+    def __init__(self, root: Path, prefix: str = "job", threads: int = None):
+        """
+        🧰 V84: Per-Job Render Workspace
+        Every render gets its own scratch directory (intermediates, MoviePy's temp audio,
+        the output while it is being written). The finished file is published into place
+        with os.replace, and the directory is removed on exit even when the render fails or
+        is cancelled, so concurrent renders never touch each other's files.
+        threads: CPU thread budget of the scheduler slot this job runs in.
+        """
+        self.root = Path(root)
+        self.job_id = f"{prefix}_{uuid.uuid4().hex[:12]}"
+        self.dir = self.root / self.job_id
+        self.threads = threads or os.cpu_count() or 1
+
+    def __enter__(self):
+        self.dir.mkdir(parents=True, exist_ok=False)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def file(self, name: str) -> Path:
+        """Path for a scratch file inside this job's directory."""
+        return self.dir / name
+
+    def subdir(self, name: str) -> Path:
+        path = self.dir / name
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def publish(self, src: Path, target: Path) -> Path:
+        """Moves a finished file to its final path atomically (readers never see a partial render)."""
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(src, target)
+        except OSError:
+            # Different filesystem: copy next to the target first, then swap it in
+            tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, target)
+        return target
+
+    @staticmethod
+    def sweep(root: Path, max_age_hours: float = 12.0) -> int:
+        """Removes workspaces left behind by a crashed process; returns how many were removed."""
+        root = Path(root)
+        if not root.exists():
+            return 0
+        cutoff = time.time() - max_age_hours * 3600
+        removed = 0
+        for entry in root.iterdir():
+            try:
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            print(f"🧹 Removed {removed} stale render workspace(s)")
+        return removed
@@ -0,0 +1,89 @@
+import asyncio
+import subprocess
+from pathlib import Path
+import numpy as np
+from processor.ffmpeg_tools import FFMPEG, FFmpegError, run_ffmpeg
+
+class StillSceneEncoder:
+    def __init__(self, width: int = 1280, height: int = 720, fps: int = 24, background: tuple = (25, 25, 25)):
+        """
+        🖼️ V81: Still-Scene Fast Path
+        A forge scene is one still image for its whole duration, so it is composited onto the
+        canvas exactly ONCE (PIL) and encoded as a looped image with `-tune stillimage`
+        instead of recompositing identical frames at 24 fps. Optional Ken Burns motion uses
+        crop boxes computed for all frames at once with NumPy and streams raw frames to ffmpeg.
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.background = background
+
+    def precomposite(self, image_path: str, out_path: Path) -> Path:
+        """Letterboxes the image onto the canvas and saves the final canvas-sized frame."""
+        from PIL import Image
+        with Image.open(image_path) as img:
+            img = img.convert("RGB")
+            # Shrink-to-fit only (same as the filter graph's force_original_aspect_ratio=decrease)
+            img.thumbnail((self.width, self.height), Image.LANCZOS)
+            canvas = Image.new("RGB", (self.width, self.height), self.background)
+            canvas.paste(img, ((self.width - img.width) // 2, (self.height - img.height) // 2))
+        canvas.save(out_path)
+        return Path(out_path)
+
+    def ken_burns_boxes(self, frame_count: int, zoom: float = 1.12, pan: tuple = (0.5, 0.5)) -> np.ndarray:
+        """
+        (frame_count, 4) int array of (left, top, right, bottom) crop boxes: a linear zoom from
+        the full frame to 1/zoom of it, drifting toward the `pan` focus point (fractions of w/h).
+        """
+        t = np.linspace(0.0, 1.0, max(1, frame_count))
+        scale = 1.0 / (1.0 + (zoom - 1.0) * t)
+        box_w = self.width * scale
+        box_h = self.height * scale
+        left = (self.width - box_w) * (0.5 + (pan[0] - 0.5) * t)
+        top = (self.height - box_h) * (0.5 + (pan[1] - 0.5) * t)
+        boxes = np.stack([left, top, left + box_w, top + box_h], axis=1)
+        return np.rint(boxes).astype(np.int32)
+
+    def encode_args(self, frame_path: Path, duration: float, preset: str = "ultrafast", threads: int = 0, fade_in: float = 0.0, rate_args: list = None) -> list:
+        """ffmpeg arguments that loop a precomposited frame into a silent H.264 scene clip."""
+        vf = "format=yuv420p" + (f",fade=t=in:st=0:d={fade_in:.3f}" if fade_in > 0 else "")
+        return [
+            "-loop", "1", "-framerate", self.fps, "-t", f"{duration:.3f}", "-i", frame_path,
+            "-vf", vf, "-c:v", "libx264", "-tune", "stillimage", "-preset", preset, *(rate_args or ["-crf", "20"]),
+            "-pix_fmt", "yuv420p", "-r", self.fps, "-threads", threads, "-an",
+        ]
+
+    async def encode(self, frame_path: Path, duration: float, out_path: Path, preset: str = "ultrafast", threads: int = 0, fade_in: float = 0.0, rate_args: list = None) -> Path:
+        await run_ffmpeg([*self.encode_args(frame_path, duration, preset, threads, fade_in, rate_args), out_path])
+        return Path(out_path)
+
+    async def encode_ken_burns(self, frame_path: Path, duration: float, out_path: Path, preset: str = "ultrafast", threads: int = 0, fade_in: float = 0.0, zoom: float = 1.12, pan: tuple = (0.5, 0.5), rate_args: list = None) -> Path:
+        """Streams Ken Burns frames (crop box -> resize) as rawvideo into one ffmpeg encoder."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._encode_ken_burns, frame_path, duration, out_path, preset, threads, fade_in, zoom, pan, rate_args)
+
+    def _encode_ken_burns(self, frame_path, duration, out_path, preset, threads, fade_in, zoom, pan, rate_args=None) -> Path:
+        from PIL import Image
+        frame_count = max(1, int(round(duration * self.fps)))
+        boxes = self.ken_burns_boxes(frame_count, zoom=zoom, pan=pan)
+        vf = "format=yuv420p" + (f",fade=t=in:st=0:d={fade_in:.3f}" if fade_in > 0 else "")
+        cmd = [
+            FFMPEG, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{self.width}x{self.height}", "-r", str(self.fps), "-i", "pipe:0",
+            "-vf", vf, "-c:v", "libx264", "-preset", preset, *[str(a) for a in (rate_args or ["-crf", "20"])], "-pix_fmt", "yuv420p",
+            "-threads", str(threads), "-an", str(out_path),
+        ]
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            with Image.open(frame_path) as base:
+                base = base.convert("RGB")
+                for box in boxes:
+                    # resize(box=...) crops and scales in one pass, no intermediate copy
+                    process.stdin.write(base.resize((self.width, self.height), Image.BILINEAR, box=tuple(int(v) for v in box)).tobytes())
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = process.stderr.read().decode(errors="replace")
+        if process.wait() != 0:
+            raise FFmpegError(f"ffmpeg exited with {process.returncode}: {stderr[-800:]}")
+        return Path(out_path)
@@ -1,12 +1,24 @@
 from deep_translator import GoogleTranslator
 from pathlib import Path
 import json
+import math
 import asyncio
+import numpy as np
+from processor.transcript_index import TranscriptIndex, STOP_WORDS
+from processor.file_cache import stable_seed
+
+# Chapter detection tuning
+MIN_CHAPTERS = 3            # YouTube requires at least 3 chapters
+MAX_CHAPTERS = 40
+MIN_CHAPTER_SECONDS = 10    # YouTube minimum chapter length
+MAX_CHAPTER_TERMS = 4096    # Vocabulary cap for the block cohesion pass
 
 class StudioEngine:
     def __init__(self):
         self.translator = GoogleTranslator(source='auto', target='am')
         self.en_translator = GoogleTranslator(source='auto', target='en')
+        # V74: One translator per target so concurrent language fan-outs don't thrash
+        self._translators = {'am': self.translator, 'en': self.en_translator}
 
 
 
@@ -15,38 +27,72 @@ class StudioEngine:
         import urllib.parse
         clean_p = prompt.replace("\n", " ").strip()[:180]
         encoded = urllib.parse.quote(clean_p)
-        # Seed ensures variety; using standard height/width params
-        return f"https://image.pollinations.ai/prompt/{encoded}?width=1280&height=720&nologo=true&seed={hash(clean_p) % 10000}"
+        # Seed ensures variety; a stable digest keeps the URL (and its cached image) identical across restarts
+        return f"https://image.pollinations.ai/prompt/{encoded}?width=1280&height=720&nologo=true&seed={stable_seed(clean_p)}"
+
+    def shorts_clip_selector(self, segments, index: TranscriptIndex = None):
+        """
+        Finds the most 'High Energy' 60-second clip for a YouTube Short.
+        V72: Two-pointer window over the shared index (O(n) instead of O(n^2)).
+        """
+        windows = self.shorts_clip_windows(segments, index, top_k=1)
+        return windows[0] if windows else None
 
-    def shorts_clip_selector(self, segments):
-        """Finds the most 'High Energy' 60-second clip for a YouTube Short."""
-        if not segments: return None
+    def shorts_clip_windows(self, segments, index: TranscriptIndex = None, top_k: int = 3, max_seconds: float = 60):
+        """
+        V85: The top-k non-overlapping highlight windows (best first), for rendering several Shorts.
+        Every start segment gets its best <= max_seconds window in one two-pointer pass; windows
+        are then taken greedily by score, skipping any that overlap one already chosen.
+        """
+        if not segments: return []
+        if index is None:
+            index = TranscriptIndex(segments)
         
         # Heuristic: Density of words + presence of '?' or '!'
         scores = []
-        for i, seg in enumerate(segments):
-            score = len(seg['text'].split())
-            if '!' in seg['text']: score += 10
-            if '?' in seg['text']: score += 5
+        for i, text in enumerate(index.texts):
+            score = len(index.tokens[i])
+            if '!' in text: score += 10
+            if '?' in text: score += 5
             scores.append(score)
             
-        # Find 60s window with highest score
-        max_score = -1
-        best_start_idx = 0
-        
+        # Window [i, j) for every start i keeps span <= max_seconds
+        candidates = []  # (score, start_idx, end_idx)
+        window_score = 0
+        j = 0
         for i in range(len(segments)):
-            current_window_score = 0
-            current_window_duration = 0
-            for j in range(i, len(segments)):
-                current_window_score += scores[j]
-                current_window_duration = segments[j]['end'] - segments[i]['start']
-                if current_window_duration > 60: break
-                
-                if current_window_score > max_score:
-                    max_score = current_window_score
-                    best_start_idx = i
-                    
-        best_seg = segments[best_start_idx]
+            if j < i:
+                j, window_score = i, 0
+            while j < len(segments) and index.span_duration(i, j) <= max_seconds:
+                window_score += scores[j]
+                j += 1
+            if j > i:
+                candidates.append((window_score, i, j))
+                window_score -= scores[i]
+        if not candidates:
+            # Every segment alone is longer than max_seconds: fall back to the first one
+            candidates.append((-1, 0, 1))
+
+        # Highest score first; ties keep the earlier window (same pick as the single-window scan)
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        chosen = []
+        for score, i, j in candidates:
+            if len(chosen) >= top_k:
+                break
+            start, end = index.starts[i], index.ends[j - 1]
+            if any(start < c["end"] and c["start"] < end for c in chosen):
+                continue
+            chosen.append({
+                "start": start,
+                "end": end,
+                "timestamp_start": f"{int(start // 60):02d}:{int(start % 60):02d}",
+                "timestamp_end": f"{int(end // 60):02d}:{int(end % 60):02d}",
+                "duration": round(end - start, 2),
+                "score": score,
+                "text": index.join(i, j)
+            })
+        return chosen
+
     async def translate_text(self, text: str, target_lang: str = "am", tone: str = "neutral"):
         """
         Translates text to a target language with an optional 'Tone'.
@@ -56,9 +102,10 @@ class StudioEngine:
         if target_lang == "en": return text # Optimization
         
         try:
-            # Re-initialize translator if target changed
-            if self.translator.target != target_lang:
-                self.translator = GoogleTranslator(source='auto', target=target_lang)
+            # Reuse (or lazily create) the translator for this target
+            translator = self._translators.get(target_lang)
+            if translator is None:
+                translator = self._translators[target_lang] = GoogleTranslator(source='auto', target=target_lang)
             
             # Add tone instructions if needed
             pre_prompt = ""
@@ -67,7 +114,7 @@ class StudioEngine:
             elif tone == "news": pre_prompt = "📰 News Anchor Style: "
             
             # deep-translator is synchronous, wrap in to_thread
-            result = await asyncio.to_thread(self.translator.translate, f"{pre_prompt}{text}")
+            result = await asyncio.to_thread(translator.translate, f"{pre_prompt}{text}")
             return result
         except Exception as e:
             print(f"Translation error: {e}")
@@ -86,9 +133,12 @@ class StudioEngine:
         }
         return {"teaser": teaser, "poll": poll}
 
-    async def generate_social_thread(self, script: str, target_lang: str = "am"):
+    async def generate_social_thread(self, script: str, target_lang: str = "am", index: TranscriptIndex = None):
         """Converts script into a 5-step viral Twitter/X thread."""
-        lines = script.split(".")[:10]
+        if index is not None and index.sentences:
+            lines = [s["text"] for s in index.sentences[:10]]
+        else:
+            lines = script.split(".")[:10]
         lang_text = "Amharic" if target_lang == "am" else "English"
         thread = [
             f"🧵 I just analyzed a fascinating video about '{lines[0][:50]}'. Here are the 5 key takeaways you NEED to know: (Thread) 👇",
@@ -100,46 +150,50 @@ class StudioEngine:
         ]
         return thread
 
-    async def extract_editing_guide(self, whisper_segments, target_duration_mins: int, target_lang: str = "am", tone: str = "neutral", genre: str = "sermon"):
+    async def extract_editing_guide(self, whisper_segments, target_duration_mins: int, target_lang: str = "am", tone: str = "neutral", genre: str = "sermon", index: TranscriptIndex = None):
         """
         🧬 V70: Topic-Driven Context Trimming
         Detects natural idea boundaries (pauses, transitions) to ensure clips start and end perfectly.
+        V72: Boundaries are computed once per segment from the shared TranscriptIndex.
+        V74: Split into language-independent selection + per-language packaging.
         """
         if not whisper_segments: return []
+        islands = self.select_editing_islands(whisper_segments, target_duration_mins, genre=genre, index=index)
+        return await self.package_editing_guide(islands, target_lang=target_lang, tone=tone, genre=genre)
+
+    def select_editing_islands(self, whisper_segments, target_duration_mins: int, genre: str = "sermon", index: TranscriptIndex = None) -> list:
+        """Picks the chronological idea islands for the editing guide (no translation involved)."""
+        if not whisper_segments: return []
+        if index is None:
+            index = TranscriptIndex(whisper_segments)
         
-        def clean_seg(seg):
-            return {
-                "start": float(seg.get("start", 0)),
-                "end": float(seg.get("end", 0)),
-                "text": str(seg.get("text", "")).strip(),
-                "duration": float(seg.get("end", 0)) - float(seg.get("start", 0))
-            }
-        
-        cleaned_segments = [clean_seg(s) for s in whisper_segments]
+        cleaned_segments = [
+            {"start": start, "end": end, "text": text, "duration": end - start}
+            for start, end, text in zip(index.starts, index.ends, index.texts)
+        ]
         target_seconds = target_duration_mins * 60
         
-        # 1. Boundary Detection Helper
-        def is_natural_boundary(seg, prev_seg=None):
-            text = seg['text'].lower()
-            # Transition Words (English & Amharic)
-            transitions = ["now", "first", "finally", "so", "but", "however", "therefore", "ስለዚህ", "ነገር ግን", "በመጀመሪያ", "በመጨረሻ"]
+        # 1. Boundary Detection (precomputed: boundaries[i] is True if segment i opens a new idea)
+        # Transition Words (English & Amharic)
+        transitions = ("now", "first", "finally", "so", "but", "however", "therefore", "ስለዚህ", "ነገር ግን", "በመጀመሪያ", "በመጨረሻ")
+        boundaries = []
+        for i, text in enumerate(index.lower):
             # Pause Detection (> 1.5 seconds gap)
-            pause = (seg['start'] - prev_seg['end']) > 1.5 if prev_seg else False
+            pause = (index.starts[i] - index.ends[i-1]) > 1.5 if i > 0 else False
             # Syntactic / Genre Markers
-            is_trans = any(text.startswith(t) for t in transitions)
-            is_question = "?" in text or "?" in (prev_seg['text'] if prev_seg else "")
-            
-            return pause or is_trans or is_question
+            is_trans = text.startswith(transitions)
+            is_question = "?" in text or (i > 0 and "?" in index.texts[i-1])
+            boundaries.append(pause or is_trans or is_question)
 
         # 2. Scoring Phase
         scored_segments = []
         for i, s in enumerate(cleaned_segments):
-            text = s['text'].lower()
+            text = index.lower[i]
             if not text: continue
             
             score = len(text)
             # Bonus for starters
-            if is_natural_boundary(s, cleaned_segments[i-1] if i > 0 else None):
+            if boundaries[i]:
                 score *= 1.4
             
             # Genre Bonuses
@@ -171,7 +225,7 @@ class StudioEngine:
                 if prev['used']: break
                 
                 # If we found a boundary, we STOP before it (so the current clip starts at the boundary)
-                if is_natural_boundary(cleaned_segments[curr_start_idx], cleaned_segments[curr_start_idx-1]):
+                if boundaries[curr_start_idx]:
                     break
                 
                 prev['used'] = True
@@ -186,7 +240,7 @@ class StudioEngine:
                 if nxt['used']: break
                 
                 # Check if the NEXT segment is a boundary (meaning this idea ends here)
-                if is_natural_boundary(cleaned_segments[curr_end_idx+1], cleaned_segments[curr_end_idx]):
+                if boundaries[curr_end_idx+1]:
                     break
                     
                 nxt['used'] = True
@@ -222,7 +276,11 @@ class StudioEngine:
 
         # Sort chronologically
         islands.sort(key=lambda x: x['start'])
-        
+        print(f"🎨 Topic-Driven Selection: Request {target_duration_mins}m | Planned {round(current_dur/60, 2)}m")
+        return islands
+
+    async def package_editing_guide(self, islands: list, target_lang: str = "am", tone: str = "neutral", genre: str = "sermon"):
+        """Turns selected islands into editing-guide entries with narration in target_lang."""
         # 4. Packaging
         tasks = []
         for i, island in enumerate(islands):
@@ -236,6 +294,8 @@ class StudioEngine:
                     "index": idx,
                     "timestamp_start": f"{int(data['start'] // 60):02d}:{int(data['start'] % 60):02d}",
                     "timestamp_end": f"{int(data['end'] // 60):02d}:{int(data['end'] % 60):02d}",
+                    "start_sec": round(data['start'], 3),
+                    "end_sec": round(data['end'], 3),
                     "duration": data['duration'],
                     "original_text": data['text'],
                     "narration_suggestion": suggestion,
@@ -246,7 +306,6 @@ class StudioEngine:
             tasks.append(process_island(i, island))
 
         results = await asyncio.gather(*tasks)
-        print(f"🎨 Topic-Driven Selection: Request {target_duration_mins}m | Planned {round(current_dur/60, 2)}m")
         return results
 
     async def generate_visual_prompt(self, text: str):
@@ -290,9 +349,12 @@ class StudioEngine:
 
         return f"Cinematic b-roll footage of: {text[:60]}, 5-second clip, soft camera movement, dolly in, {v_suffix}"
 
-    async def generate_hooks(self, transcript_segments, target_lang: str = "am"):
+    async def generate_hooks(self, transcript_segments, target_lang: str = "am", index: TranscriptIndex = None):
         """Generates 3 viral hooks based on the first few minutes."""
-        first_min = " ".join([s['text'] for s in transcript_segments[:5]])
+        if index is not None:
+            first_min = index.join(0, 5)
+        else:
+            first_min = " ".join([s['text'] for s in transcript_segments[:5]])
         
         hooks = [
             f"Stop scrolling! This video changes everything about {first_min[:40]}...",
@@ -327,9 +389,12 @@ class StudioEngine:
             srt_content += f"{i+1}\n{start} --> {end}\n{text}\n\n"
         return srt_content
 
-    async def generate_metadata_recommendations(self, title: str, transcript_segments, target_lang: str, tone: str = "neutral", genre: str = "sermon"):
+    async def generate_metadata_recommendations(self, title: str, transcript_segments, target_lang: str, tone: str = "neutral", genre: str = "sermon", index: TranscriptIndex = None):
         """Generates 3 titles and a full SEO description in the target language."""
-        content_sample = " ".join([s['text'] for s in transcript_segments[:10]])
+        if index is not None:
+            content_sample = index.join(0, 10)
+        else:
+            content_sample = " ".join([s['text'] for s in transcript_segments[:10]])
         theme = title if title else content_sample[:60]
         
         # Genre-Specific English Templates
@@ -368,13 +433,16 @@ class StudioEngine:
         
         return {"titles": am_titles, "description": am_desc}
 
-    async def generate_chapters(self, transcript_segments, target_lang: str = "en"):
+    async def generate_chapters(self, transcript_segments, target_lang: str = "en", index: TranscriptIndex = None, boundaries: list = None):
         """
         🏆 V23: Advanced Chapter Generator
         Generates thematic and descriptive YouTube chapters.
         V24: Hallucination Guard (Auto-translates distorted AI segments back to target lang).
+        V73: Chapter boundaries come from lexical-cohesion topic shifts (see detect_topic_shifts).
         """
         if not transcript_segments: return "00:00 - Introduction"
+        if index is None:
+            index = TranscriptIndex(transcript_segments)
         
         chapters = []
         # Ensure it always starts at 00:00
@@ -383,25 +451,20 @@ class StudioEngine:
             intro_text = await self.translate_text(intro_text, target_lang=target_lang)
         chapters.append(f"00:00 - {intro_text}")
         
-        # Determine logical spacing (aim for 5-8 chapters)
-        num_goals = 6
-        step = len(transcript_segments) // num_goals
+        if boundaries is None:
+            boundaries = await asyncio.to_thread(self.detect_topic_shifts, index)
         
         titles_to_translate = []
         timestamps = []
         
-        for i in range(1, num_goals):
-            idx = i * step
-            if idx >= len(transcript_segments): break
-            
-            seg = transcript_segments[idx]
-            time_str = f"{int(seg['start'] // 60):02d}:{int(seg['start'] % 60):02d}"
+        for idx in boundaries:
+            time_str = self._format_chapter_time(index.starts[idx])
             
-            # Find the "Heaviest" sentence nearby for a title
-            sub_segments = transcript_segments[max(0, idx-2):min(len(transcript_segments), idx+3)]
-            best_seg = max(sub_segments, key=lambda x: len(x['text']))
+            # Find the "Heaviest" sentence opening the new topic for a title
+            nearby = range(idx, min(len(transcript_segments), idx+3))
+            best_idx = max(nearby, key=lambda k: len(index.texts[k]))
             
-            raw_title = best_seg['text'].strip().split(".")[0]
+            raw_title = index.texts[best_idx].split(".")[0]
             title = (raw_title[:35] + "...") if len(raw_title) > 35 else raw_title
             
             titles_to_translate.append(title)
@@ -420,32 +483,141 @@ class StudioEngine:
             
         return "\n".join(chapters)
 
-    def condense_english(self, text: str, target_ratio: float = 0.3, target_duration_mins: int = 5):
+    def detect_topic_shifts(self, index: TranscriptIndex, block_windows: int = 3) -> list:
+        """
+        📚 V73: TextTiling-style Topic Shift Detector
+        1. Buckets segments into fixed-length time windows and builds a sparse
+           window x term TF-IDF matrix (COO keys reduced with np.unique).
+        2. Scores every window gap with ONE vectorized cosine pass between the
+           adjacent left/right blocks (prefix sums over windows).
+        3. Picks the deepest similarity valleys, with a chapter count that grows
+           with content length and a minimum spacing between chapters.
+        Returns the segment indices that open each chapter (excluding 00:00).
+        """
+        n = len(index)
+        if n == 0:
+            return []
+        total_seconds = max(index.ends[-1], 1.0)
+        target_count = int(min(MAX_CHAPTERS, max(MIN_CHAPTERS, round(math.sqrt(total_seconds / 60) * 1.5))))
+        min_spacing = max(MIN_CHAPTER_SECONDS, total_seconds / (target_count * 2))
+
+        # 1. Sparse TF-IDF per time window
+        window_seconds = min(60.0, max(15.0, total_seconds / 400))
+        seg_windows = (np.asarray(index.starts) // window_seconds).astype(np.int64)
+        num_windows = int(seg_windows[-1]) + 1
+
+        vocab = {}
+        rows, cols = [], []
+        for i, toks in enumerate(index.tokens):
+            for w in toks:
+                if len(w) < 3 or w in STOP_WORDS: continue
+                rows.append(seg_windows[i])
+                cols.append(vocab.setdefault(w, len(vocab)))
+
+        if not vocab or num_windows < 2 * block_windows + 1:
+            return self._even_chapter_boundaries(index, target_count)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        keys, counts = np.unique(rows * len(vocab) + cols, return_counts=True)
+        win_ids, term_ids = keys // len(vocab), keys % len(vocab)
+
+        # Document frequency over windows -> smoothed idf
+        df = np.bincount(term_ids, minlength=len(vocab))
+        idf = np.log((1 + num_windows) / (1 + df)) + 1.0
+
+        # Keep the terms carrying the most TF-IDF mass so the block arithmetic stays tiny
+        mass = np.bincount(term_ids, weights=counts * idf[term_ids], minlength=len(vocab))
+        keep = np.argsort(mass)[::-1][:MAX_CHAPTER_TERMS]
+        remap = np.full(len(vocab), -1, dtype=np.int64)
+        remap[keep] = np.arange(len(keep))
+        mask = remap[term_ids] >= 0
+
+        tfidf = np.zeros((num_windows, len(keep)), dtype=np.float32)
+        tfidf[win_ids[mask], remap[term_ids[mask]]] = counts[mask] * idf[term_ids[mask]]
+
+        # 2. Block cohesion at every gap g (left = windows [g-k, g), right = [g, g+k))
+        k = block_windows
+        prefix = np.vstack([np.zeros((1, tfidf.shape[1]), dtype=np.float32), np.cumsum(tfidf, axis=0)])
+        gaps = np.arange(k, num_windows - k + 1)
+        left = prefix[gaps] - prefix[gaps - k]
+        right = prefix[gaps + k] - prefix[gaps]
+        norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+        sims = np.einsum("ij,ij->i", left, right) / np.maximum(norms, 1e-9)
+
+        # Light smoothing, then depth = climb to the highest peak on each side
+        if len(sims) >= 3:
+            sims = np.convolve(np.pad(sims, 1, mode="edge"), np.ones(3) / 3, mode="valid")
+        reach = 2 * k
+        padded = np.pad(sims, reach, mode="edge")
+        windows = np.lib.stride_tricks.sliding_window_view(padded, reach + 1)
+        left_peak = windows[:len(sims)].max(axis=1)
+        right_peak = windows[reach:reach + len(sims)].max(axis=1)
+        depth = (left_peak - sims) + (right_peak - sims)
+
+        # 3. Deepest valleys first, honouring the spacing constraint
+        cutoff = depth.mean() - depth.std() / 2
+        first_seg = np.searchsorted(seg_windows, gaps)
+        chosen = []
+        for g in np.argsort(depth)[::-1]:
+            if len(chosen) >= target_count - 1 or depth[g] < cutoff: break
+            seg_idx = int(first_seg[g])
+            if seg_idx <= 0 or seg_idx >= n: continue
+            start = index.starts[seg_idx]
+            if start < min_spacing or total_seconds - start < MIN_CHAPTER_SECONDS: continue
+            if any(abs(start - index.starts[c]) < min_spacing for c in chosen): continue
+            chosen.append(seg_idx)
+
+        if len(chosen) < MIN_CHAPTERS - 1:
+            return self._even_chapter_boundaries(index, target_count)
+        return sorted(chosen)
+
+    def _even_chapter_boundaries(self, index: TranscriptIndex, target_count: int) -> list:
+        """Legacy even spacing, used when the transcript is too short for cohesion analysis."""
+        step = len(index) // target_count
+        if step == 0:
+            return []
+        return [i * step for i in range(1, target_count) if i * step < len(index)]
+
+    def _format_chapter_time(self, seconds: float) -> str:
+        """MM:SS, or H:MM:SS once the video passes the hour mark (YouTube chapter format)."""
+        hrs = int(seconds // 3600)
+        mins = int((seconds % 3600) // 60)
+        secs = int(seconds % 60)
+        if hrs:
+            return f"{hrs}:{mins:02d}:{secs:02d}"
+        return f"{mins:02d}:{secs:02d}"
+
+    def condense_english(self, text: str, target_ratio: float = 0.3, target_duration_mins: int = 5, index: TranscriptIndex = None):
         """
         🧬 V20: English Condensation Evolution
         Condenses English text using Contextual Density & Punchy-fication.
         V21 Update: Reading-Speed Aware (Fits target_duration_mins exactly).
+        V72: Sentences and term frequencies come from the shared TranscriptIndex when provided.
         """
-        if not text: return ""
+        if not text and index is None: return ""
         
-        # 1. Clean verbal fluff and fillers (Punchy-fication)
-        fillers = ["you know", "i mean", "sort of", "kind of", "basically", "actually", "literally", "to be honest", "obviously"]
-        clean_text = text.lower()
-        for f in fillers:
-            clean_text = clean_text.replace(f, "")
-        
-        sentences = text.split(". ")
-        if len(sentences) < 5: return text
-        
-        # 2. Contextual Density (Favoring nouns and action verbs)
-        stop_words = {"the", "is", "at", "which", "on", "and", "to", "of", "a", "in", "that", "it", "with", "from", "for"}
-        words = [w.strip(",.").lower() for w in text.split() if w.strip(",.").lower() not in stop_words]
-        
-        freq_map = {}
-        for w in words:
-            weight = 1.0
-            if len(w) > 6: weight = 1.5 
-            freq_map[w] = freq_map.get(w, 0) + weight
+        if index is not None:
+            text = index.full_text
+            sentences = [s["text"] for s in index.sentences]
+            if len(sentences) < 5: return text
+            # 2. Contextual Density from the precomputed term frequencies
+            freq_map = {
+                w: count * (1.5 if len(w) > 6 else 1.0)
+                for w, count in index.term_freq.items() if w not in STOP_WORDS
+            }
+        else:
+            sentences = text.split(". ")
+            if len(sentences) < 5: return text
+            
+            # 2. Contextual Density (Favoring nouns and action verbs)
+            words = [w.strip(",.").lower() for w in text.split() if w.strip(",.").lower() not in STOP_WORDS]
+            
+            freq_map = {}
+            for w in words:
+                weight = 1.0
+                if len(w) > 6: weight = 1.5 
+                freq_map[w] = freq_map.get(w, 0) + weight
             
         # 3. Sentence Ranking
         sentence_scores = []
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import subprocess
+from pathlib import Path
+import numpy as np
+from processor.ffmpeg_tools import FFMPEG, FFmpegError
+from processor.file_cache import FileCache, stable_digest
+
+# Candidates closer than this are treated as the same shot when picking the best N
+MIN_THUMBNAIL_SPACING = 2.0
+
+class ThumbnailExtractor:
+    def __init__(self, cache: FileCache, width: int = 1280, analysis_width: int = 160):
+        """
+        🖼️ V87: Source-Frame Thumbnail Extractor
+        Pulls one keyframe per highlight timestamp (keyframe-only fast seeks, so nothing
+        between keyframes is decoded) in ONE ffmpeg process. Each frame is split into a
+        downscaled grayscale copy for scoring and a full-size JPEG; all candidates are scored
+        at once with NumPy (Laplacian sharpness, exposure, contrast) and the best N JPEGs
+        are kept in the cache.
+        """
+        self.cache = cache
+        self.width = width
+        self.analysis_width = analysis_width
+
+    async def extract(self, source_path: str, timestamps: list, workdir: Path, count: int = 3, source_digest: str = None) -> list:
+        """
+        [{"time", "score", "sharpness", "brightness", "path"}] best first (at most `count`).
+        workdir: scratch directory for the candidate JPEGs (the caller's job workspace).
+        """
+        timestamps = sorted({round(float(t), 3) for t in timestamps if t is not None and float(t) >= 0})
+        if not timestamps:
+            return []
+        # Only memoize when the source is content-addressed (a path can be overwritten)
+        selection_key = stable_digest("thumbnails", source_digest, timestamps, count, self.width) if source_digest else None
+        if selection_key:
+            cached = self._cached_selection(selection_key)
+            if cached is not None:
+                return cached
+
+        loop = asyncio.get_event_loop()
+        workdir = Path(workdir)
+        workdir.mkdir(parents=True, exist_ok=True)
+        try:
+            frames = await loop.run_in_executor(None, self._decode_candidates, source_path, timestamps, workdir)
+            metrics = self.score_frames(frames)
+            chosen = []
+            for i in np.argsort(-metrics["score"], kind="stable"):
+                if len(chosen) >= count:
+                    break
+                if metrics["score"][i] <= 0 or any(abs(timestamps[i] - timestamps[j]) < MIN_THUMBNAIL_SPACING for j in chosen):
+                    continue
+                chosen.append(int(i))
+
+            results = []
+            for i in chosen:
+                key = stable_digest("thumbnail", source_digest or str(source_path), f"{timestamps[i]:.3f}", self.width)
+                path = self.cache.put(key, workdir / f"cand_{i + 1:04d}.jpg", ".jpg", move=True)
+                results.append({
+                    "time": timestamps[i],
+                    "score": round(float(metrics["score"][i]), 4),
+                    "sharpness": round(float(metrics["sharpness"][i]), 2),
+                    "brightness": round(float(metrics["brightness"][i]), 1),
+                    "path": str(path),
+                })
+        finally:
+            for leftover in workdir.glob("cand_*.jpg"):
+                leftover.unlink()
+
+        if selection_key:
+            self.cache.put_bytes(selection_key, json.dumps(results).encode("utf-8"), ".json")
+        print(f"🖼️ Thumbnails: best {len(results)} of {len(timestamps)} candidates")
+        return results
+
+    def _cached_selection(self, key: str):
+        """The stored selection if every chosen JPEG is still in the cache (else re-extract)."""
+        path = self.cache.get(key, ".json")
+        if not path:
+            return None
+        try:
+            results = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return results if all(Path(r["path"]).exists() for r in results) else None
+
+    def _decode_candidates(self, source_path: str, timestamps: list, workdir: Path) -> np.ndarray:
+        """One ffmpeg pass -> (n, h, w) uint8 luma for scoring, plus cand_NNNN.jpg files."""
+        inputs, chains = [], []
+        for i, t in enumerate(timestamps):
+            # Input seek + nokey: lands on the keyframe at/before t and decodes only that frame
+            inputs += ["-noaccurate_seek", "-skip_frame", "nokey", "-ss", f"{t:.3f}", "-i", str(source_path)]
+            chains.append(f"[{i}:v]trim=end_frame=1,setpts=PTS-STARTPTS,scale='min({self.width},iw)':-2,setsar=1,format=yuvj420p[c{i}]")
+        n = len(timestamps)
+        chains.append(f"{''.join(f'[c{i}]' for i in range(n))}concat=n={n}:v=1:a=0,settb=1/25,setpts=N,split=2[full][small]")
+        chains.append(f"[small]scale={self.analysis_width}:-2,format=gray[gray]")
+
+        cmd = [
+            FFMPEG, "-hide_banner", "-loglevel", "error", "-nostdin", "-y", *inputs,
+            "-filter_complex", ";".join(chains),
+            "-map", "[full]", "-fps_mode", "passthrough", "-q:v", "2", str(workdir / "cand_%04d.jpg"),
+            "-map", "[gray]", "-fps_mode", "passthrough", "-f", "rawvideo", "-pix_fmt", "gray", "pipe:1",
+        ]
+        process = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if process.returncode != 0:
+            raise FFmpegError(f"ffmpeg exited with {process.returncode}: {process.stderr.decode(errors='replace')[-800:]}")
+
+        raw = np.frombuffer(process.stdout, dtype=np.uint8)
+        # Every frame shares one size; the height follows from the byte count
+        height = raw.size // (n * self.analysis_width)
+        if height <= 0 or raw.size != n * self.analysis_width * height:
+            raise FFmpegError(f"expected {n} candidate frames, got {raw.size} bytes")
+        return raw.reshape(n, height, self.analysis_width)
+
+    @staticmethod
+    def score_frames(frames: np.ndarray) -> dict:
+        """
+        Vectorized metrics over (n, h, w) luma frames:
+        sharpness = variance of the 4-neighbour Laplacian, brightness = mean luma,
+        contrast = luma std. Near-black / blown-out frames score 0.
+        """
+        f = frames.astype(np.float32)
+        lap = 4 * f[:, 1:-1, 1:-1] - f[:, :-2, 1:-1] - f[:, 2:, 1:-1] - f[:, 1:-1, :-2] - f[:, 1:-1, 2:]
+        sharpness = lap.reshape(len(f), -1).var(axis=1)
+        brightness = f.reshape(len(f), -1).mean(axis=1)
+        contrast = f.reshape(len(f), -1).std(axis=1)
+
+        exposure = 1.0 - np.abs(brightness - 128.0) / 128.0
+        score = (
+            0.6 * sharpness / max(float(sharpness.max()), 1e-6)
+            + 0.25 * exposure
+            + 0.15 * contrast / max(float(contrast.max()), 1e-6)
+        )
+        score[(brightness < 20) | (brightness > 235)] = 0.0
+        return {"score": score, "sharpness": sharpness, "brightness": brightness, "contrast": contrast}
@@ -0,0 +1,90 @@
+import re
+from bisect import bisect_right
+from collections import Counter
+
+# Shared text heuristics (used by both the Studio and English recreator analyzers)
+FILLER_RE = re.compile(
+    r"\b(?:you know|i mean|basically|actually|literally|to be honest|obviously|kind of|sort of)\b[,]?\s*",
+    re.IGNORECASE,
+)
+STOP_WORDS = frozenset({"the", "is", "at", "which", "on", "and", "to", "of", "a", "in", "that", "it", "with", "from", "for"})
+SENTENCE_SPLIT_RE = re.compile(r"\. ")
+
+class TranscriptIndex:
+    def __init__(self, segments: list):
+        """
+        🗂️ V72: Shared Transcript Index
+        Tokenizes a Whisper transcript exactly once so every StudioEngine analyzer
+        (hooks, chapters, metadata, shorts, editing guide, social thread, condensation)
+        reads from the same precomputed views instead of re-splitting the text.
+        """
+        self.segments = segments or []
+        self.starts = [float(s.get("start", 0)) for s in self.segments]
+        self.ends = [float(s.get("end", 0)) for s in self.segments]
+        self.texts = [str(s.get("text", "")).strip() for s in self.segments]
+        self.lower = [t.lower() for t in self.texts]
+
+        # Tokens match the analyzers' historical `w.strip(",.").lower()` convention
+        self.tokens = [[w.strip(",.") for w in t.split()] for t in self.lower]
+        self.clean_texts = [FILLER_RE.sub("", t) for t in self.texts]
+        self.clean_tokens = [[w.strip(",.").lower() for w in t.split()] for t in self.clean_texts]
+
+        # Global term frequencies and word -> segment inverted index
+        self.term_freq = Counter()
+        self.inverted = {}
+        for i, toks in enumerate(self.tokens):
+            self.term_freq.update(toks)
+            for w in set(toks):
+                self.inverted.setdefault(w, []).append(i)
+
+        # Prefix sums: cum_durations[j] - cum_durations[i] == speech time of segments[i:j]
+        self.cum_durations = [0.0]
+        for start, end in zip(self.starts, self.ends):
+            self.cum_durations.append(self.cum_durations[-1] + max(0.0, end - start))
+
+        # Full text plus sentence spans mapped back onto segment indices
+        self.full_text = " ".join(self.texts)
+        self._char_starts = []
+        offset = 0
+        for t in self.texts:
+            self._char_starts.append(offset)
+            offset += len(t) + 1
+        self.sentences = self._build_sentences()
+
+    def __len__(self):
+        return len(self.segments)
+
+    def _segment_at(self, char_offset: int) -> int:
+        return max(0, bisect_right(self._char_starts, char_offset) - 1)
+
+    def _build_sentences(self) -> list:
+        sentences = []
+        pos = 0
+        bounds = [m.span() for m in SENTENCE_SPLIT_RE.finditer(self.full_text)]
+        bounds.append((len(self.full_text), len(self.full_text)))
+        for stop, resume in bounds:
+            text = self.full_text[pos:stop]
+            if text.strip():
+                sentences.append({
+                    "text": text,
+                    "start_seg": self._segment_at(pos),
+                    "end_seg": self._segment_at(max(pos, stop - 1)),
+                })
+            pos = resume
+        return sentences
+
+    def join(self, start: int = 0, end: int = None) -> str:
+        """Joined text of segments[start:end]."""
+        return " ".join(self.texts[start:end])
+
+    def speech_duration(self, start: int, end: int) -> float:
+        """Summed segment durations of segments[start:end] in O(1)."""
+        return self.cum_durations[end] - self.cum_durations[start]
+
+    def span_duration(self, start: int, end: int) -> float:
+        """Wall-clock span from segments[start] to segments[end] inclusive."""
+        return self.ends[end] - self.starts[start]
+
+    def segments_with(self, word: str) -> list:
+        """Indices of segments containing the (lowercase) token."""
+        return self.inverted.get(word.lower(), [])
@@ -1,13 +1,193 @@
 import asyncio
 import edge_tts
+import json
+import random
+import re
+import shutil
 import subprocess
 import os
+import uuid
+from contextlib import aclosing, asynccontextmanager
 from pathlib import Path
+from processor.ffmpeg_tools import FFMPEG, FFmpegError, VOICE_COMPRESSOR, concat_files, measure_loudness, loudness_sidecar, probe_media
+from processor.file_cache import FileCache, stable_digest
+from processor.render_workspace import RenderWorkspace, unique_name
+
+# V88: scripts longer than this are synthesized as concurrent sentence chunks
+CHUNK_THRESHOLD_CHARS = 600
+CHUNK_MAX_CHARS = 400
+# The first chunk is kept short so the first audio arrives quickly (V90 streaming)
+CHUNK_FIRST_MAX_CHARS = 160
+# Sentence ends: Latin punctuation plus the Ethiopic full stop / question mark
+SENTENCE_END = re.compile(r"(?<=[.!?።፧])\s+")
+# "Studio" post-process: EBU R128 loudness + light compression, re-encoded to VBR MP3.
+# Part of every TTS cache key, so changing it never serves audio processed the old way.
+POST_PROCESS_FILTER = f"loudnorm=I=-16:TP=-1.5:LRA=11,{VOICE_COMPRESSOR}"
+# V91: "inline" normalizes while encoding the narration; "measure" only stores its loudness
+# stats; "deferred" stores them for the final mux to apply (see deferred_voice_filter)
+POST_PROCESS_MODES = ("inline", "measure", "deferred")
+POST_PROCESS_CODEC = ("-codec:a", "libmp3lame", "-q:a", "2")
+# V90: normalization for live streams (no look-ahead over the whole file, unlike loudnorm)
+STREAM_NORM_FILTER = "speechnorm=e=6.25:r=0.00001:l=1"
+
+def split_sentences(text: str, max_chars: int = CHUNK_MAX_CHARS, first_max_chars: int = None) -> list:
+    """
+    Splits text on sentence boundaries and packs consecutive sentences into chunks of at
+    most max_chars (a longer sentence is cut at its last comma/space before the limit).
+    first_max_chars: tighter limit for the first chunk only.
+    Every chunk but the last keeps a trailing space, so its closing pause is still voiced.
+    """
+    pieces = []
+    for sentence in SENTENCE_END.split(text.strip()):
+        while True:
+            limit = first_max_chars if first_max_chars and not pieces else max_chars
+            if len(sentence) <= limit:
+                break
+            cut = max(sentence.rfind(", ", 0, limit), sentence.rfind(" ", 0, limit))
+            cut = cut + 1 if cut > 0 else limit
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+
+    chunks, current = [], ""
+    for piece in pieces:
+        limit = first_max_chars if first_max_chars and not chunks else max_chars
+        if current and len(current) + 1 + len(piece) > limit:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return [f"{chunk} " for chunk in chunks[:-1]] + chunks[-1:]
+
+def timing_sidecar(path) -> Path:
+    """Where the speech timing of a narration is stored: <name>.timing.json beside it."""
+    path = Path(path)
+    return path.with_name(f"{path.name}.timing.json")
+
+def load_speech_timing(path) -> dict:
+    """The timing map written next to a narration by TTSEngine (None if there is none)."""
+    try:
+        with open(timing_sidecar(path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _tokens(text: str) -> list:
+    return [t for t in re.split(r"[^\w]+", (text or "").lower()) if t]
+
+def build_speech_timing(text: str, parts: list, duration: float = None) -> dict:
+    """
+    ⏱️ V92: Speech Timing Map
+    parts: [(audio_offset_seconds, boundaries)] per synthesized chunk, in order.
+    Returns {"text", "duration", "words": [...], "sentences": [...]}; every entry has the
+    spoken "text", its character "offset" in `text` (None if it could not be located) and
+    "start"/"end" in seconds on the narration's timeline.
+    """
+    words, cursor = [], 0
+    for audio_offset, boundaries in parts:
+        for b in boundaries:
+            if b.get("type", "WordBoundary") != "WordBoundary" or not b["text"].strip():
+                continue
+            found = text.find(b["text"], cursor)
+            if found >= 0:
+                cursor = found + len(b["text"])
+            words.append({
+                "text": b["text"],
+                "offset": found if found >= 0 else None,
+                "start": round(audio_offset + b["start"], 3),
+                "end": round(audio_offset + b["end"], 3),
+            })
+
+    sentences, start = [], 0
+    for match in list(SENTENCE_END.finditer(text)) + [None]:
+        end = match.start() if match else len(text)
+        inside = [w for w in words if w["offset"] is not None and start <= w["offset"] < end]
+        if inside and text[start:end].strip():
+            sentences.append({
+                "text": text[start:end].strip(),
+                "offset": start + len(text[start:end]) - len(text[start:end].lstrip()),
+                "start": inside[0]["start"],
+                "end": inside[-1]["end"],
+            })
+        start = match.end() if match else end
+    return {"text": text, "duration": duration, "words": words, "sentences": sentences}
+
+def scene_durations(timing: dict, scene_texts: list, total_duration: float = None) -> list:
+    """
+    Scene lengths from the narration timing: every scene starts when its first words are
+    spoken (the first scene at 0) and lasts until the next one starts; the last runs to the
+    end of the narration. None when a scene's text cannot be found in the speech.
+    """
+    spoken = [(t, w["start"]) for w in timing.get("words", []) for t in _tokens(w["text"])]
+    tokens = [t for t, _ in spoken]
+    starts, cursor = [], 0
+    for scene_text in scene_texts:
+        head = _tokens(scene_text)[:4]
+        if not head:
+            return None
+        at = next((j for j in range(cursor, len(tokens) - len(head) + 1) if tokens[j:j + len(head)] == head), None)
+        if at is None:
+            return None
+        starts.append(spoken[at][1])
+        cursor = at + len(head)
+
+    total = total_duration or timing.get("duration") or (timing["words"][-1]["end"] if timing.get("words") else 0)
+    starts[0] = 0.0
+    bounds = starts + [total]
+    durations = [round(bounds[i + 1] - bounds[i], 3) for i in range(len(starts))]
+    return durations if all(d > 0 for d in durations) else None
+
+def _srt_time(seconds: float) -> str:
+    ms = int(round(seconds * 1000))
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+def speech_srt(timing: dict, max_chars: int = 84) -> str:
+    """SRT cues on the real speech timing: one per sentence, long sentences split by words."""
+    cues = []
+    words = timing.get("words", [])
+    for sentence in timing.get("sentences", []):
+        if len(sentence["text"]) <= max_chars:
+            cues.append((sentence["start"], sentence["end"], " ".join(sentence["text"].split())))
+            continue
+        end_offset = sentence["offset"] + len(sentence["text"])
+        groups, group = [], []
+        for w in (w for w in words if w["offset"] is not None and sentence["offset"] <= w["offset"] < end_offset):
+            if group and w["offset"] + len(w["text"]) - group[0]["offset"] > max_chars:
+                groups.append(group)
+                group = []
+            group.append(w)
+        if group:
+            groups.append(group)
+        # Cue text is sliced from the sentence (up to the next cue's first word), keeping punctuation
+        for i, group in enumerate(groups):
+            cut = groups[i + 1][0]["offset"] if i + 1 < len(groups) else end_offset
+            cues.append((group[0]["start"], group[-1]["end"], " ".join(timing["text"][group[0]["offset"]:cut].split())))
+    return "".join(f"{i}\n{_srt_time(start)} --> {_srt_time(end)}\n{text}\n\n" for i, (start, end, text) in enumerate(cues, start=1))
 
 class TTSEngine:
-    def __init__(self, output_dir: str = "assets/audio"):
+    # V88: Edge-TTS requests in flight per process (TTS_CONCURRENCY), shared by every engine
+    _synthesis_slots = asyncio.Semaphore(int(os.environ.get("TTS_CONCURRENCY", 4)))
+    # V89: identical concurrent requests synthesize once; the others wait for the cache entry.
+    # key -> [lock, holders]; an entry is dropped when its last holder/waiter leaves
+    _synthesis_locks = {}
+
+    def __init__(self, output_dir: str = "assets/audio", max_retries: int = 3, backoff: float = 0.5, cache: FileCache = None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # V89: content-addressed TTS cache under a disk budget (TTS_CACHE_MAX_MB, default 512 MB)
+        self.cache = cache or FileCache(
+            self.output_dir.parent / "tts_cache",
+            max_bytes=int(os.environ.get("TTS_CACHE_MAX_MB", 512)) * 1024 * 1024
+        )
+        # V92: timing map of the most recent narration (also saved as <name>.timing.json)
+        self.last_timing = None
+        # Chunk scratch dirs share the render workspaces' root (swept by VideoComposer)
+        self.jobs_dir = self.output_dir.parent / "temp_assets" / "jobs"
         
         # Free Neural Voices from Microsoft Edge
         self.voices = {
@@ -68,48 +248,24 @@ class TTSEngine:
         """
         return ssml
 
-    async def _post_process_audio(self, input_path: Path):
+    async def _store_loudness(self, input_path: Path, mode: str) -> bool:
         """
-        Uses FFmpeg to normalize and compress audio for a 'Studio' feel.
+        V91: post_process="measure"/"deferred" leave the audio untouched (no re-encode) and store
+        its loudness stats in <name>.loudness.json; with "deferred" the final mux normalizes it.
+        ("inline" never gets here: its filter runs in the pass that encodes the narration.)
         """
-        output_path = input_path.with_name(f"processed_{input_path.name}")
-        
-        # FFmpeg filters:
-        # loudnorm: EBU R128 loudness normalization
-        # acompressor: Add some punch/consistency
-        # volume: Final gain adjustment
-        cmd = [
-            "ffmpeg", "-y", "-i", str(input_path),
-            "-af", "loudnorm=I=-16:TP=-1.5:LRA=11,acompressor=threshold=-18dB:ratio=3:attack=5:release=50",
-            "-codec:a", "libmp3lame", "-q:a", "2",
-            str(output_path)
-        ]
-        
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                # Replace original with processed
-                if output_path.exists():
-                    os.replace(output_path, input_path)
-                    return True
-                return False
-            else:
-                print(f"FFmpeg Error: {stderr.decode()}")
-                return False
+            measured = await measure_loudness(str(input_path))
+            measured["deferred"] = mode == "deferred"
+            with open(loudness_sidecar(input_path), "w", encoding="utf-8") as f:
+                json.dump(measured, f)
+            return True
         except Exception as e:
-            print(f"Post-processing failed: {e}")
+            print(f"Loudness measurement failed: {e}")
             return False
 
-    async def generate_speech(self, text: str, lang: str = 'en', gender: str = 'female', tone: str = 'neutral', persona: str = None, filename: str = "narration.mp3"):
-        if not text:
-            return None
-
+    def _voice_settings(self, lang: str = 'en', gender: str = 'female', tone: str = 'neutral', persona: str = None) -> tuple:
+        """(voice, rate, pitch) for a language/gender/tone, or for a persona."""
         # Resolve Persona if provided
         if persona and persona in self.personas:
             p_config = self.personas[persona]
@@ -144,22 +300,374 @@ class TTSEngine:
             # Fast-paced, authoritative, news-style
             rate = "+10%"
             pitch = "+1Hz"
+        return voice, rate, pitch
+
+    def cache_key(self, ssml: str, voice: str, rate: str, pitch: str, post) -> str:
+        """
+        🗃️ V89: TTS Cache Key
+        Digest of everything that shapes the audio: the SSML text, voice, prosody and the
+        post-processing applied (post=None for raw Edge-TTS chunks).
+        """
+        return stable_digest("tts", ssml, voice, rate, pitch, post)
+
+    def _post_settings(self, chunked: bool, mode: str = "inline") -> tuple:
+        return (POST_PROCESS_FILTER, POST_PROCESS_CODEC, "chunked" if chunked else "single", mode)
+
+    def _copy_out(self, cached: Path, output_path: Path) -> Path:
+        """Copies a cache entry to its output name (atomically; the cache keeps its copy)."""
+        tmp = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            shutil.copyfile(cached, tmp)
+            os.replace(tmp, output_path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        return output_path
 
+    async def _chunk_audio(self, ssml: str, voice: str, rate: str, pitch: str, output_path: Path) -> tuple:
+        """
+        (path, boundaries) of the raw audio for one sentence chunk; cached with its word
+        boundaries, so an edited script only re-synthesizes the changed sentences.
+        """
+        key = self.cache_key(ssml, voice, rate, pitch, None)
+        cached, cached_timing = self.cache.get(key, ".mp3"), self.cache.get(key, ".timing.json")
+        if cached and cached_timing:
+            try:
+                boundaries = json.loads(cached_timing.read_text(encoding="utf-8"))
+                return self._copy_out(cached, output_path), boundaries
+            except (OSError, ValueError):
+                pass
+        boundaries = await self._synthesize(ssml, voice, output_path)
+        self.cache.put(key, output_path, ".mp3")
+        self.cache.put_bytes(key, json.dumps(boundaries).encode("utf-8"), ".timing.json")
+        return output_path, boundaries
+
+    def _communicate(self, ssml: str, voice: str):
+        """Edge-TTS request reporting per-word boundaries (edge-tts >= 7 defaults to sentences)."""
+        try:
+            return edge_tts.Communicate(ssml, voice, boundary="WordBoundary")
+        except TypeError:
+            # Older edge-tts always reports word boundaries and has no `boundary` option
+            return edge_tts.Communicate(ssml, voice)
+
+    async def _synthesize(self, ssml: str, voice: str, output_path: Path, post_filter: str = None) -> list:
+        """
+        One Edge-TTS request under the shared concurrency limit, retried with jittered backoff.
+        post_filter: processed while the audio streams in (one ffmpeg, one encode) instead of
+        saving the raw MP3 and re-encoding it afterwards.
+        V92: returns the word/sentence boundary events ({"type", "text", "start", "end"} in
+        seconds from the start of this audio).
+        """
+        tmp = output_path.with_name(f".part_{output_path.name}")
+        for attempt in range(self.max_retries):
+            try:
+                async with self._synthesis_slots:
+                    boundaries = await self._stream_audio(ssml, voice, tmp, post_filter)
+                if tmp.exists() and tmp.stat().st_size > 0:
+                    os.replace(tmp, output_path)
+                    return boundaries
+                raise RuntimeError("no audio received")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"TTS attempt {attempt+1} failed for {output_path.name}: {e!r}")
+                if attempt == self.max_retries - 1:
+                    raise
+                await asyncio.sleep(self.backoff * (2 ** attempt) * random.uniform(0.8, 1.2))
+            finally:
+                if tmp.exists():
+                    tmp.unlink()
+
+    async def _stream_audio(self, ssml: str, voice: str, output_path: Path, post_filter: str = None) -> list:
+        """Writes the Edge-TTS audio stream to output_path (through ffmpeg's filter if given), collecting boundaries."""
+        process = None
+        if post_filter:
+            process = await asyncio.create_subprocess_exec(
+                FFMPEG, "-hide_banner", "-loglevel", "error", "-nostdin", "-y",
+                "-f", "mp3", "-i", "pipe:0", "-af", post_filter, *POST_PROCESS_CODEC, "-f", "mp3", str(output_path),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
+            )
+        sink = None if process else open(output_path, "wb")
+        boundaries = []
+        try:
+            async for chunk in self._communicate(ssml, voice).stream():
+                if chunk["type"] == "audio":
+                    if process:
+                        process.stdin.write(chunk["data"])
+                        await process.stdin.drain()
+                    else:
+                        sink.write(chunk["data"])
+                elif chunk["type"] in ("WordBoundary", "SentenceBoundary"):
+                    # Offsets and durations come in 100 ns ticks
+                    boundaries.append({
+                        "type": chunk["type"],
+                        "text": chunk["text"],
+                        "start": chunk["offset"] / 1e7,
+                        "end": (chunk["offset"] + chunk["duration"]) / 1e7,
+                    })
+            if sink:
+                sink.close()
+            if process:
+                process.stdin.close()
+                stderr = await process.stderr.read()
+                if await process.wait() != 0:
+                    raise FFmpegError(f"ffmpeg exited with {process.returncode}: {stderr.decode(errors='replace')[-800:]}")
+            return boundaries
+        finally:
+            if sink:
+                sink.close()
+            if process and process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    async def _timing_for(self, text: str, pieces: list, output_path: Path) -> dict:
+        """Timing map for a narration from its chunks' (path, boundaries), in order."""
+        durations = await asyncio.gather(*(probe_media(str(path)) for path, _ in pieces)) if len(pieces) > 1 else []
+        offsets = [0.0]
+        for info in durations[:-1]:
+            offsets.append(offsets[-1] + float(info["format"].get("duration") or 0))
+        total = float((await probe_media(str(output_path)))["format"].get("duration") or 0) or None
+        return build_speech_timing(text, [(offset, boundaries) for offset, (_, boundaries) in zip(offsets, pieces)], total)
+
+    async def synthesize_chunks(self, text: str, voice: str, rate: str, pitch: str, workdir: Path):
+        """
+        🧩 V88: Sentence-Chunked Synthesis
+        Async generator: every sentence chunk is requested concurrently (TTS_CONCURRENCY at
+        a time, each chunk retried on its own) and (index, total, path, boundaries) is yielded
+        IN ORDER as soon as a chunk and all chunks before it are ready, so playback can start
+        with the first sentence. Chunks are raw Edge-TTS MP3 (no loudness processing yet).
+        """
+        chunks = split_sentences(text, first_max_chars=CHUNK_FIRST_MAX_CHARS)
+        workdir = Path(workdir)
+        tasks = [
+            asyncio.create_task(self._chunk_audio(self._humanize_ssml(chunk, voice, rate, pitch), voice, rate, pitch, workdir / f"chunk_{i:04d}.mp3"))
+            for i, chunk in enumerate(chunks)
+        ]
+        try:
+            for i, task in enumerate(tasks):
+                path, boundaries = await task
+                yield i, len(tasks), path, boundaries
+        finally:
+            # A failed chunk or an abandoned stream must not leave requests running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def generate_speech(self, text: str, lang: str = 'en', gender: str = 'female', tone: str = 'neutral', persona: str = None, filename: str = None, chunked: bool = None, on_chunk=None, post_process: str = "inline"):
+        """
+        V88: chunked=True (default for scripts over CHUNK_THRESHOLD_CHARS) synthesizes sentence
+        chunks concurrently, joins them with the concat demuxer and runs the loudness
+        post-process ONCE over the joined narration, so every sentence gets the same gain.
+        on_chunk(index, total, path): sync or async callback per raw chunk, in order, as soon
+        as it is ready (a cached narration arrives as one ready chunk).
+        V89: the processed narration (and every raw chunk) is cached by content; a repeat
+        request is a file copy. filename defaults to a unique narration_<id>.mp3.
+        V91: post_process="inline" filters the Edge-TTS stream (or the chunk join) in the same
+        ffmpeg pass that encodes it; "measure"/"deferred" keep Edge-TTS's own MP3 and write
+        <name>.loudness.json beside it, so a forge render normalizes it in its one AAC encode.
+        V92: the word/sentence timing reported by Edge-TTS is saved as <name>.timing.json
+        (see build_speech_timing) and kept in self.last_timing.
+        """
+        if not text:
+            return None
+        if post_process not in POST_PROCESS_MODES:
+            raise ValueError(f"post_process must be one of {POST_PROCESS_MODES}")
+
+        voice, rate, pitch = self._voice_settings(lang, gender, tone, persona)
+        if chunked is None:
+            chunked = len(text) > CHUNK_THRESHOLD_CHARS
+        output_path = self.output_dir / (filename or unique_name("narration", ".mp3"))
         ssml = self._humanize_ssml(text, voice, rate, pitch)
+        key = self.cache_key(ssml, voice, rate, pitch, self._post_settings(chunked, post_process))
 
         try:
-            output_path = self.output_dir / filename
-            communicate = edge_tts.Communicate(ssml, voice)
-            await communicate.save(str(output_path))
-            
-            # Post-process for that "Model" voice quality
-            await self._post_process_audio(output_path)
-            
+            async with self._synthesis_lock(key):
+                cached = self.cache.get(key, ".mp3")
+                cached_stats = self.cache.get(key, ".loudness.json") if post_process != "inline" else None
+                if cached and (post_process == "inline" or cached_stats):
+                    print(f"♻️ TTS cache hit: {key[:12]}")
+                    self._copy_out(cached, output_path)
+                    self._restore_timing(key, output_path)
+                    if cached_stats:
+                        self._copy_out(cached_stats, loudness_sidecar(output_path))
+                    if on_chunk:
+                        result = on_chunk(0, 1, output_path)
+                        if asyncio.iscoroutine(result):
+                            await result
+                    return str(output_path)
+
+                with RenderWorkspace(self.jobs_dir, "tts") as workspace:
+                    speech = workspace.file(output_path.name)
+                    if not chunked:
+                        boundaries = await self._synthesize(ssml, voice, speech, POST_PROCESS_FILTER if post_process == "inline" else None)
+                        pieces = [(speech, boundaries)]
+                    else:
+                        pieces = []
+                        async for index, total, path, boundaries in self.synthesize_chunks(text, voice, rate, pitch, workspace.dir):
+                            pieces.append((path, boundaries))
+                            if on_chunk:
+                                result = on_chunk(index, total, path)
+                                if asyncio.iscoroutine(result):
+                                    await result
+                        await self._join_chunks(pieces, speech, workspace.dir, post_process)
+                        print(f"🧩 Synthesized {len(pieces)} chunks -> {output_path.name}")
+
+                    # "Model" voice quality: inline is already processed; the others only measure
+                    processed = post_process == "inline" or await self._store_loudness(speech, post_process)
+                    await self._save_timing(text, pieces, speech, workspace, output_path, key if processed else None)
+                    if processed:
+                        self.cache.put(key, speech, ".mp3")
+                        if post_process != "inline":
+                            self.cache.put(key, loudness_sidecar(speech), ".loudness.json")
+                            workspace.publish(loudness_sidecar(speech), loudness_sidecar(output_path))
+                    workspace.publish(speech, output_path)
+            print(f"🗃️ TTS cache: {self.cache.stats()}")
             return str(output_path)
         except Exception as e:
             print(f"Edge-TTS Error: {e}")
             return None
 
+    async def _join_chunks(self, pieces: list, speech: Path, workdir: Path, post_process: str = "inline"):
+        """Joins raw (path, boundaries) chunks; with post_process="inline" the join and the filter are one ffmpeg pass."""
+        extra_args = ["-af", POST_PROCESS_FILTER, *POST_PROCESS_CODEC] if post_process == "inline" else None
+        await concat_files([path for path, _ in pieces], str(speech), workdir, extra_args)
+
+    def _restore_timing(self, key: str, output_path: Path):
+        """Copies a cached timing map beside a cache hit (a narration may have none)."""
+        cached_timing = self.cache.get(key, ".timing.json")
+        if cached_timing:
+            self._copy_out(cached_timing, timing_sidecar(output_path))
+        self.last_timing = load_speech_timing(output_path) if cached_timing else None
+
+    @asynccontextmanager
+    async def _synthesis_lock(self, key: str):
+        """Per-cache-key lock shared by every engine; the dict only holds keys in use."""
+        entry = self._synthesis_locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._synthesis_locks[key]
+
+    async def _save_timing(self, text: str, pieces: list, speech: Path, workspace: RenderWorkspace, output_path: Path, key: str = None):
+        """
+        Writes the narration's timing map beside it (and into the cache under `key`).
+        Timing is optional: if it cannot be built (e.g. ffprobe fails) the narration is still
+        delivered, without a sidecar, and scenes keep their storyboard durations.
+        """
+        try:
+            self.last_timing = await self._timing_for(text, pieces, speech)
+        except Exception as e:
+            print(f"⚠️ Speech timing unavailable for {output_path.name}: {e}")
+            self.last_timing = None
+            return
+        sidecar = timing_sidecar(speech)
+        with open(sidecar, "w", encoding="utf-8") as f:
+            json.dump(self.last_timing, f, ensure_ascii=False)
+        if key:
+            self.cache.put(key, sidecar, ".timing.json")
+        workspace.publish(sidecar, timing_sidecar(output_path))
+
+    async def stream_speech(self, text: str, lang: str = 'en', gender: str = 'female', tone: str = 'neutral', persona: str = None, filename: str = None, normalize: bool = False, block_size: int = 16384):
+        """
+        📡 V90: Streaming Narration
+        Async generator of MP3 bytes for a StreamingResponse: each sentence chunk is forwarded
+        the moment it (and every chunk before it) is synthesized, starting with a short first
+        chunk. normalize=True pipes the stream through ONE ffmpeg speechnorm process
+        (streaming-compatible, gapless). Once the stream ends, the final narration (lossless
+        join + full loudnorm post-process) is written to `filename` and cached like
+        generate_speech, so replays and later renders reuse it. Empty text streams nothing.
+        """
+        if not text or not text.strip():
+            return
+        voice, rate, pitch = self._voice_settings(lang, gender, tone, persona)
+        output_path = self.output_dir / (filename or unique_name("narration", ".mp3"))
+        ssml = self._humanize_ssml(text, voice, rate, pitch)
+        key = self.cache_key(ssml, voice, rate, pitch, self._post_settings(True))
+
+        # Same lock as generate_speech (same cache key): a concurrent identical stream waits
+        # for this one's cache entry instead of synthesizing the text again
+        async with self._synthesis_lock(key):
+            cached = self.cache.get(key, ".mp3")
+            if cached:
+                print(f"♻️ TTS cache hit: {key[:12]}")
+                self._copy_out(cached, output_path)
+                self._restore_timing(key, output_path)
+                async for block in self._file_blocks(output_path, block_size):
+                    yield block
+                return
+
+            with RenderWorkspace(self.jobs_dir, "tts") as workspace:
+                pieces = []
+                chunks = self.synthesize_chunks(text, voice, rate, pitch, workspace.dir)
+                stream = self._normalized_stream(chunks, pieces, block_size) if normalize else self._raw_stream(chunks, pieces, block_size)
+                async with aclosing(stream):
+                    async for block in stream:
+                        yield block
+
+                speech = workspace.file(output_path.name)
+                await self._join_chunks(pieces, speech, workspace.dir)
+                await self._save_timing(text, pieces, speech, workspace, output_path, key)
+                self.cache.put(key, speech, ".mp3")
+                workspace.publish(speech, output_path)
+            print(f"📡 Streamed {len(pieces)} chunks -> {output_path.name}")
+
+    async def _file_blocks(self, path: Path, block_size: int):
+        with open(path, "rb") as f:
+            while block := f.read(block_size):
+                yield block
+
+    async def _raw_stream(self, chunks, pieces: list, block_size: int):
+        """Edge-TTS MP3 chunks back to back (MP3 frames concatenate into one valid stream)."""
+        async with aclosing(chunks):
+            async for index, total, path, boundaries in chunks:
+                pieces.append((path, boundaries))
+                async for block in self._file_blocks(path, block_size):
+                    yield block
+
+    async def _normalized_stream(self, chunks, pieces: list, block_size: int):
+        """The chunks fed through one ffmpeg speechnorm process, re-encoded as they flow."""
+        process = await asyncio.create_subprocess_exec(
+            FFMPEG, "-hide_banner", "-loglevel", "error", "-nostdin",
+            "-probesize", "32", "-analyzeduration", "0", "-f", "mp3", "-i", "pipe:0",
+            "-af", STREAM_NORM_FILTER, *POST_PROCESS_CODEC, "-flush_packets", "1", "-f", "mp3", "pipe:1",
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+        async def feed():
+            try:
+                async with aclosing(chunks):
+                    async for index, total, path, boundaries in chunks:
+                        pieces.append((path, boundaries))
+                        process.stdin.write(path.read_bytes())
+                        await process.stdin.drain()
+            finally:
+                process.stdin.close()
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while block := await process.stdout.read(block_size):
+                yield block
+            # Surfaces a chunk that failed every retry
+            await feeder
+            if await process.wait() != 0:
+                raise RuntimeError(f"speechnorm stream exited with {process.returncode}")
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+            await asyncio.gather(feeder, return_exceptions=True)
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
 if __name__ == "__main__":
     # Test
     # engine = TTSEngine()
@@ -1,256 +1,802 @@
 import os
-from moviepy import VideoFileClip, ImageClip, concatenate_videoclips, CompositeVideoClip
-import requests
+import shutil
+import time
 from pathlib import Path
 import asyncio
+from bisect import bisect_left
+from processor.ffmpeg_tools import probe_media, probe_gop_index, parse_rate, run_ffmpeg, concat_files
+from processor.filtergraph import FilterGraphRenderer, mux_narration
+from processor.music_library import MusicLibrary
+from processor.parallel_render import ParallelRenderer
+from processor.render_cache import RenderCache
+from processor.file_cache import FileCache, stable_seed
+from processor.image_prefetch import ImagePrefetcher
+from processor.still_scene import StillSceneEncoder
+from processor.render_profiles import RENDER_PROFILES, get_render_profile, canvas_size
+from processor.render_progress import RenderStats
+from processor.render_workspace import RenderWorkspace
+from processor.render_scheduler import RenderScheduler
+from processor.thumbnail_extractor import ThumbnailExtractor
+from processor.worker_pool import WorkerPool
+from processor import worker_tasks
+
+# Smart render: ranges whose inner GOP span is shorter than this are simply re-encoded
+SMART_MIN_COPY_SECONDS = 1.0
+# Smart render: H.264 profiles (and pixel formats) libx264 can match for the edge re-encodes
+SMART_X264_PROFILES = {"Constrained Baseline": "baseline", "Baseline": "baseline", "Main": "main", "High": "high"}
+SMART_PIX_FMTS = ("yuv420p", "yuvj420p")
+# Multi-output export: master resolutions rendered from one decode
+MULTI_OUTPUT_HEIGHTS = (1080, 720, 480)
+# Thumbnail candidates: at most this many editing-guide cuts are sampled
+THUMBNAIL_GUIDE_RANGES = 8
+# Forge render backends (render_forge_video's render_mode)
+FORGE_RENDER_MODES = ("moviepy", "filtergraph", "parallel")
 
 class VideoComposer:
+    # V82: named render profiles ("final", "draft"); see processor/render_profiles.py
+    RENDER_PROFILES = RENDER_PROFILES
+    # V84: one scheduler per process, shared by every composer (RENDER_CONCURRENCY slots)
+    scheduler = RenderScheduler()
+
     def __init__(self, output_dir: Path):
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.assets_dir = output_dir.parent / "temp_assets"
         self.assets_dir.mkdir(parents=True, exist_ok=True)
+        # V84: per-job scratch workspaces; leftovers of a crashed process are swept here
+        self.jobs_dir = self.assets_dir / "jobs"
+        RenderWorkspace.sweep(self.jobs_dir)
+        # Whole renders and clip intermediates under a disk budget (RENDER_CACHE_MAX_MB, default 4 GB)
+        self.render_cache = RenderCache(
+            output_dir.parent / "render_cache",
+            max_bytes=int(os.environ.get("RENDER_CACHE_MAX_MB", 4096)) * 1024 * 1024
+        )
+        # V80: persistent AI image cache under a disk budget (IMAGE_CACHE_MAX_MB, default 1 GB)
+        self.image_cache = FileCache(
+            output_dir.parent / "image_cache",
+            max_bytes=int(os.environ.get("IMAGE_CACHE_MAX_MB", 1024)) * 1024 * 1024
+        )
+        # V86: normalized background-music library (assets/music/<genre>/, legacy assets/audio/bg_*)
+        self.music_library = MusicLibrary(
+            output_dir.parent / "music",
+            FileCache(output_dir.parent / "music_cache"),
+            legacy_dir=output_dir.parent / "audio"
+        )
+        # V87: source-frame thumbnail candidates (cached JPEGs), published to assets/thumbnails
+        self.thumbnails_dir = output_dir.parent / "thumbnails"
+        self.thumbnail_extractor = ThumbnailExtractor(
+            FileCache(output_dir.parent / "thumbnail_cache", max_bytes=int(os.environ.get("THUMBNAIL_CACHE_MAX_MB", 256)) * 1024 * 1024)
+        )
+        # V83: render_stats of the most recent render (phases, frames, encode fps)
+        self.last_render_stats = None
 
-    async def download_image(self, url: str, filename: str, max_retries: int = 3) -> Path:
-        """Downloads an image with exponential backoff and seed jiggling on failure."""
-        target_path = self.assets_dir / filename
-        if target_path.exists() and target_path.stat().st_size > 0:
-            return target_path
-            
-        loop = asyncio.get_event_loop()
-        
-        for attempt in range(max_retries):
-            # Jiggle seed if retrying
-            current_url = url
-            if attempt > 0:
-                import random
-                # Replace existing seed or append new one
-                if "seed=" in url:
-                    import re
-                    current_url = re.sub(r"seed=\d+", f"seed={random.randint(1, 9999)}", url)
+    async def download_image(self, url: str, max_retries: int = 3) -> Path:
+        """Downloads one image into the image cache (short jittered backoff, seed jiggling on retry)."""
+        async with ImagePrefetcher(self.image_cache, max_retries=max_retries) as prefetcher:
+            target_path = await prefetcher.fetch(url)
+        if target_path is None:
+            raise Exception(f"Failed to download image after {max_retries} attempts for: {url}")
+        return target_path
+
+    async def _emit_status(self, status_callback, msg, progress, **extra):
+        """Calls sync or async status callbacks; extra fields are only forwarded when present."""
+        if status_callback:
+            try:
+                if asyncio.iscoroutinefunction(status_callback):
+                    await status_callback(msg, progress, **extra)
                 else:
-                    current_url += f"&seed={random.randint(1, 9999)}"
+                    status_callback(msg, progress, **extra)
+            except Exception as e:
+                print(f"Callback error: {e}")
 
-            def _download():
-                try:
-                    response = requests.get(current_url, stream=True, timeout=60)
-                    if response.status_code == 200:
-                        with open(target_path, "wb") as f:
-                            for chunk in response.iter_content(1024):
-                                f.write(chunk)
-                        if target_path.exists() and target_path.stat().st_size > 0:
-                            return target_path
-                    return None # Signal failure
-                except Exception as e:
-                    print(f"Download attempt {attempt+1} failed: {e}")
-                    return None
-
-            result = await loop.run_in_executor(None, _download)
-            if result:
-                return target_path
-                
-            # Wait with backoff
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 2
-                print(f"Retrying download in {wait_time}s... (Attempt {attempt+2})")
-                await asyncio.sleep(wait_time)
-
-        raise Exception(f"Failed to download image after {max_retries} attempts for: {url}")
-
-    async def compose_condensed_video(self, source_video_path: str, editing_guide: list, output_filename: str, status_callback=None):
-        """
-        Automates the video editing process:
-        1. Cuts clips from the source video based on the roadmap.
-        2. Overlays AI images for visual prompts.
-        3. Collates everything into a final file.
-        """
-        if status_callback: await status_callback("🎞️ Loading source video...", 75)
-        
-        video = VideoFileClip(source_video_path)
-        clips = []
-        
-        for i, item in enumerate(editing_guide):
+    def _frame_reporter(self, status_callback, stats: RenderStats, label: str, start: int, span: int):
+        """V83: async reporter turning a stats snapshot into a status update with a `render` extra."""
+        async def report(snapshot: dict = None):
+            snapshot = snapshot or stats.snapshot()
+            total = snapshot["total_frames"]
+            fraction = min(1.0, snapshot["frame"] / total) if total else 0.0
+            eta = f" | ETA {snapshot['eta']:.0f}s" if snapshot["eta"] is not None else ""
+            await self._emit_status(
+                status_callback,
+                f"{label} {snapshot['frame']}/{total or '?'} frames @ {snapshot['fps']:.0f} fps{eta}",
+                start + int(fraction * span),
+                render=snapshot
+            )
+        return report
+
+    def _worker_progress(self, stats: RenderStats, report):
+        """V94: on_progress for MoviePy worker tasks (frame snapshots -> parent stats + status)."""
+        async def on_progress(snapshot: dict):
+            stats.update(frame=snapshot["frame"], total_frames=snapshot["total_frames"] or stats.total_frames, fps=snapshot["fps"])
+            await report()
+        return on_progress
+
+    def _finish_stats(self, stats: RenderStats):
+        self.last_render_stats = stats.as_dict()
+        print(f"📈 Render stats: {self.last_render_stats}")
+
+    def _guide_ranges(self, editing_guide: list, source_duration: float = None) -> list:
+        """Resolves editing-guide entries into (start_sec, end_sec) cut ranges."""
+        ranges = []
+        for item in editing_guide:
+            # V75: Prefer float seconds (frame accurate) over the MM:SS display strings
+            if "start_sec" in item and "end_sec" in item:
+                start_sec = float(item["start_sec"])
+                end_sec = float(item["end_sec"])
             # Precision V40: Use timestamp_start/end if available, else fallback to MM:SS
-            if "timestamp_start" in item and "timestamp_end" in item:
+            elif "timestamp_start" in item and "timestamp_end" in item:
                 # Format: MM:SS
                 m1, s1 = map(int, item["timestamp_start"].split(":"))
                 m2, s2 = map(int, item["timestamp_end"].split(":"))
                 start_sec = m1 * 60 + s1
                 end_sec = m2 * 60 + s2
-            else:
+            elif "timestamp" in item:
                 start_str = item["timestamp"]
                 # Convert MM:SS to seconds
                 m, s = map(int, start_str.split(":"))
                 start_sec = m * 60 + s
                 duration = 5 
-                end_sec = min(start_sec + duration, video.duration)
-            
-            if status_callback:
-                progress = 75 + int((i / len(editing_guide)) * 20)
-                await status_callback("🎞️ Compiling final video segments...", progress)
-            print(f"🎬 Processing clip {i+1}/{len(editing_guide)}...")
-
-            # Subclip from original
-            if hasattr(video, "subclipped"):
-                subclip = video.subclipped(start_sec, end_sec)
+                end_sec = start_sec + duration
             else:
-                subclip = video.subclip(start_sec, end_sec)
-            
-            # If there's a visual prompt, download and overlay an image as a B-roll
-            # For simplicity in V22, we use the image_url if provided in a later step 
-            # or generate on the fly for specific moments.
-            # Here we just prepare the concatenation.
-            clips.append(subclip)
+                continue
+            if source_duration:
+                end_sec = min(end_sec, source_duration)
+            if end_sec > start_sec:
+                ranges.append((start_sec, end_sec))
+        return ranges
 
-        if status_callback: await status_callback("🏗️ Rendering final composite...", 95)
-        
-        final_video = concatenate_videoclips(clips, method="compose")
+    async def compose_condensed_video(self, source_video_path: str, editing_guide: list, output_filename: str, status_callback=None, render_mode: str = "auto", use_cache: bool = True, profile: str = "final"):
+        """
+        Automates the video editing process:
+        1. Cuts clips from the source video based on the roadmap.
+        2. Overlays AI images for visual prompts.
+        3. Collates everything into a final file.
+        V75: render_mode="smart" stream-copies whole GOPs and only re-encodes cut edges;
+        "auto" tries smart first and falls back to the parallel encode ("moviepy" stays selectable).
+        V76: render_mode="filtergraph" renders through one native ffmpeg filter graph.
+        V77: render_mode="parallel" encodes every guide range concurrently (one ffmpeg per core).
+        V78: identical (source, cuts, mode) renders come straight from the render cache, and
+        the smart render's edge re-encodes and the parallel mode (also "auto"'s fallback and
+        downscaled profile) reuse cached clips, so only edited cuts are re-encoded.
+        V82: profile="draft" renders a fast 360p preview; "final" keeps the full quality.
+        V83: frame-level progress goes to status_callback (render=...) and per-phase timings
+        end up in self.last_render_stats.
+        V84: renders run in a scheduler slot inside a private workspace and the output is
+        published atomically, so concurrent renders never share temp or partial files.
+        """
         target_path = self.output_dir / output_filename
+        prof = get_render_profile(profile)
+        if prof["height"] and render_mode in ("auto", "smart"):
+            # Stream copy keeps the source resolution, so a downscaled preview needs a real encode
+            if render_mode == "smart":
+                raise ValueError("smart render stream-copies the source; it cannot produce a downscaled profile")
+            render_mode = "parallel"
+        stats = RenderStats(render_mode, profile if isinstance(profile, str) else "custom")
+
+        source_digest, render_key = None, None
+        with RenderWorkspace(self.jobs_dir, "condensed") as workspace:
+            scratch_path = workspace.file(target_path.name)
+            if use_cache:
+                try:
+                    source_digest = await self.render_cache.source_digest(source_video_path)
+                    render_key = self.render_cache.render_key(source_digest, self._guide_ranges(editing_guide), render_mode, prof)
+                    cached = self.render_cache.get(render_key, ".mp4")
+                    if cached:
+                        print(f"♻️ Render cache hit: {render_key[:12]}")
+                        stats.backend = "cache"
+                        with stats.phase("mux"):
+                            shutil.copyfile(cached, scratch_path)
+                            workspace.publish(scratch_path, target_path)
+                        await self._emit_status(status_callback, "♻️ Reusing cached render...", 99)
+                        self._finish_stats(stats)
+                        return str(target_path)
+                except Exception as e:
+                    print(f"⚠️ Render cache unavailable: {e}")
+
+            queued_at = time.perf_counter()
+            async with self.scheduler.slot(f"render {output_filename}") as threads:
+                stats.phases["queue"] = round(time.perf_counter() - queued_at, 3)
+                workspace.threads = threads
+                await self._render_condensed(source_video_path, editing_guide, scratch_path, workspace, status_callback, render_mode, source_digest, prof, stats)
+
+            if render_key:
+                try:
+                    self.render_cache.put(render_key, scratch_path, ".mp4")
+                except Exception as e:
+                    print(f"⚠️ Could not cache render: {e}")
+            workspace.publish(scratch_path, target_path)
+        self._finish_stats(stats)
+        return str(target_path)
+
+    async def export_multi_output(self, source_video_path: str, editing_guide: list, output_stem: str, shorts_windows: list = None, heights: tuple = MULTI_OUTPUT_HEIGHTS, short_formats: tuple = ("vertical",), status_callback=None, profile: str = "final") -> dict:
+        """
+        🎬 V85: Decode-Once Multi-Output Export
+        The condensed master at several resolutions plus center-cropped Shorts for the top
+        highlight windows (StudioEngine.shorts_clip_windows), all in ONE ffmpeg pass: each
+        span is decoded once and split to every output that uses it.
+        Heights above the source are skipped (no upscaled masters).
+        Returns {"masters": {"720p": path, ...}, "shorts": [{"start", "end", "format", "path"}]}.
+        """
+        prof = get_render_profile(profile)
+        stats = RenderStats("multi", profile if isinstance(profile, str) else "custom")
+        await self._emit_status(status_callback, "🎞️ Planning multi-output export...", 75)
+        with stats.phase("load"):
+            info = await probe_media(source_video_path)
+        if not info["video"]:
+            raise ValueError("multi-output export needs a video stream")
+        source_duration = float(info["format"].get("duration") or 0) or None
+        ranges = self._guide_ranges(editing_guide, source_duration)
+        source_height = int(info["video"].get("height") or 0)
+        heights = tuple(h for h in heights if not source_height or h <= source_height) or (source_height,)
+
+        windows = []
+        for window in shorts_windows or []:
+            start, end = (window["start"], window["end"]) if isinstance(window, dict) else window
+            end = min(float(end), source_duration) if source_duration else float(end)
+            if end > float(start):
+                windows.append((float(start), end))
+        if not ranges and not windows:
+            raise ValueError("nothing to export: no usable cut ranges or highlight windows")
+
+        fps = prof["fps"] or parse_rate(info["video"].get("avg_frame_rate") or info["video"].get("r_frame_rate"))
+        total = max([sum(e - s for s, e in ranges)] + [e - s for s, e in windows])
+        stats.update(total_frames=int(round(total * fps)))
+        report = self._frame_reporter(status_callback, stats, "🏗️ Exporting all outputs...", 75, 24)
+        async def on_progress(fraction, snapshot):
+            stats.update(frame=snapshot["frame"], fps=snapshot["fps"])
+            await report()
+
+        labels = [f"{h}p" for h in heights] if ranges else []
+        labels += [f"short{w + 1}_{fmt}" for w in range(len(windows)) for fmt in short_formats]
+        with RenderWorkspace(self.jobs_dir, "multi") as workspace:
+            queued_at = time.perf_counter()
+            async with self.scheduler.slot(f"export {output_stem}") as threads:
+                stats.phases["queue"] = round(time.perf_counter() - queued_at, 3)
+                renderer = FilterGraphRenderer(threads=threads)
+                with stats.phase("encode"):
+                    rendered = await renderer.render_multi_output(
+                        source_video_path, ranges, {label: workspace.file(f"{output_stem}_{label}.mp4") for label in labels},
+                        heights=heights if ranges else (), windows=windows, short_formats=short_formats,
+                        has_audio=info["audio"] is not None, on_progress=on_progress, profile=prof
+                    )
+            published = {label: str(workspace.publish(Path(path), self.output_dir / Path(path).name)) for label, path in rendered.items()}
+        self._finish_stats(stats)
+
+        return {
+            "masters": {f"{h}p": published[f"{h}p"] for h in heights if f"{h}p" in published},
+            "shorts": [
+                {"start": start, "end": end, "format": fmt, "path": published[f"short{w + 1}_{fmt}"]}
+                for w, (start, end) in enumerate(windows) for fmt in short_formats
+            ],
+        }
+
+    async def extract_thumbnails(self, source_video_path: str, editing_guide: list, output_stem: str, shorts_windows: list = None, count: int = 3) -> list:
+        """
+        🖼️ V87: best `count` source frames around the highlights (Shorts windows first, then
+        the editing-guide cuts), scored and cached by ThumbnailExtractor and published to
+        assets/thumbnails as <output_stem>_thumb<N>.jpg.
+        Returns [{"time", "score", "sharpness", "brightness", "path"}] best first.
+        """
+        timestamps = []
+        for window in shorts_windows or []:
+            start, end = (window["start"], window["end"]) if isinstance(window, dict) else window
+            # Just past the hook and the middle of the window
+            timestamps += [float(start) + min(1.0, (float(end) - float(start)) / 4), (float(start) + float(end)) / 2]
+        for start, end in self._guide_ranges(editing_guide or [])[:THUMBNAIL_GUIDE_RANGES]:
+            timestamps.append((start + end) / 2)
+        if not timestamps:
+            return []
+
+        source_digest = await self.render_cache.source_digest(source_video_path)
+        with RenderWorkspace(self.jobs_dir, "thumbs") as workspace:
+            async with self.scheduler.slot(f"thumbnails {output_stem}"):
+                candidates = await self.thumbnail_extractor.extract(source_video_path, timestamps, workspace.dir, count, source_digest)
+            published = []
+            for rank, candidate in enumerate(candidates, start=1):
+                scratch = workspace.file(f"{output_stem}_thumb{rank}.jpg")
+                shutil.copyfile(candidate["path"], scratch)
+                target = workspace.publish(scratch, self.thumbnails_dir / scratch.name)
+                published.append({**candidate, "path": str(target)})
+        return published
+
+    async def _render_condensed(self, source_video_path: str, editing_guide: list, target_path: Path, workspace: RenderWorkspace, status_callback, render_mode: str, source_digest: str = None, profile: dict = None, stats: RenderStats = None) -> str:
+        profile = get_render_profile(profile)
+        stats = stats or RenderStats(render_mode)
+        if render_mode == "filtergraph":
+            return await self._render_condensed_filtergraph(source_video_path, editing_guide, target_path, workspace, status_callback, profile, stats)
+        if render_mode == "parallel":
+            return await self._render_condensed_parallel(source_video_path, editing_guide, target_path, workspace, status_callback, source_digest, profile, stats)
         
-        # Rendering is CPU intensive, run in executor
-        loop = asyncio.get_event_loop()
-        def _render():
-            final_video.write_videofile(str(target_path), codec="libx264", audio_codec="aac", temp_audiofile="temp-audio.m4a", remove_temp=True)
-            return target_path
-            
-        result_path = await loop.run_in_executor(None, _render)
-        
-        # Cleanup
-        video.close()
-        final_video.close()
+        if render_mode in ("auto", "smart"):
+            try:
+                stats.backend = "smart"
+                return await self._smart_render(source_video_path, editing_guide, target_path, workspace, status_callback, stats, source_digest)
+            except Exception as e:
+                if render_mode == "smart":
+                    raise
+                print(f"⚠️ Smart render unavailable, falling back to a parallel encode: {e}")
+                stats.reset("parallel", keep=("queue",))
+                return await self._render_condensed_parallel(source_video_path, editing_guide, target_path, workspace, status_callback, source_digest, profile, stats)
+
+        stats.backend = "moviepy"
+        await self._emit_status(status_callback, "🎞️ Loading source video...", 75)
+        with stats.phase("load"):
+            info = await probe_media(source_video_path)
+        source_duration = float(info["format"].get("duration") or 0) or None
+        ranges = self._guide_ranges(editing_guide, source_duration)
+        if not ranges:
+            raise ValueError("editing guide has no usable cut ranges")
+        fps = profile["fps"] or parse_rate((info["video"] or {}).get("avg_frame_rate") or (info["video"] or {}).get("r_frame_rate"))
+        stats.update(total_frames=int(round(sum(e - s for s, e in ranges) * fps)))
+
+        await self._emit_status(status_callback, "🏗️ Rendering final composite...", 95)
+        # V94: load, cut and encode all happen in a worker process (never on the API's GIL)
+        report = self._frame_reporter(status_callback, stats, "🏗️ Rendering final composite...", 95, 4)
+        with stats.phase("encode"):
+            result = await WorkerPool.shared().run_isolated(
+                worker_tasks.render_condensed_moviepy,
+                source_video_path, ranges, str(target_path), str(workspace.file("temp-audio.m4a")),
+                profile, workspace.threads,
+                on_progress=self._worker_progress(stats, report)
+            )
+        for name, seconds in result["phases"].items():
+            stats.phases[name] = round(stats.phases.get(name, 0.0) + seconds, 3)
         
-        return str(result_path)
+        return str(result["path"])
+
+    async def _render_condensed_filtergraph(self, source_video_path: str, editing_guide: list, target_path: Path, workspace: RenderWorkspace, status_callback=None, profile: dict = None, stats: RenderStats = None):
+        """V76: trim/concat of every guide range inside a single ffmpeg process."""
+        profile = get_render_profile(profile)
+        stats = stats or RenderStats("filtergraph")
+        await self._emit_status(status_callback, "🎞️ Compiling native render graph...", 75)
+        with stats.phase("load"):
+            info = await probe_media(source_video_path)
+        source_duration = float(info["format"].get("duration") or 0) or None
+        ranges = self._guide_ranges(editing_guide, source_duration)
+        if not ranges:
+            raise ValueError("editing guide has no usable cut ranges")
+        fps = profile["fps"] or parse_rate((info["video"] or {}).get("avg_frame_rate") or (info["video"] or {}).get("r_frame_rate"))
+        stats.update(total_frames=int(round(sum(e - s for s, e in ranges) * fps)))
+
+        report = self._frame_reporter(status_callback, stats, "🏗️ Rendering...", 75, 24)
+        async def on_progress(fraction, snapshot):
+            stats.update(frame=snapshot["frame"], fps=snapshot["fps"])
+            await report()
+
+        renderer = FilterGraphRenderer(threads=workspace.threads)
+        # Decode, trim, concat and encode all run inside the one ffmpeg process
+        with stats.phase("encode"):
+            return await renderer.render_condensed(source_video_path, ranges, target_path, has_audio=info["audio"] is not None, on_progress=on_progress, profile=profile)
+
+    async def _render_condensed_parallel(self, source_video_path: str, editing_guide: list, target_path: Path, workspace: RenderWorkspace, status_callback=None, source_digest: str = None, profile: dict = None, stats: RenderStats = None):
+        """V77: per-range encodes in an ffmpeg process pool, joined with the concat demuxer."""
+        stats = stats or RenderStats("parallel")
+        await self._emit_status(status_callback, "🎞️ Planning parallel render...", 75)
+        with stats.phase("load"):
+            info = await probe_media(source_video_path)
+        if not info["video"]:
+            raise ValueError("parallel render needs a video stream")
+        source_duration = float(info["format"].get("duration") or 0) or None
+        ranges = self._guide_ranges(editing_guide, source_duration)
+        if not ranges:
+            raise ValueError("editing guide has no usable cut ranges")
+
+        renderer = ParallelRenderer(threads=workspace.threads)
+        print(f"🧵 Parallel Render: {len(ranges)} clips on {renderer.workers} workers")
 
-    async def render_forge_video(self, audio_path: str, segments: list, output_filename: str, bg_music_genre: str = None, status_callback=None):
+        report = self._frame_reporter(status_callback, stats, "🎞️ Encoding clips...", 75, 20)
+        async def on_progress(done, total, piece):
+            await report()
+
+        return await renderer.render_condensed(
+            source_video_path, ranges, target_path, workspace.subdir("parallel"), info, on_progress=on_progress,
+            cache=self.render_cache if source_digest else None, source_digest=source_digest, profile=profile,
+            stats=stats
+        )
+
+    def _smart_codec_args(self, video_info: dict) -> list:
         """
-        V10 CINEMA: Stable & High-Quality Rendering Engine.
+        libx264 arguments that reproduce the source's H.264 profile and level for the smart
+        render's edge re-encodes; raises ValueError for a source they cannot be spliced into.
         """
-        from moviepy import AudioFileClip, ImageClip, ColorClip, CompositeVideoClip, concatenate_videoclips, CompositeAudioClip
-        import numpy as np
-        import asyncio
+        if not video_info or video_info.get("codec_name") != "h264":
+            raise ValueError(f"smart render needs an H.264 source (got {video_info.get('codec_name') if video_info else 'no video'})")
+        profile = SMART_X264_PROFILES.get(video_info.get("profile"))
+        if not profile:
+            raise ValueError(f"smart render cannot re-encode H.264 profile {video_info.get('profile')!r}")
+        if video_info.get("pix_fmt") not in SMART_PIX_FMTS:
+            raise ValueError(f"smart render cannot re-encode pixel format {video_info.get('pix_fmt')!r}")
+        if video_info.get("field_order") not in (None, "unknown", "progressive"):
+            raise ValueError("smart render needs progressive video")
+        avg_rate, stream_rate = video_info.get("avg_frame_rate"), video_info.get("r_frame_rate")
+        if avg_rate and stream_rate and abs(parse_rate(avg_rate) - parse_rate(stream_rate)) > 0.01 * parse_rate(stream_rate):
+            raise ValueError(f"smart render needs constant frame rate video ({avg_rate} vs {stream_rate})")
+        args = ["-profile:v", profile]
+        level = int(video_info.get("level") or 0)
+        if level > 0:
+            args += ["-level:v", f"{level / 10:.1f}"]
+        return args
 
-        async def _safe_status(msg, progress):
-            if status_callback:
-                try:
-                    if asyncio.iscoroutinefunction(status_callback):
-                        await status_callback(msg, progress)
+    async def _check_smart_edge(self, piece: Path, video_info: dict):
+        """Raises ValueError when an edge re-encode's stream parameters differ from the source."""
+        encoded = (await probe_media(str(piece)))["video"] or {}
+        fields = ("profile", "level", "width", "height", "pix_fmt")
+        mismatched = [f"{field} {encoded.get(field)} != {video_info.get(field)}" for field in fields if encoded.get(field) != video_info.get(field)]
+        if mismatched:
+            raise ValueError(f"edge re-encode does not match the source ({', '.join(mismatched)})")
+
+    async def _smart_render(self, source_video_path: str, editing_guide: list, target_path: Path, workspace: RenderWorkspace, status_callback=None, stats: RenderStats = None, source_digest: str = None):
+        """
+        ⚡ V75: Smart Render (GOP stream-copy)
+        1. Indexes the source keyframes (packet flags only, no decoding) and snaps every cut
+           range to whole source frames.
+        2. For every range, copies the GOPs that lie fully inside it and re-encodes only the
+           partial GOPs at the in/out edges (same profile and level as the source).
+        3. Joins the video pieces with the concat demuxer. Pieces are MPEG-TS so each
+           carries in-band SPS/PPS and copied + re-encoded H.264 splice cleanly.
+        4. Cuts the audio ONCE, sample-exact to the same frame spans, and muxes it in, so
+           A/V never drift however many cuts there are.
+        Only closed-GOP, constant frame rate, 8-bit 4:2:0 progressive sources qualify, and the
+        first edge re-encode is probed against the source; anything else raises ValueError
+        (the "auto" mode then falls back to a full encode).
+        V78: with a source_digest, edge re-encodes are kept in the clip cache, so re-rendering
+        after one cut changed only re-encodes that cut's edges.
+        """
+        stats = stats or RenderStats("smart")
+        await self._emit_status(status_callback, "🎞️ Indexing source keyframes...", 75)
+        with stats.phase("load"):
+            info = await probe_media(source_video_path)
+            video_info, audio_info = info["video"], info["audio"]
+            codec_args = self._smart_codec_args(video_info)
+
+            source_duration = float(info["format"].get("duration") or 0) or None
+            ranges = self._guide_ranges(editing_guide, source_duration)
+            if not ranges:
+                raise ValueError("editing guide has no usable cut ranges")
+            gops = await probe_gop_index(source_video_path)
+            if gops["open_keyframes"]:
+                raise ValueError(f"smart render needs closed GOPs ({len(gops['open_keyframes'])} open GOPs in the source)")
+        fps = parse_rate(video_info.get("avg_frame_rate") or video_info.get("r_frame_rate"))
+        edge_tolerance = 0.5 / fps
+        # Packet timestamps are absolute; cut ranges (and ffmpeg's input seeks) start at 0
+        start_time = float(info["format"].get("start_time") or 0)
+        frame_times = [t - start_time for t in gops["frames"]]
+        key_frames = sorted({bisect_left(frame_times, k - start_time - edge_tolerance) for k in gops["keyframes"]})
+
+        def frame_time(i: int) -> float:
+            return frame_times[i] if i < len(frame_times) else frame_times[-1] + (i - len(frame_times) + 1) / fps
+
+        # Ranges as [first, last) source frame indices
+        spans = []
+        for start_sec, end_sec in ranges:
+            first, last = bisect_left(frame_times, start_sec - edge_tolerance), bisect_left(frame_times, end_sec - edge_tolerance)
+            if last > first:
+                spans.append((first, last))
+        if not spans:
+            raise ValueError("editing guide has no cut range spanning a whole frame")
+        stats.update(total_frames=sum(last - first for first, last in spans))
+
+        # Edge re-encodes must match the copied stream so the splice is seamless
+        encode_args = [
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", "18", *codec_args,
+            "-pix_fmt", video_info["pix_fmt"], "-r", f"{fps:.6f}",
+        ]
+        cache = self.render_cache if source_digest else None
+
+        workdir = workspace.subdir("smart")
+        try:
+            plan = []  # (kind, first frame, end frame)
+            for first, last in spans:
+                k1 = next((k for k in key_frames if k >= first), None)
+                k2 = next((k for k in reversed(key_frames) if k <= last), None)
+                if k1 is None or k2 is None or (k2 - k1) / fps < SMART_MIN_COPY_SECONDS:
+                    plan.append(("encode", first, last))
+                    continue
+                if k1 > first:
+                    plan.append(("encode", first, k1))
+                plan.append(("copy", k1, k2))
+                if last > k2:
+                    plan.append(("encode", k2, last))
+
+            copied = sum(e - s for kind, s, e in plan if kind == "copy")
+            total = sum(e - s for _, s, e in plan)
+            print(f"⚡ Smart Render: {len(plan)} pieces | {round(copied / max(total, 1) * 100)}% stream-copied")
+
+            report = self._frame_reporter(status_callback, stats, "🎞️ Splicing condensed video...", 75, 20)
+            with stats.phase("encode"):
+                pieces, durations, checked = [], [], False
+                for i, (kind, first, end) in enumerate(plan):
+                    piece = workdir / f"piece_{i:04d}.ts"
+                    # Every piece is an exact frame count (closed GOPs: decode order == [k1, k2))
+                    if kind == "copy":
+                        await run_ffmpeg([
+                            # Just past the keyframe: a copy seek lands on the keyframe at or before it
+                            "-ss", f"{frame_time(first) + edge_tolerance / 2:.6f}", "-i", source_video_path, "-frames:v", end - first,
+                            "-map", "0:v:0", "-an", "-c", "copy",
+                            "-bsf:v", "h264_mp4toannexb", "-avoid_negative_ts", "make_zero",
+                            "-f", "mpegts", piece
+                        ])
                     else:
-                        status_callback(msg, progress)
-                except Exception as e:
-                    print(f"Callback error: {e}")
+                        key = cache.clip_key(source_digest, frame_time(first), frame_time(end), "smart-edge", encode_args) if cache else None
+                        cached = cache.get(key, ".ts") if cache else None
+                        if cached:
+                            # Passed the edge check when it was encoded with these same arguments
+                            piece, checked = cached, True
+                        else:
+                            await run_ffmpeg([
+                                "-ss", f"{frame_time(first) - edge_tolerance / 2:.6f}", "-i", source_video_path, "-frames:v", end - first,
+                                "-map", "0:v:0", "-an", *encode_args, "-threads", workspace.threads,
+                                "-f", "mpegts", piece
+                            ])
+                            if not checked:
+                                await self._check_smart_edge(piece, video_info)
+                                checked = True
+                            if cache:
+                                piece = cache.put(key, piece, ".ts", move=True)
+                    pieces.append(piece)
+                    durations.append((end - first) / fps)
+                    # Copied GOPs are never decoded, so "fps" here is output frames per wall second
+                    stats.advance(end - first)
+                    await report()
+
+                audio_track = None
+                if audio_info:
+                    audio_track = workdir / "audio.m4a"
+                    inputs, chains = [], []
+                    for i, (first, last) in enumerate(spans):
+                        duration = (last - first) / fps
+                        inputs += ["-ss", f"{frame_time(first):.6f}", "-t", f"{duration + 1:.6f}", "-i", source_video_path]
+                        # atrim to the span's exact frame duration (input -t only stops near it)
+                        chains.append(f"[{i}:a]atrim=duration={duration:.6f},asetpts=PTS-STARTPTS[a{i}]")
+                    chains.append(f"{''.join(f'[a{i}]' for i in range(len(spans)))}concat=n={len(spans)}:v=0:a=1[outa]")
+                    await run_ffmpeg([
+                        *inputs, "-filter_complex", ";".join(chains), "-map", "[outa]",
+                        "-c:a", "aac", "-b:a", "192k",
+                        "-ar", str(audio_info.get("sample_rate", 48000)), "-ac", str(audio_info.get("channels", 2)),
+                        audio_track
+                    ])
+
+            await self._emit_status(status_callback, "🏗️ Joining segments (stream copy)...", 95)
+            with stats.phase("mux"):
+                if audio_track:
+                    video_track = await concat_files(pieces, str(workdir / "video.mp4"), workdir, durations=durations)
+                    await run_ffmpeg([
+                        "-i", video_track, "-i", audio_track, "-map", "0:v:0", "-map", "1:a:0",
+                        "-c", "copy", "-movflags", "+faststart", target_path
+                    ])
+                else:
+                    await concat_files(pieces, str(target_path), workdir, durations=durations)
+        finally:
+            # Free the pieces right away (an "auto" fallback still needs the workspace)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        return str(target_path)
+
+    def _scene_duration(self, seg: dict) -> float:
+        """Parses a storyboard duration like '12s' (defaults keep broken entries renderable)."""
+        try:
+            dur_raw = str(seg.get('duration', '5s'))
+            dur_s = float(dur_raw.replace('s', ''))
+            if dur_s <= 0: dur_s = 2.0
+        except:
+            dur_s = 5.0
+        return dur_s
+
+    def _timed_segments(self, audio_path: str, segments: list, narration_duration: float) -> list:
+        """
+        V92: scene durations from the narration's word timing (saved by TTSEngine) instead of
+        word-count estimates; segments are returned unchanged when there is no timing map or
+        a scene's text cannot be matched to the speech.
+        """
+        from processor.tts_engine import load_speech_timing, scene_durations
+        timing = load_speech_timing(audio_path)
+        if not timing or not segments or not all(seg.get("text") for seg in segments):
+            return segments
+        durations = scene_durations(timing, [seg["text"] for seg in segments], narration_duration)
+        if not durations:
+            print("⚠️ Scene texts not found in the narration timing; keeping storyboard durations")
+            return segments
+        print("⏱️ Scene cuts follow the narration's word timing")
+        return [{**seg, "duration": f"{d:.3f}s"} for seg, d in zip(segments, durations)]
+
+    def _scene_image_url(self, i: int, seg: dict) -> str:
+        """URL of the AI image for a storyboard scene (seed is stable across restarts)."""
+        prompt_src = seg.get('title', seg.get('text', 'Cinematic scene'))[:120]
+        clean_p = prompt_src.replace("\n", " ").strip()
+        import urllib.parse
+        encoded = urllib.parse.quote(clean_p)
+        # Seed varies per scene index but is deterministic, so re-renders hit the image cache
+        return f"https://image.pollinations.ai/prompt/{encoded}?width=1280&height=720&nologo=true&seed={stable_seed(clean_p, i)}"
+
+    async def _iter_scene_images(self, segments: list):
+        """V79: yields (scene_index, image_path | None) as each concurrently prefetched image lands."""
+        async with ImagePrefetcher(self.image_cache) as prefetcher:
+            tasks = prefetcher.schedule([self._scene_image_url(i, seg) for i, seg in enumerate(segments)])
+            index_of = {task: i for i, task in enumerate(tasks)}
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=index_of.get):
+                    yield index_of[task], task.result()
+        print(f"🗃️ Image cache: {self.image_cache.stats()}")
+
+    async def _pick_bg_music(self, genre: str = None, seed: str = ""):
+        """V86: prepared library track for the genre (None without music or on any library error)."""
+        try:
+            return await self.music_library.track_for(genre, seed)
+        except Exception as e:
+            print(f"⚠️ Background music unavailable: {e}")
+            return None
+
+    async def render_forge_video(self, audio_path: str, segments: list, output_filename: str, bg_music_genre: str = None, status_callback=None, render_mode: str = "moviepy", ken_burns: bool = False, profile: str = "final"):
+        """
+        V10 CINEMA: Stable & High-Quality Rendering Engine.
+        V76: render_mode="filtergraph" compiles the storyboard into one native ffmpeg graph.
+        V77: render_mode="parallel" encodes the scenes concurrently and muxes the narration last.
+        V81: still scenes are precomposited once; ken_burns=True adds motion (parallel mode).
+        V82: profile="draft" renders a 360p low-fps preview without crossfades or music.
+        V83: frame-level progress (render=...) and per-phase timings in self.last_render_stats.
+        V84: runs in a render scheduler slot inside its own workspace; the output is published
+        atomically when the render succeeds.
+        V86: background music comes from the music library (matched to bg_music_genre) and is
+        mixed and ducked under the narration by ffmpeg on every backend.
+        """
+        async def _safe_status(msg, progress, **extra):
+            await self._emit_status(status_callback, msg, progress, **extra)
             print(f"[{progress}%] {msg}")
 
+        if render_mode not in FORGE_RENDER_MODES:
+            raise ValueError(f"render_mode must be one of {FORGE_RENDER_MODES}")
         await _safe_status("🎨 Preparing Cinematic Canvas...", 10)
+
+        prof = get_render_profile(profile)
+        stats = RenderStats(render_mode, profile if isinstance(profile, str) else "custom")
+        target_path = self.output_dir / output_filename
+        with RenderWorkspace(self.jobs_dir, "forge") as workspace:
+            queued_at = time.perf_counter()
+            async with self.scheduler.slot(f"forge render {output_filename}") as threads:
+                stats.phases["queue"] = round(time.perf_counter() - queued_at, 3)
+                workspace.threads = threads
+                scratch_path = workspace.file(target_path.name)
+                # Same narration -> same track, so a re-render keeps its music
+                bg_path = await self._pick_bg_music(bg_music_genre, Path(audio_path).name) if prof["bg_music"] else None
+                if render_mode == "filtergraph":
+                    await self._render_forge_filtergraph(audio_path, segments, scratch_path, workspace, _safe_status, prof, stats, bg_path)
+                elif render_mode == "parallel":
+                    await self._render_forge_parallel(audio_path, segments, scratch_path, workspace, _safe_status, ken_burns=ken_burns, profile=prof, stats=stats, bg_path=bg_path)
+                else:
+                    await self._render_forge_moviepy(audio_path, segments, scratch_path, workspace, _safe_status, prof, stats, bg_path)
+            workspace.publish(scratch_path, target_path)
+        self._finish_stats(stats)
+        return str(target_path)
+
+    async def _render_forge_moviepy(self, audio_path: str, segments: list, target_path: Path, workspace: RenderWorkspace, _safe_status, prof: dict, stats: RenderStats, bg_path: Path = None):
+        """MoviePy forge render (precomposited stills, crossfades); audio is muxed natively."""
+        width, height = canvas_size(prof)
+        fps = prof["fps"] or 24
         
+        stats.current_phase = "load"
+        load_t0 = time.perf_counter()
         try:
-            narration_audio = AudioFileClip(audio_path)
-            print(f"✅ Audio Loaded: {narration_audio.duration}s")
+            narration_duration = float((await probe_media(audio_path))["format"].get("duration") or 0)
+            if narration_duration <= 0:
+                raise ValueError("no duration")
+            print(f"✅ Audio Loaded: {narration_duration}s")
         except Exception as e:
             print(f"❌ Audio Load Failed: {e}")
             raise Exception(f"Audio Load Error: {e}")
 
-        visual_clips = []
-        
         # Ensure segments
         if not segments:
-            segments = [{"title": "Cinematic Story", "text": "...", "duration": f"{int(narration_audio.duration)}s"}]
+            segments = [{"title": "Cinematic Story", "text": "...", "duration": f"{int(narration_duration)}s"}]
+        segments = self._timed_segments(audio_path, segments, narration_duration)
 
-        for i, seg in enumerate(segments):
-            await _safe_status(f"🖼️ Scene {i+1}: {seg.get('title', '...')}", 10 + int((i / len(segments)) * 60))
+        # V79: all images download concurrently; each frame is composited the moment its image lands
+        scenes = [None] * len(segments)
+        landed = 0
+        stills = StillSceneEncoder(width=width, height=height, fps=fps)
+        frames_dir = workspace.subdir("stills")
+        loop = asyncio.get_event_loop()
+        async for i, img_path in self._iter_scene_images(segments):
+            seg = segments[i]
+            await _safe_status(f"🖼️ Scene {i+1}: {seg.get('title', '...')}", 10 + int((landed / len(segments)) * 60))
+            landed += 1
             
             # Duration logic
-            try:
-                dur_raw = str(seg.get('duration', '5s'))
-                dur_s = float(dur_raw.replace('s', ''))
-                if dur_s <= 0: dur_s = 2.0
-            except:
-                dur_s = 5.0
-
-            # Image Download
-            prompt_src = seg.get('title', seg.get('text', 'Cinematic scene'))[:120]
-            clean_p = prompt_src.replace("\n", " ").strip()
-            import urllib.parse
-            encoded = urllib.parse.quote(clean_p)
-            # Use hash for variety but preserve order with i
-            img_url = f"https://image.pollinations.ai/prompt/{encoded}?width=1280&height=720&nologo=true&seed={hash(clean_p + str(i)) % 10000}"
+            dur_s = self._scene_duration(seg)
             
+            frame_path = None
             try:
-                img_path = await self.download_image(img_url, f"forge_v10_{i}_{hash(clean_p) % 100}.png")
-                # Create Clip
-                img_clip = ImageClip(str(img_path)).with_duration(dur_s).with_fps(24)
-                # Ensure 1280x720 via background composition
-                canvas = ColorClip(size=(1280, 720), color=(25, 25, 25)).with_duration(dur_s).with_fps(24)
-                img_clip = img_clip.with_position("center")
-                scene = CompositeVideoClip([canvas, img_clip], size=(1280, 720))
-                
+                if img_path is None:
+                    raise Exception("no image for scene")
+                # V81: composite onto the canvas ONCE; the clip then reuses that single frame
+                frame_path = str(await loop.run_in_executor(None, stills.precomposite, str(img_path), frames_dir / f"scene_{i:04d}.png"))
             except Exception as e:
                 print(f"⚠️ Scene Generation fallback: {e}")
-                scene = ColorClip(size=(1280, 720), color=(30, 30, 30)).with_duration(dur_s).with_fps(24)
-
-            # Simple Crossfade attempt (MoviePy v2 style)
-            if i > 0:
-                try:
-                    scene = scene.with_crossfadein(0.5)
-                except:
-                    pass
             
-            visual_clips.append(scene)
+            scenes[i] = {"frame": frame_path, "duration": dur_s}
+        stats.phases["load"] = round(time.perf_counter() - load_t0, 3)
 
-        # Concatenate
-        await _safe_status("🏗️ Assembling Master Sequence...", 80)
-        # Use simple concatenation (padding for overlap if MoviePy supports it)
-        final_video = concatenate_videoclips(visual_clips, method="compose")
+        await _safe_status("🚀 Rendering High-Quality Master...", 90)
         
-        # Audio Mixing
-        final_audio = narration_audio
-        audio_dir = self.assets_dir.parent / "audio"
-        bg_candidates = list(audio_dir.glob("bg_*.mp3")) + list(audio_dir.glob("*.mp3"))
-        bg_path = next((c for c in bg_candidates if "narration" not in c.name.lower()), None)
+        stats.update(total_frames=int(round(narration_duration * fps)))
+        report = self._frame_reporter(_safe_status, stats, "🚀 Rendering High-Quality Master...", 90, 9)
+        # V86: MoviePy renders the picture only; narration + music are mixed by ffmpeg below
+        # V94: clips are built, concatenated and encoded in a worker process
+        video_track = workspace.file("video_track.mp4")
+        with stats.phase("encode"):
+            result = await WorkerPool.shared().run_isolated(
+                worker_tasks.render_forge_moviepy,
+                scenes, str(video_track), (width, height), fps, narration_duration, prof, workspace.threads,
+                on_progress=self._worker_progress(stats, report)
+            )
+        stats.phases.update(result["phases"])
+        with stats.phase("mux"):
+            await mux_narration(video_track, audio_path, target_path, narration_duration, bg_path, audio_bitrate=prof["audio_bitrate"])
         
-        if bg_path:
-            try:
-                bg_music = AudioFileClip(str(bg_path)).multiply_volume(0.12)
-                if bg_music.duration < narration_audio.duration:
-                    try:
-                        from moviepy.audio.fx import AudioLoop
-                        bg_music = AudioLoop(duration=narration_audio.duration).apply(bg_music)
-                    except ImportError:
-                        from moviepy.audio.fx.all import audio_loop
-                        bg_music = audio_loop(bg_music, duration=narration_audio.duration)
-                else:
-                    bg_music = bg_music.with_duration(narration_audio.duration)
-                from moviepy import CompositeAudioClip
-                final_audio = CompositeAudioClip([narration_audio, bg_music])
-            except:
-                pass
+        return str(target_path)
 
-        final_video = final_video.with_audio(final_audio)
-        
-        # Final safety check: ensure duration matches audio
-        if final_video.duration != narration_audio.duration:
-             final_video = final_video.with_duration(narration_audio.duration)
+    async def _collect_forge_scenes(self, audio_path: str, segments: list, _safe_status) -> tuple:
+        """(narration_duration, [{"image", "duration"}]) for the native render backends."""
+        info = await probe_media(audio_path)
+        narration_duration = float(info["format"].get("duration") or 0)
+        if narration_duration <= 0:
+            raise Exception(f"Audio Load Error: could not read duration of {audio_path}")
 
-        target_path = self.output_dir / output_filename
-        await _safe_status("🚀 Rendering High-Quality Master...", 90)
-        
-        loop = asyncio.get_event_loop()
-        def _render():
-            final_video.write_videofile(
-                str(target_path), 
-                codec="libx264", 
-                audio_codec="aac", 
-                fps=24,
-                threads=4,
-                logger=None,
-                preset="ultrafast" # Speed up testing
+        if not segments:
+            segments = [{"title": "Cinematic Story", "text": "...", "duration": f"{int(narration_duration)}s"}]
+        segments = self._timed_segments(audio_path, segments, narration_duration)
+
+        scenes = [None] * len(segments)
+        landed = 0
+        async for i, img_path in self._iter_scene_images(segments):
+            seg = segments[i]
+            await _safe_status(f"🖼️ Scene {i+1}: {seg.get('title', '...')}", 10 + int((landed / len(segments)) * 60))
+            landed += 1
+            scenes[i] = {"image": str(img_path) if img_path else None, "duration": self._scene_duration(seg)}
+        return narration_duration, scenes
+
+    async def _render_forge_filtergraph(self, audio_path: str, segments: list, target_path: Path, workspace: RenderWorkspace, _safe_status, profile: dict = None, stats: RenderStats = None, bg_path: Path = None):
+        """V76: Forge render as a single ffmpeg process (loop/scale/pad/xfade/amix)."""
+        stats = stats or RenderStats("filtergraph")
+        with stats.phase("load"):
+            narration_duration, scenes = await self._collect_forge_scenes(audio_path, segments, _safe_status)
+        await _safe_status("🚀 Rendering High-Quality Master (native graph)...", 80)
+
+        profile = get_render_profile(profile)
+        fps = profile["fps"] or 24
+        stats.update(total_frames=int(round(narration_duration * fps)))
+        report = self._frame_reporter(_safe_status, stats, "🚀 Encoding...", 80, 19)
+        async def on_progress(fraction, snapshot):
+            stats.update(frame=snapshot["frame"], fps=snapshot["fps"])
+            await report()
+
+        width, height = canvas_size(profile)
+        renderer = FilterGraphRenderer(width=width, height=height, fps=fps, threads=workspace.threads)
+        with stats.phase("encode"):
+            return await renderer.render_forge(
+                scenes, audio_path, narration_duration, target_path,
+                bg_music_path=str(bg_path) if bg_path else None, crossfade=profile["crossfade"],
+                on_progress=on_progress, profile=profile
             )
-            return target_path
-            
-        result_path = await loop.run_in_executor(None, _render)
-        
-        # Cleanup
-        narration_audio.close()
-        final_video.close()
-        for c in visual_clips: c.close()
-        
-        return str(result_path)
+
+    async def _render_forge_parallel(self, audio_path: str, segments: list, target_path: Path, workspace: RenderWorkspace, _safe_status, ken_burns: bool = False, profile: dict = None, stats: RenderStats = None, bg_path: Path = None):
+        """V77: Forge scenes encoded in an ffmpeg process pool, concatenated, then muxed with audio."""
+        stats = stats or RenderStats("parallel")
+        with stats.phase("load"):
+            narration_duration, scenes = await self._collect_forge_scenes(audio_path, segments, _safe_status)
+
+        profile = get_render_profile(profile)
+        width, height = canvas_size(profile)
+        renderer = ParallelRenderer(width=width, height=height, fps=profile["fps"] or 24, threads=workspace.threads)
+        await _safe_status(f"🚀 Rendering {len(scenes)} scenes on {renderer.workers} workers...", 80)
+
+        report = self._frame_reporter(_safe_status, stats, "🚀 Encoding scenes...", 80, 15)
+        async def on_progress(done, total, piece):
+            await report()
+
+        return await renderer.render_forge(
+            scenes, audio_path, narration_duration, target_path, workspace.subdir("parallel"),
+            bg_music_path=str(bg_path) if bg_path else None, crossfade=profile["crossfade"],
+            on_progress=on_progress, ken_burns=ken_burns, profile=profile, stats=stats
+        )
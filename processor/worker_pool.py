@@ -0,0 +1,217 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import uuid
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Worker-side state: the shared progress queue and the id of the task being run
+_progress_queue = None
+_current_task = None
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+def _run_task(task_id: str, fn, args: tuple, kwargs: dict):
+    global _current_task
+    _current_task = task_id
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _current_task = None
+
+def _run_isolated(progress_queue, conn, task_id: str, fn, args: tuple, kwargs: dict):
+    """Entry point of a dedicated task process: runs the task and sends (ok, result) back."""
+    _init_worker(progress_queue)
+    try:
+        outcome = (True, _run_task(task_id, fn, args, kwargs))
+    except Exception as e:
+        outcome = (False, e)
+    try:
+        conn.send(outcome)
+    except Exception as e:
+        # Unpicklable result or exception
+        conn.send((False, RuntimeError(f"{getattr(fn, '__name__', fn)} failed: {outcome[1]!r} ({e})")))
+    finally:
+        conn.close()
+
+def _receive(conn):
+    try:
+        return conn.recv()
+    except EOFError:
+        return (False, RuntimeError("worker process exited without a result"))
+
+def report_progress(payload: dict):
+    """Sends a progress payload from inside a worker task to its caller (no-op elsewhere)."""
+    if _progress_queue is not None and _current_task is not None:
+        _progress_queue.put((_current_task, payload))
+
+class WorkerPool:
+    _shared = {}
+
+    def __init__(self, workers: int = None, name: str = "cpu"):
+        """
+        ⚙️ V94: CPU Worker Processes
+        Whisper, the NumPy/text analyzers and MoviePy encodes run in separate (spawned)
+        processes, so they never hold the API process's GIL and the event loop keeps serving
+        requests and WebSocket progress while a pipeline runs. WORKER_PROCESSES (default:
+        half the cores, at most 4) sets the size of the shared "cpu" pool.
+        Tasks are module-level functions (see processor/worker_tasks.py); a task calls
+        report_progress(payload) and the caller's on_progress(payload) runs on the event loop.
+        Cancelling a caller stops its work: run_isolated() terminates the task's own process,
+        run() recycles the pool (other tasks caught by that are resubmitted).
+        """
+        cores = os.cpu_count() or 1
+        self.name = name
+        self.workers = max(1, workers or int(os.environ.get("WORKER_PROCESSES", 0)) or min(4, max(1, cores // 2)))
+        self._context = multiprocessing.get_context("spawn")
+        self._progress = self._context.Queue()
+        self._listeners = {}
+        self._recycled = weakref.WeakSet()  # executors torn down on purpose (a cancelled task), not by a crash
+        self.running = 0
+        self._executor = self._new_executor()
+        self._reader = threading.Thread(target=self._read_progress, name=f"{name}-progress", daemon=True)
+        self._reader.start()
+
+    @classmethod
+    def shared(cls, name: str = "cpu", workers: int = None) -> "WorkerPool":
+        """The process-wide pool with this name (created on first use)."""
+        if name not in cls._shared:
+            cls._shared[name] = cls(workers, name=name)
+        return cls._shared[name]
+
+    @classmethod
+    def whisper(cls) -> "WorkerPool":
+        """
+        Pool reserved for Whisper: every worker keeps its own model in RAM, so the pool size
+        (WHISPER_WORKERS, default 1) bounds the model memory; more transcriptions queue.
+        """
+        return cls.shared("whisper", workers=int(os.environ.get("WHISPER_WORKERS", 1)))
+
+    @classmethod
+    def shutdown_all(cls):
+        for pool in cls._shared.values():
+            pool.shutdown()
+        cls._shared = {}
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=self._context,
+            initializer=_init_worker, initargs=(self._progress,)
+        )
+
+    def _recycle(self, executor: ProcessPoolExecutor, deliberate: bool):
+        """Replaces the executor and terminates its processes (their tasks fail with BrokenProcessPool)."""
+        if self._executor is not executor:
+            return
+        if deliberate:
+            self._recycled.add(executor)
+        self._executor = self._new_executor()
+        # concurrent.futures has no way to stop a running call; ending its process is the only one
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn, *args, on_progress=None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) in a pool worker and returns its result.
+        Arguments and results are pickled, so pass paths and plain data (not open clips).
+        on_progress: sync or async callable for the task's report_progress() payloads.
+        """
+        loop = asyncio.get_running_loop()
+        task_id = uuid.uuid4().hex
+        if on_progress:
+            self._listeners[task_id] = (loop, on_progress)
+        self.running += 1
+        try:
+            while True:
+                executor = self._executor
+                future = executor.submit(_run_task, task_id, fn, args, kwargs)
+                try:
+                    return await asyncio.wrap_future(future)
+                except BrokenProcessPool:
+                    if executor in self._recycled:
+                        continue  # torn down for another task's cancellation: start over
+                    # A worker died (e.g. out of memory); later tasks get a fresh pool
+                    if self._executor is executor:
+                        print(f"⚠️ Worker process died during {getattr(fn, '__name__', fn)}; restarting the {self.name} pool")
+                        self._recycle(executor, deliberate=False)
+                    raise
+                except asyncio.CancelledError:
+                    if not future.cancel():
+                        # Already running in a worker: stop it rather than let it run on unobserved
+                        print(f"🛑 Cancelled {getattr(fn, '__name__', fn)}; recycling the {self.name} pool")
+                        self._recycle(executor, deliberate=True)
+                    raise
+        finally:
+            self.running -= 1
+            self._listeners.pop(task_id, None)
+
+    async def run_isolated(self, fn, *args, on_progress=None, **kwargs):
+        """
+        Like run(), but in a dedicated process for this one task (long MoviePy renders):
+        cancelling the caller terminates exactly that process, and returns only once it is
+        gone, so the caller can safely delete the task's workspace.
+        """
+        loop = asyncio.get_running_loop()
+        task_id = uuid.uuid4().hex
+        if on_progress:
+            self._listeners[task_id] = (loop, on_progress)
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_run_isolated, args=(self._progress, sender, task_id, fn, args, kwargs),
+            name=f"{self.name}-{getattr(fn, '__name__', 'task')}", daemon=True
+        )
+        self.running += 1
+        try:
+            process.start()
+            sender.close()
+            try:
+                ok, value = await loop.run_in_executor(None, _receive, receiver)
+            except asyncio.CancelledError:
+                print(f"🛑 Cancelled {getattr(fn, '__name__', fn)}; terminating its worker process")
+                process.terminate()
+                await loop.run_in_executor(None, process.join, 5)
+                if process.is_alive():
+                    process.kill()
+                raise
+            if not ok:
+                raise value
+            return value
+        finally:
+            self.running -= 1
+            self._listeners.pop(task_id, None)
+            receiver.close()
+            if process.pid is not None:
+                await loop.run_in_executor(None, process.join)
+
+    def _read_progress(self):
+        while True:
+            item = self._progress.get()
+            if item is None:
+                return
+            task_id, payload = item
+            listener = self._listeners.get(task_id)
+            if listener:
+                loop, callback = listener
+                loop.call_soon_threadsafe(self._dispatch, callback, payload)
+
+    @staticmethod
+    def _dispatch(callback, payload):
+        try:
+            result = callback(payload)
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+        except Exception as e:
+            print(f"⚠️ Worker progress callback failed: {e}")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._progress.put(None)
+        self._reader.join(timeout=5)
+
+    def stats(self) -> dict:
+        return {"name": self.name, "workers": self.workers, "running_tasks": self.running}
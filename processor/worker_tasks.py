@@ -0,0 +1,124 @@
+# ⚙️ V94: CPU-heavy pipeline stages, run inside WorkerPool processes.
+# Module-level functions taking and returning plain (picklable) data; models and engines
+# are loaded lazily and kept for the lifetime of the worker process.
+import time
+from processor.worker_pool import report_progress
+
+_engines = {}
+
+def _transcription_engine(model_size: str):
+    if model_size not in _engines:
+        from processor.transcribe_engine import TranscriptionEngine
+        _engines[model_size] = TranscriptionEngine(model_name=model_size)
+    return _engines[model_size]
+
+_studio = None
+
+def _studio_engine():
+    global _studio
+    if _studio is None:
+        from processor.studio_engine import StudioEngine
+        _studio = StudioEngine()
+    return _studio
+
+# --- Transcription ---
+
+def transcribe(audio_path: str, model_size: str = "base") -> dict:
+    """Full Whisper result ({"text", "segments", "language"})."""
+    return _transcription_engine(model_size).model.transcribe(audio_path)
+
+def transcribe_srt(file_path: str, model_size: str = "base") -> dict:
+    """{"text", "srt", "language"} for the /transcribe endpoint."""
+    return _transcription_engine(model_size).transcribe_sync(file_path)
+
+# --- Transcript analysis ---
+
+def condense_segments(segments: list, target_duration_mins: int, genre: str, index) -> tuple:
+    """(script data, selected segments) of EnglishVideoRecreator.condense_from_segments."""
+    from processor.english_recreator import EnglishVideoRecreator
+    recreator = EnglishVideoRecreator()
+    script = recreator.condense_from_segments(segments, target_duration_mins=target_duration_mins, genre=genre, index=index)
+    return script, recreator.selected_segments
+
+def select_editing_islands(segments: list, target_duration_mins: int, genre: str, index) -> list:
+    return _studio_engine().select_editing_islands(segments, target_duration_mins, genre, index)
+
+def shorts_clip_windows(segments: list, index, top_k: int = 3) -> list:
+    return _studio_engine().shorts_clip_windows(segments, index, top_k)
+
+def detect_topic_shifts(index) -> list:
+    return _studio_engine().detect_topic_shifts(index)
+
+# --- MoviePy renders ---
+
+def _progress_logger(backend: str):
+    from processor.render_progress import RenderStats, MoviePyProgressLogger
+    return MoviePyProgressLogger(RenderStats(backend), report_progress)
+
+def render_condensed_moviepy(source_video_path: str, ranges: list, target_path: str, temp_audiofile: str, profile: dict, threads: int) -> dict:
+    """Cuts the (start, end) ranges out of the source and encodes them; {"path", "phases"}."""
+    from moviepy import VideoFileClip, concatenate_videoclips
+
+    t0 = time.perf_counter()
+    video = VideoFileClip(source_video_path)
+    phases = {"load": round(time.perf_counter() - t0, 3)}
+    t0 = time.perf_counter()
+    clips = []
+    for start_sec, end_sec in ranges:
+        subclip = video.subclipped(start_sec, end_sec) if hasattr(video, "subclipped") else video.subclip(start_sec, end_sec)
+        if profile["height"]:
+            subclip = subclip.resized(height=profile["height"]) if hasattr(subclip, "resized") else subclip.resize(height=profile["height"])
+        clips.append(subclip)
+    final_video = concatenate_videoclips(clips, method="compose")
+    phases["composite"] = round(time.perf_counter() - t0, 3)
+    try:
+        final_video.write_videofile(
+            target_path, codec="libx264", audio_codec="aac",
+            temp_audiofile=temp_audiofile, remove_temp=True,
+            fps=profile["fps"], preset=profile["preset"] or "medium", threads=threads,
+            bitrate=profile["video_bitrate"], audio_bitrate=profile["audio_bitrate"],
+            logger=_progress_logger("moviepy")
+        )
+    finally:
+        video.close()
+        final_video.close()
+    return {"path": target_path, "phases": phases}
+
+def render_forge_moviepy(scenes: list, video_track: str, size: tuple, fps: int, duration: float, profile: dict, threads: int) -> dict:
+    """
+    Picture-only forge render. scenes: [{"frame": precomposited PNG or None, "duration"}];
+    a scene without a frame becomes a dark slate. {"path", "phases"}.
+    """
+    from moviepy import ImageClip, ColorClip, concatenate_videoclips
+
+    t0 = time.perf_counter()
+    visual_clips = []
+    for i, scene in enumerate(scenes):
+        if scene["frame"]:
+            clip = ImageClip(scene["frame"]).with_duration(scene["duration"]).with_fps(fps)
+        else:
+            clip = ColorClip(size=tuple(size), color=(30, 30, 30)).with_duration(scene["duration"]).with_fps(fps)
+        # Simple Crossfade attempt (MoviePy v2 style)
+        if i > 0 and profile["crossfade"]:
+            try:
+                clip = clip.with_crossfadein(profile["crossfade"])
+            except Exception:
+                pass
+        visual_clips.append(clip)
+    final_video = concatenate_videoclips(visual_clips, method="compose")
+    # Final safety check: ensure duration matches audio
+    if final_video.duration != duration:
+        final_video = final_video.with_duration(duration)
+    phases = {"composite": round(time.perf_counter() - t0, 3)}
+    try:
+        final_video.write_videofile(
+            video_track, codec="libx264", audio=False, fps=fps, threads=threads,
+            logger=_progress_logger("moviepy"),
+            preset=profile["preset"] or "ultrafast",
+            bitrate=profile["video_bitrate"]
+        )
+    finally:
+        final_video.close()
+        for clip in visual_clips:
+            clip.close()
+    return {"path": video_track, "phases": phases}
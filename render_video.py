@@ -3,7 +3,7 @@ import json
 from pathlib import Path
 from processor.video_composer import VideoComposer
 
-async def render_from_json(json_path: str):
+async def render_from_json(json_path: str, render_mode: str = "auto", profile: str = "final"):
     if not Path(json_path).exists():
         print(f"❌ Error: {json_path} not found.")
         return
@@ -29,17 +29,38 @@ async def render_from_json(json_path: str):
     print(f"🎬 Manually rendering video from {json_path}...")
     composer = VideoComposer(Path("assets/videos"))
     
-    output_name = f"manual_render_{Path(json_path).stem}.mp4"
+    suffix = "" if profile == "final" else f"_{profile}"
+    if render_mode == "multi":
+        # V85: masters at every resolution + vertical Shorts of the highlight windows, one decode
+        windows = data.get("shorts_clips") or ([data["shorts_clip"]] if data.get("shorts_clip") else [])
+        outputs = await composer.export_multi_output(
+            str(source_video),
+            guide,
+            f"manual_render_{Path(json_path).stem}{suffix}",
+            shorts_windows=windows,
+            status_callback=lambda msg, prog, **extra: print(f"[{prog}%] {msg}"),
+            profile=profile
+        )
+        print(f"\n✅ Exported: {json.dumps(outputs, indent=2)}")
+        return
+
+    output_name = f"manual_render_{Path(json_path).stem}{suffix}.mp4"
     path = await composer.compose_condensed_video(
         str(source_video), 
         guide, 
         output_name,
-        status_callback=lambda msg, prog: print(f"[{prog}%] {msg}")
+        status_callback=lambda msg, prog, **extra: print(f"[{prog}%] {msg}"),
+        render_mode=render_mode,
+        profile=profile
     )
     print(f"\n✅ Video successfully rendered at: {path}")
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Re-render a condensed video from a studio JSON.")
     # You can change this path to any studio JSON you've generated
-    import sys
-    target = sys.argv[1] if len(sys.argv) > 1 else "outputs/studio_Prayer___Fasting__Dr__Myles_Munroe_s_Guide_To_Spir.json"
-    asyncio.run(render_from_json(target))
+    parser.add_argument("json_path", nargs="?", default="outputs/studio_Prayer___Fasting__Dr__Myles_Munroe_s_Guide_To_Spir.json")
+    parser.add_argument("mode", nargs="?", default="auto", choices=["auto", "smart", "moviepy", "filtergraph", "parallel", "multi"])
+    parser.add_argument("--profile", default="final", choices=list(VideoComposer.RENDER_PROFILES), help="draft = fast 360p preview")
+    args = parser.parse_args()
+    asyncio.run(render_from_json(args.json_path, args.mode, args.profile))
@@ -0,0 +1,53 @@
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from processor.english_recreator import EnglishVideoRecreator
+
+VOCAB = (
+    "faith grace power prayer fasting spirit kingdom purpose vision truth wisdom heart "
+    "the is at which on and to of a in that it with from for you know i mean basically "
+    "imagine discover learn stop how why here what strength calling journey"
+).split()
+
+def synthetic_segments(count: int, seed: int = 7):
+    """Whisper-like segments: 2-9s of speech with occasional pauses."""
+    rng = random.Random(seed)
+    segments = []
+    t = 0.0
+    for _ in range(count):
+        dur = rng.uniform(2.0, 9.0)
+        text = " ".join(rng.choice(VOCAB) for _ in range(rng.randint(2, 24)))
+        segments.append({"start": t, "end": t + dur, "text": text})
+        t += dur + (rng.uniform(0.5, 4.0) if rng.random() < 0.2 else 0.0)
+    return segments
+
+def plan_value(clips, scored):
+    """Sum of segment scores covered by the planned blocks."""
+    total = 0.0
+    for seg in scored:
+        if any(c['start_time'] <= seg['start_time'] and seg['end_time'] <= c['end_time'] + 1e-6 for c in clips):
+            total += seg['score']
+    return total
+
+def run_benchmark():
+    print("📊 Condensation planner benchmark (greedy vs optimal)")
+    recreator = EnglishVideoRecreator()
+    for count, target_mins in [(200, 5), (1000, 5), (5000, 10), (10000, 10)]:
+        segments = synthetic_segments(count)
+        scored = recreator._score_segments(segments)
+        for planner in ("greedy", "optimal"):
+            t0 = time.perf_counter()
+            result = recreator.condense_from_segments(segments, target_duration_mins=target_mins, planner=planner)
+            elapsed = time.perf_counter() - t0
+            fill = result["total_duration"] / (target_mins * 60) * 100
+            value = plan_value(recreator.selected_segments, scored) if count <= 1000 else float("nan")
+            print(f"  {count:>6} segs | {target_mins:>2}m | {planner:<7} | {elapsed*1000:8.1f} ms | fill {fill:5.1f}% | clips {result['clips_count']:>3} | value {value:8.2f}")
+
+if __name__ == "__main__":
+    run_benchmark()
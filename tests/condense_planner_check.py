@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from processor.english_recreator import EnglishVideoRecreator, CLUSTER_MERGE_BONUS
+
+def scored(*spans):
+    """Scored segments from (start, end, score) triples, as _score_segments returns them."""
+    return [
+        {"original": {"start": s, "end": e}, "clean_text": f"seg{i}", "score": score, "duration": e - s, "start_time": s, "end_time": e}
+        for i, (s, e, score) in enumerate(spans)
+    ]
+
+def covered(clips, segments):
+    """Segments (by clean_text) lying inside the planned blocks."""
+    return [seg["clean_text"] for seg in segments if any(c["start_time"] <= seg["start_time"] and seg["end_time"] <= c["end_time"] for c in clips)]
+
+def plan_value(clips, segments):
+    return sum(seg["score"] for seg in segments if seg["clean_text"] in covered(clips, segments))
+
+def duration(clips):
+    return sum(c["duration"] for c in clips)
+
+def test_budget_beats_greedy():
+    # A long top scorer (25s) vs three back-to-back 10s segments that just fit the 30s budget.
+    # Greedy takes A and nothing else fits: value 3. The optimum is B+C+D as one block: 8.7.
+    segments = scored((0, 25, 3.0), (100, 110, 2.9), (110, 120, 2.9), (120, 130, 2.9))
+    recreator = EnglishVideoRecreator()
+    greedy = recreator._plan_greedy([dict(s) for s in segments], 30)
+    optimal = recreator._plan_optimal([dict(s) for s in segments], 30)
+
+    assert covered(greedy, segments) == ["seg0"]
+    assert covered(optimal, segments) == ["seg1", "seg2", "seg3"], covered(optimal, segments)
+    assert duration(optimal) <= 30
+    assert abs(plan_value(optimal, segments) - 8.7) < 1e-9
+    assert plan_value(optimal, segments) > plan_value(greedy, segments)
+    assert len(optimal) == 1 and (optimal[0]["start_time"], optimal[0]["end_time"]) == (100, 130)
+    print(f"✅ Optimal: 30s, value 8.7 in 1 clip | greedy: {duration(greedy)}s, value {plan_value(greedy, segments)}")
+
+def test_bridging_prefers_one_block():
+    # 20s budget. Four contiguous 5s segments (score 1.0) vs four isolated ones (score 1.2,
+    # more than 45s apart). Raw value favours the isolated ones (4.8 vs 4.0), but bridging
+    # earns 3 x 15% and every extra clip pays the clip-start cost, so one block wins.
+    segments = scored(
+        (0, 5, 1.0), (5, 10, 1.0), (10, 15, 1.0), (15, 20, 1.0),
+        (100, 105, 1.2), (200, 205, 1.2), (300, 305, 1.2), (400, 405, 1.2),
+    )
+    recreator = EnglishVideoRecreator()
+    optimal = recreator._plan_optimal([dict(s) for s in segments], 20)
+    greedy = recreator._plan_greedy([dict(s) for s in segments], 20)
+
+    assert CLUSTER_MERGE_BONUS > 0
+    assert [(c["start_time"], c["end_time"]) for c in optimal] == [(0, 20)], optimal
+    assert duration(optimal) == 20
+    assert len(greedy) == 4 and len(optimal) < len(greedy)
+    print(f"✅ Bridging: one 20s block instead of greedy's {len(greedy)} jump cuts")
+
+def test_never_exceeds_budget():
+    # Durations that round down on the 0.5s grid must still fit the real budget
+    segments = scored(*[(i * 3.24, i * 3.24 + 3.24, 1.0 + (i % 3) * 0.1) for i in range(40)])
+    recreator = EnglishVideoRecreator()
+    for budget in (10, 33, 60, 100):
+        clips = recreator._plan_optimal([dict(s) for s in segments], budget)
+        assert 0 < duration(clips) <= budget + 1e-9, (budget, duration(clips))
+        assert all(a["end_time"] <= b["start_time"] for a, b in zip(clips, clips[1:]))
+    print("✅ Plans stay within budget and in chronological order")
+
+if __name__ == "__main__":
+    test_budget_beats_greedy()
+    test_bridging_prefers_one_block()
+    test_never_exceeds_budget()
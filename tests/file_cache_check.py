@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from processor.file_cache import FileCache, stable_digest
+
+def key(name):
+    return stable_digest("file-cache-check", name)
+
+def test_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FileCache(Path(tmp), max_bytes=250)
+        a = cache.put_bytes(key("a"), b"a" * 100, ".bin")
+        b = cache.put_bytes(key("b"), b"b" * 100, ".bin")
+        # Pin explicit ages so the order never depends on filesystem mtime resolution
+        os.utime(a, (1000, 1000))
+        os.utime(b, (2000, 2000))
+        # Reading "a" makes it the most recently used entry
+        assert cache.get(key("a"), ".bin") == a
+        cache.put_bytes(key("c"), b"c" * 100, ".bin")
+        assert cache.get(key("b"), ".bin") is None
+        assert cache.get(key("a"), ".bin") is not None
+        assert cache.get(key("c"), ".bin") is not None
+        stats = cache.stats()
+        assert (stats["evictions"], stats["bytes"]) == (1, 200), stats
+        assert (stats["hits"], stats["misses"]) == (3, 1), stats
+    print("✅ Least-recently-used entry evicted once over budget")
+
+def test_budget_measured_from_existing_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        warm = FileCache(Path(tmp))
+        for name in ("a", "b", "c"):
+            warm.put_bytes(key(name), b"x" * 100, ".bin")
+        for i, name in enumerate(("a", "b", "c")):
+            os.utime(warm.path_for(key(name), ".bin"), (1000 + i, 1000 + i))
+        # A new process with a budget counts what is already on disk before its first write
+        cache = FileCache(Path(tmp), max_bytes=250)
+        cache.put_bytes(key("d"), b"d" * 100, ".bin")
+        remaining = sorted(p.name for p in Path(tmp).glob("*/*"))
+        assert remaining == sorted(f"{key(n)}.bin" for n in ("c", "d")), remaining
+        assert cache.stats()["evictions"] == 2
+    print("✅ Existing files count toward the budget")
+
+def test_unbounded_cache_never_evicts():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FileCache(Path(tmp))
+        for i in range(5):
+            cache.put_bytes(key(i), b"x" * 1000)
+        assert cache.stats()["evictions"] == 0
+        assert len(list(Path(tmp).glob("*/*"))) == 5
+    print("✅ No budget, no eviction")
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_budget_measured_from_existing_files()
+    test_unbounded_cache_never_evicts()
@@ -0,0 +1,103 @@
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from processor.progress_aggregator import ProgressAggregator
+
+PROJECT_ID = "64b7f0c2a1e4d3b2c1a09f8e"
+
+class RecordingCollection:
+    """Stands in for the motor collection: records every bulk_write batch."""
+    def __init__(self):
+        self.batches = []
+
+    async def bulk_write(self, requests, ordered=True):
+        self.batches.append([r._doc["$set"] for r in requests])
+
+def recorder():
+    sent = []
+    async def send(project_id, payload):
+        sent.append(payload)
+    return sent, send
+
+async def test_updates_are_coalesced():
+    collection = RecordingCollection()
+    sent, send = recorder()
+    agg = ProgressAggregator(collection, send, flush_interval=60, push_interval=0.05)
+    agg.open(PROJECT_ID)
+    for progress in range(100):
+        await agg.update(PROJECT_ID, f"Step {progress}", progress)
+    # The first update is a status change and is written at once; the rest wait for a flush
+    assert len(collection.batches) == 1
+    await asyncio.sleep(0.15)
+    await agg.flush()
+    assert len(collection.batches) == 2
+    assert collection.batches[-1] == [{"status": "processing", "progress": 99, "message": "Step 99"}]
+    # The burst never yielded to the push task, so the sockets see only the latest state
+    assert [p["progress"] for p in sent] == [99]
+    await agg.close(PROJECT_ID)
+    print(f"✅ 100 updates -> {len(collection.batches)} writes, {len(sent)} pushes")
+
+async def test_pushes_are_throttled():
+    collection = RecordingCollection()
+    sent, send = recorder()
+    agg = ProgressAggregator(collection, send, flush_interval=60, push_interval=0.1)
+    agg.open(PROJECT_ID)
+    for progress in range(30):
+        await agg.update(PROJECT_ID, "Rendering", progress)
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.15)
+    # ~0.3s of updates at one push per 0.1s, and the last update is always delivered
+    assert 2 <= len(sent) <= 5, len(sent)
+    assert sent[-1]["progress"] == 29
+    await agg.close(PROJECT_ID)
+    print(f"✅ 30 spaced updates -> {len(sent)} pushes")
+
+async def test_language_progress():
+    collection = RecordingCollection()
+    sent, send = recorder()
+    agg = ProgressAggregator(collection, send, flush_interval=60, push_interval=0.05)
+    agg.open(PROJECT_ID)
+    await agg.update(PROJECT_ID, "Rendering", 40)
+    await asyncio.sleep(0.01)
+    sent.clear()
+    await agg.update(PROJECT_ID, "Translating", 10, language="am")
+    await agg.update(PROJECT_ID, "Rendering", 45)
+    await agg.update(PROJECT_ID, "Translating", 30, language="am")
+    await asyncio.sleep(0.1)
+    # One coalesced push per stream, global progress first
+    assert [(p["status"], p.get("language"), p["progress"]) for p in sent] == [("processing", None, 45), ("language_progress", "am", 30)]
+    await agg.flush()
+    assert collection.batches[-1] == [{
+        "status": "processing", "progress": 45, "message": "Rendering",
+        "language_progress.am.progress": 30, "language_progress.am.message": "Translating",
+    }]
+    await agg.close(PROJECT_ID)
+    print("✅ Language progress pushed and persisted under language_progress.<lang>")
+
+async def test_close_drops_pending():
+    collection = RecordingCollection()
+    sent, send = recorder()
+    agg = ProgressAggregator(collection, send, flush_interval=60, push_interval=0.05)
+    agg.open(PROJECT_ID)
+    await agg.update(PROJECT_ID, "Rendering", 10)
+    await asyncio.sleep(0.01)
+    await agg.update(PROJECT_ID, "Rendering", 90)
+    await agg.close(PROJECT_ID)
+    # A straggler after close is ignored, and nothing pending reaches Mongo or the sockets
+    await agg.update(PROJECT_ID, "Late", 95)
+    await asyncio.sleep(0.1)
+    await agg.flush()
+    assert len(collection.batches) == 1
+    assert [p["progress"] for p in sent] == [10]
+    print("✅ close() drops pending progress before the final write")
+
+if __name__ == "__main__":
+    asyncio.run(test_updates_are_coalesced())
+    asyncio.run(test_pushes_are_throttled())
+    asyncio.run(test_language_progress())
+    asyncio.run(test_close_drops_pending())
@@ -0,0 +1,49 @@
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from processor.ffmpeg_tools import run_ffmpeg, probe_media
+from processor.video_composer import VideoComposer
+
+async def make_source(path: Path, seconds: int = 120):
+    """Synthetic 720p30 H.264/AAC source (testsrc2 + sine) with a 2s GOP."""
+    await run_ffmpeg([
+        "-f", "lavfi", "-i", f"testsrc2=s=1280x720:r=30:d={seconds}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=48000:duration={seconds}",
+        "-c:v", "libx264", "-preset", "veryfast", "-g", "60", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest", str(path)
+    ])
+
+def synthetic_guide(seconds: int, clips: int = 8, clip_len: float = 7.3):
+    step = seconds / clips
+    return [{"start_sec": i * step + 1.1, "end_sec": i * step + 1.1 + clip_len} for i in range(clips)]
+
+async def run_benchmark():
+    print("📊 Condensed render benchmark (moviepy vs filtergraph vs smart vs parallel)")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source = tmp / "source.mp4"
+        await make_source(source)
+        guide = synthetic_guide(120)
+        expected = sum(g["end_sec"] - g["start_sec"] for g in guide)
+        composer = VideoComposer(tmp / "out")
+
+        for mode in ("moviepy", "filtergraph", "smart", "parallel"):
+            t0 = time.perf_counter()
+            try:
+                out = await composer.compose_condensed_video(str(source), guide, f"bench_{mode}.mp4", render_mode=mode)
+            except Exception as e:
+                print(f"  {mode:<12} | failed: {e}")
+                continue
+            elapsed = time.perf_counter() - t0
+            duration = float((await probe_media(out))["format"].get("duration") or 0)
+            print(f"  {mode:<12} | {elapsed:7.2f} s | {expected / elapsed:6.1f}x realtime | duration {duration:6.2f}s (expected {expected:.2f}s)")
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,50 @@
+import asyncio
+import sys
+from pathlib import Path
+from unittest import mock
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from processor.render_scheduler import RenderScheduler
+
+async def hold_slots(scheduler, count):
+    """Holds `count` slots at once and returns the thread budget each one was given."""
+    budgets = []
+    release = asyncio.Event()
+
+    async def render(i):
+        async with scheduler.slot(f"render {i}") as threads:
+            budgets.append(threads)
+            await release.wait()
+
+    tasks = [asyncio.create_task(render(i)) for i in range(count)]
+    while len(budgets) < min(count, scheduler.max_concurrent):
+        await asyncio.sleep(0.01)
+    held = list(budgets)
+    release.set()
+    await asyncio.gather(*tasks)
+    return held
+
+async def test_budgets_fit_the_cores():
+    for cores in (16, 6, 1):
+        with mock.patch("os.cpu_count", return_value=cores):
+            for max_concurrent in sorted({1, max(1, cores // 2), cores}):
+                scheduler = RenderScheduler(max_concurrent)
+                for count in range(1, max_concurrent + 1):
+                    budgets = await hold_slots(scheduler, count)
+                    assert len(budgets) == count
+                    assert sum(budgets) <= cores, f"{max_concurrent} slots, {count} held: {budgets} > {cores} cores"
+                assert scheduler.active == 0 and scheduler.waiting == 0
+                print(f"✅ {cores} cores, {max_concurrent} slot(s) busy: {budgets} threads")
+
+async def test_overflow_waits():
+    scheduler = RenderScheduler(2)
+    budgets = await hold_slots(scheduler, 5)
+    assert len(budgets) == 2, budgets
+    assert scheduler.active == 0 and scheduler.waiting == 0
+    print("✅ Renders beyond max_concurrent queue for a slot")
+
+if __name__ == "__main__":
+    asyncio.run(test_budgets_fit_the_cores())
+    asyncio.run(test_overflow_waits())
@@ -0,0 +1,96 @@
+import asyncio
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from processor.ffmpeg_tools import FFMPEG, probe_media, probe_gop_index
+from processor.video_composer import VideoComposer
+
+FPS = 25
+# Cuts that start and end mid-GOP (keyframes every 2s) and one shorter than a GOP
+GUIDE = [
+    {"start_sec": 0.52, "end_sec": 4.76},
+    {"start_sec": 6.12, "end_sec": 6.92},
+    {"start_sec": 7.33, "end_sec": 12.08},
+    {"start_sec": 13.0, "end_sec": 17.44},
+    {"start_sec": 18.2, "end_sec": 19.96},
+]
+
+def make_source(path: Path, open_gop: bool = False):
+    """20s H.264 (High, B-frames, 2s GOPs) + AAC test clip."""
+    x264_params = "keyint=50:min-keyint=50:scenecut=0" + (":open-gop=1" if open_gop else "")
+    subprocess.run([
+        FFMPEG, "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=size=320x240:rate={FPS}:duration=20",
+        "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=48000:duration=20",
+        "-c:v", "libx264", "-profile:v", "high", "-pix_fmt", "yuv420p", "-bf", "2", "-x264-params", x264_params,
+        "-c:a", "aac", "-shortest", str(path)
+    ], check=True)
+
+def expected_frames() -> int:
+    return sum(round(item["end_sec"] * FPS) - round(item["start_sec"] * FPS) for item in GUIDE)
+
+async def frame_count(path: str) -> int:
+    return len((await probe_gop_index(path))["frames"])
+
+async def test_smart_render_matches_guide(workdir: Path):
+    source = workdir / "closed.mp4"
+    make_source(source)
+    composer = VideoComposer(workdir / "videos")
+    output = await composer.compose_condensed_video(str(source), GUIDE, "smart.mp4", render_mode="smart", use_cache=False)
+
+    info = await probe_media(output)
+    frames = await frame_count(output)
+    video_seconds = frames / FPS
+    audio_seconds = float(info["audio"]["duration"])
+    assert frames == expected_frames(), f"{frames} frames, guide has {expected_frames()}"
+    assert abs(audio_seconds - video_seconds) < 0.05, f"audio {audio_seconds:.3f}s vs video {video_seconds:.3f}s"
+    assert abs(float(info["format"]["duration"]) - video_seconds) < 0.05, f"container says {info['format']['duration']}s for {video_seconds:.2f}s of frames"
+    assert composer.last_render_stats["backend"] == "smart"
+    print(f"✅ Smart render: {frames} frames ({video_seconds:.2f}s video, {audio_seconds:.3f}s audio) as the guide says")
+
+async def test_open_gop_falls_back(workdir: Path):
+    source = workdir / "open.mp4"
+    make_source(source, open_gop=True)
+    if not (await probe_gop_index(str(source)))["open_keyframes"]:
+        print("⚠️ This x264 build wrote no open GOPs; skipping the fallback check")
+        return
+    composer = VideoComposer(workdir / "videos")
+    try:
+        await composer.compose_condensed_video(str(source), GUIDE, "open_smart.mp4", render_mode="smart", use_cache=False)
+        raise AssertionError("smart render accepted an open-GOP source")
+    except ValueError as e:
+        assert "open GOP" in str(e), e
+    output = await composer.compose_condensed_video(str(source), GUIDE, "open_auto.mp4", render_mode="auto", use_cache=False)
+    assert composer.last_render_stats["backend"] == "parallel"
+    frames = await frame_count(output)
+    assert abs(frames - expected_frames()) <= len(GUIDE), f"{frames} frames, guide has {expected_frames()}"
+    print(f"✅ Open-GOP source falls back to {composer.last_render_stats['backend']} ({frames} frames)")
+
+async def test_edited_cut_reencodes_only_its_edges(workdir: Path):
+    source = workdir / "closed.mp4"
+    composer = VideoComposer(workdir / "cached")
+    edges = lambda: set(composer.render_cache.cache_dir.rglob("*.ts"))
+
+    await composer.compose_condensed_video(str(source), GUIDE, "cached.mp4", render_mode="smart")
+    first = edges()
+    assert first, "smart render cached no edge re-encodes"
+    edited = [dict(item) for item in GUIDE]
+    edited[2]["end_sec"] = 11.64
+    await composer.compose_condensed_video(str(source), edited, "edited.mp4", render_mode="smart")
+    added = edges() - first
+    assert len(added) == 1, f"{len(added)} edges re-encoded after moving one out point"
+    print(f"✅ Clip cache: moving one out point re-encoded 1 of {len(first)} edges")
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        await test_smart_render_matches_guide(Path(tmp))
+        await test_edited_cut_reencodes_only_its_edges(Path(tmp))
+        await test_open_gop_falls_back(Path(tmp))
+
+if __name__ == "__main__":
+    asyncio.run(main())
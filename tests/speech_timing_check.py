@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from processor.tts_engine import build_speech_timing, scene_durations, speech_srt
+
+def boundaries(words, start=0.0, step=0.5):
+    """Synthetic Edge-TTS WordBoundary events: one word every `step` seconds."""
+    return [{"type": "WordBoundary", "text": w, "start": start + i * step, "end": start + i * step + step * 0.8} for i, w in enumerate(words)]
+
+def test_timing_across_chunks():
+    text = "Faith moves mountains. Grace, however, is free!"
+    parts = [
+        (0.0, boundaries(["Faith", "moves", "mountains"])),
+        # Second chunk starts 2s into the narration; its events are chunk-relative
+        (2.0, boundaries(["Grace", "however", "is", "free"]) + [{"type": "SentenceBoundary", "text": "Grace, however, is free!", "start": 0.0, "end": 2.0}]),
+    ]
+    timing = build_speech_timing(text, parts, duration=4.0)
+    assert [w["text"] for w in timing["words"]] == ["Faith", "moves", "mountains", "Grace", "however", "is", "free"]
+    assert timing["words"][3] == {"text": "Grace", "offset": text.index("Grace"), "start": 2.0, "end": 2.4}
+    assert [s["text"] for s in timing["sentences"]] == ["Faith moves mountains.", "Grace, however, is free!"]
+    assert (timing["sentences"][1]["start"], timing["sentences"][1]["end"]) == (2.0, 3.9)
+    print("✅ Word timing is offset per chunk; sentence boundaries skipped")
+
+def test_unmatched_words_and_ethiopic_sentences():
+    text = "ሰላም ነው። እንዴት ናችሁ፧ Amen."
+    # "ዛሬ" was spoken but is not in the text (e.g. the engine expanded a number)
+    parts = [(0.0, boundaries(["ሰላም", "ነው", "ዛሬ", "እንዴት", "ናችሁ", "Amen"]))]
+    timing = build_speech_timing(text, parts)
+    assert timing["words"][2]["offset"] is None
+    assert [w["offset"] for w in timing["words"] if w["text"] != "ዛሬ"] == [text.index(t) for t in ("ሰላም", "ነው", "እንዴት", "ናችሁ", "Amen")]
+    assert [s["text"] for s in timing["sentences"]] == ["ሰላም ነው።", "እንዴት ናችሁ፧", "Amen."]
+    print("✅ Unmatched words keep their time without an offset; Ethiopic punctuation splits sentences")
+
+def test_scene_durations():
+    text = "Welcome to the show today. Our first story is about grace. Finally we pray together."
+    words = text.replace(".", "").split()
+    timing = build_speech_timing(text, [(0.0, boundaries(words))], duration=8.0)
+    scenes = ["Welcome to the show today.", "Our first story is about grace.", "Finally we pray together."]
+    # Scenes start at their first spoken words: 0s, word 5 (2.5s), word 11 (5.5s)
+    assert scene_durations(timing, scenes) == [2.5, 3.0, 2.5]
+    assert scene_durations(timing, scenes, total_duration=10.0) == [2.5, 3.0, 4.5]
+    assert scene_durations(timing, scenes[:1] + ["This scene was never narrated."]) is None
+    assert scene_durations(timing, ["Welcome to the show", "..."]) is None
+    print("✅ Scene durations follow the spoken words; unmatched scenes fall back (None)")
+
+def test_srt_cues():
+    text = "Short one. This sentence is long enough, with commas and all, that it must be split into cues!"
+    words = [w.strip(",.!") for w in text.split()]
+    timing = build_speech_timing(text, [(0.0, boundaries(words, step=0.25))])
+    srt = speech_srt(timing, max_chars=40)
+    cues = [block.split("\n") for block in srt.strip().split("\n\n")]
+    assert cues[0] == ["1", "00:00:00,000 --> 00:00:00,450", "Short one."]
+    texts = [cue[2] for cue in cues[1:]]
+    assert len(texts) > 1 and all(len(t) <= 40 for t in texts), texts
+    # Split cues keep every character of the sentence, punctuation included
+    assert " ".join(texts) == "This sentence is long enough, with commas and all, that it must be split into cues!"
+    assert cues[-1][1].endswith(" --> 00:00:04,450")
+    print(f"✅ SRT: long sentence split into {len(texts)} cues with punctuation kept")
+
+if __name__ == "__main__":
+    test_timing_across_chunks()
+    test_unmatched_words_and_ethiopic_sentences()
+    test_scene_durations()
+    test_srt_cues()
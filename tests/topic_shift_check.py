@@ -0,0 +1,56 @@
+import sys
+import random
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from processor.studio_engine import StudioEngine, MIN_CHAPTER_SECONDS
+from processor.transcript_index import TranscriptIndex
+
+TOPICS = [
+    ["prayer", "fasting", "psalms", "worship", "devotion", "silence"],
+    ["harvest", "farming", "seeds", "rainfall", "soil", "cattle"],
+    ["marriage", "family", "children", "patience", "forgiveness", "home"],
+]
+
+def three_topic_transcript(minutes_per_topic=10, seed=7):
+    """One segment every 10s; the vocabulary switches topic every `minutes_per_topic`."""
+    rng = random.Random(seed)
+    segments = []
+    per_topic = minutes_per_topic * 6
+    for t, words in enumerate(TOPICS):
+        for i in range(per_topic):
+            start = (t * per_topic + i) * 10.0
+            segments.append({"start": start, "end": start + 9.0, "text": " ".join(rng.choice(words) for _ in range(8))})
+    return segments
+
+def test_finds_topic_boundaries():
+    index = TranscriptIndex(three_topic_transcript())
+    shifts = StudioEngine().detect_topic_shifts(index)
+    # Topics change at 10:00 (segment 60) and 20:00 (segment 120)
+    assert 60 in shifts and 120 in shifts, shifts
+    assert shifts == sorted(shifts) and 0 not in shifts
+    print(f"✅ Topic shifts found at 10:00 and 20:00 ({len(shifts) + 1} chapters)")
+
+def test_spacing():
+    index = TranscriptIndex(three_topic_transcript())
+    shifts = StudioEngine().detect_topic_shifts(index)
+    starts = [index.starts[i] for i in shifts]
+    # 30 minutes -> 8 target chapters -> at least 1800 / 16 = 112.5s between chapter starts
+    assert all(b - a >= 112.5 for a, b in zip([0.0] + starts, starts)), starts
+    assert index.ends[-1] - starts[-1] >= MIN_CHAPTER_SECONDS
+    print("✅ Chapters respect the minimum spacing")
+
+def test_short_transcript_falls_back_to_even_spacing():
+    segments = [{"start": i * 5.0, "end": i * 5.0 + 4.0, "text": "grace and faith"} for i in range(10)]
+    engine = StudioEngine()
+    assert engine.detect_topic_shifts(TranscriptIndex(segments)) == [3, 6]
+    assert engine.detect_topic_shifts(TranscriptIndex([])) == []
+    print("✅ Short and empty transcripts")
+
+if __name__ == "__main__":
+    test_finds_topic_boundaries()
+    test_spacing()
+    test_short_transcript_falls_back_to_even_spacing()
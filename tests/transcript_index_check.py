@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from processor.transcript_index import TranscriptIndex
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.0, "text": " Grace is free. Faith,"},
+    {"start": 2.5, "end": 4.0, "text": "you know, moves mountains. "},
+    {"start": 5.0, "end": 8.0, "text": "Grace abounds."},
+]
+
+def test_tokens_and_inverted_index():
+    index = TranscriptIndex(SEGMENTS)
+    assert len(index) == 3
+    assert index.texts[0] == "Grace is free. Faith,"
+    assert index.tokens[0] == ["grace", "is", "free", "faith"]
+    # Fillers are dropped from the clean views only
+    assert index.clean_texts[1] == "moves mountains."
+    assert index.clean_tokens[1] == ["moves", "mountains"]
+    assert index.term_freq["grace"] == 2
+    assert index.segments_with("Grace") == [0, 2]
+    assert index.segments_with("missing") == []
+    print("✅ Tokens, filler-free views and inverted index")
+
+def test_durations():
+    index = TranscriptIndex(SEGMENTS)
+    assert index.cum_durations == [0.0, 2.0, 3.5, 6.5]
+    assert index.speech_duration(0, 3) == 6.5
+    assert index.speech_duration(1, 2) == 1.5
+    # Wall-clock span includes the pauses between segments
+    assert index.span_duration(0, 2) == 8.0
+    print("✅ Prefix-sum speech time and wall-clock spans")
+
+def test_sentences_map_to_segments():
+    index = TranscriptIndex(SEGMENTS)
+    assert index.full_text == "Grace is free. Faith, you know, moves mountains. Grace abounds."
+    assert [s["text"] for s in index.sentences] == ["Grace is free", "Faith, you know, moves mountains", "Grace abounds."]
+    # The middle sentence starts in segment 0 and ends in segment 1
+    assert [(s["start_seg"], s["end_seg"]) for s in index.sentences] == [(0, 0), (0, 1), (2, 2)]
+    assert index.join(1) == "you know, moves mountains. Grace abounds."
+    print("✅ Sentence spans map back onto segment indices")
+
+def test_empty_transcript():
+    index = TranscriptIndex(None)
+    assert len(index) == 0
+    assert index.sentences == []
+    assert index.cum_durations == [0.0]
+    print("✅ Empty transcript")
+
+if __name__ == "__main__":
+    test_tokens_and_inverted_index()
+    test_durations()
+    test_sentences_map_to_segments()
+    test_empty_transcript()
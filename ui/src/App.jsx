@@ -97,6 +97,9 @@ function App() {
     }
   };
 
+  // A queued run is still alive: it starts as soon as a studio slot frees up
+  const isActive = (p) => p.status === 'processing' || p.status === 'queued';
+
   const fetchProjects = async () => {
     try {
       const resp = await fetch('/videos');
@@ -104,7 +107,7 @@ function App() {
       setProjects(data);
 
       // Auto-reconnect logic if a project is still processing
-      const activeProject = data.find(p => p.status === 'processing');
+      const activeProject = data.find(isActive);
       if (activeProject && status === 'idle') {
         reconnectToTask(activeProject._id);
       }
@@ -131,6 +134,9 @@ function App() {
         setStatus('processing');
         setMessage(data.message);
         setProgress(data.progress);
+      } else if (data.status === 'queued') {
+        setStatus('processing');
+        setMessage(data.message);
       } else if (data.status === 'completed') {
         setStatus('completed');
         setMessage(data.message);
@@ -207,6 +213,8 @@ function App() {
       } else if (data.status === 'processing') {
         setMessage(data.message);
         setProgress(data.progress);
+      } else if (data.status === 'queued') {
+        setMessage(data.message);
       } else if (data.status === 'completed') {
         setStatus('completed');
         setMessage(data.message);
@@ -543,12 +551,12 @@ function App() {
           <div className="history-list">
             {projects.length > 0 ? projects.slice(0, 10).map((p, i) => (
               <div
-                className={`history-item ${p.status === 'processing' ? 'processing-pulse' : ''}`}
+                className={`history-item ${isActive(p) ? 'processing-pulse' : ''}`}
                 key={i}
-                onClick={() => p.status === 'processing' ? reconnectToTask(p._id) : loadProject(p._id)}
+                onClick={() => isActive(p) ? reconnectToTask(p._id) : loadProject(p._id)}
                 title={p.title}
               >
-                {p.status === 'processing' ? (
+                {isActive(p) ? (
                   <Loader2 size={14} className="history-icon spin" />
                 ) : p.mission === 'recreate' ? (
                   <Zap size={14} className="history-icon text-primary" />
@@ -561,7 +569,9 @@ function App() {
                 <div className="history-info">
                   <span className="truncate">{p.title}</span>
                   <div className="history-meta">
-                    {p.status === 'processing' ? (
+                    {p.status === 'queued' ? (
+                      <span className="status-badge processing">Queued</span>
+                    ) : p.status === 'processing' ? (
                       <span className="status-badge processing">Processing {p.progress}%</span>
                     ) : (
                       <span className="status-badge completed">Ready</span>